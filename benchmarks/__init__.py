@@ -0,0 +1,18 @@
+"""
+Benchmark suite of the VGI conversion. Micro-benchmarks of the reader, parser, geometry builder and writers are in
+mikro.py, end-to-end benchmarks of process_files and kt_sql in celkove.py, their inputs are generated by vstupy.py.
+Start-up time of the command line tools is measured in spustenie.py.
+Run it with python -m benchmarks, see __main__.py.
+"""
+from typing import Callable, NamedTuple
+
+
+class Benchmark(NamedTuple):
+    """priprav(vstupy, adresar) prepares everything that is not measured and returns a function doing the measured
+    work, which returns the number of processed units. It is called again for every repetition with an empty
+    working directory"""
+    nazov: str
+    jednotka: str
+    priprav: Callable
+    # modules which must be installed, otherwise the benchmark is skipped, 'a|b' needs any of the modules
+    poziadavky: tuple = ()
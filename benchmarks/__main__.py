@@ -0,0 +1,187 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Runs the benchmark suite and writes its results into a JSON file. Every benchmark is repeated and its best time is
+kept. With --compare the results are compared with an earlier run on the same machine, benchmarks which are slower
+by more than the threshold are reported and the exit code is 1.
+
+USAGE: python -m benchmarks [--output FILE] [--compare BASELINE] [--threshold RATIO] [--filter PATTERNS]
+                            [--repeat N] [--scale N] [--list]
+"""
+import os
+import io
+import gc
+import hashlib
+import sys
+import json
+import time
+import fnmatch
+import argparse
+import platform
+import datetime
+import tempfile
+import contextlib
+import statistics
+import subprocess
+import importlib.util
+from pathlib import Path
+
+from katastertools import __VERSION__
+
+from benchmarks import mikro, celkove, spustenie, vstupy
+
+BENCHMARKY = mikro.BENCHMARKY + celkove.BENCHMARKY + spustenie.BENCHMARKY
+VERZIA_FORMATU = 1
+
+
+def stroj() -> dict:
+    """Popis stroja, vysledky sa daju porovnavat iba na rovnakom stroji"""
+    info = {
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpus': os.cpu_count(),
+        'python': platform.python_version(),
+    }
+    try:
+        from osgeo import gdal
+        info['gdal'] = gdal.__version__
+    except (ImportError, AttributeError):
+        info['gdal'] = None
+    return info
+
+
+def commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+                              cwd=Path(__file__).parent).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def odtlacok(vstupy_behu: dict) -> dict:
+    """Kontrolne sucty vstupov, pri inych vstupoch sa casy nedaju porovnat"""
+    return {typ: hashlib.sha256(cesta.read_bytes()).hexdigest()[:16] for typ, cesta in vstupy_behu.items()}
+
+
+def zmeraj(benchmark, vstupy_behu: dict, opakovania: int) -> dict:
+    casy = []
+    pocet = None
+    for _ in range(opakovania):
+        with tempfile.TemporaryDirectory() as adresar:
+            spusti = benchmark.priprav(vstupy_behu, Path(adresar))
+            gc.collect()
+            # vypisy konverzie by ovplyvnili meranie
+            vypis = io.StringIO()
+            with contextlib.redirect_stdout(vypis), contextlib.redirect_stderr(vypis):
+                zaciatok = time.perf_counter()
+                pocet = spusti()
+                casy.append(time.perf_counter() - zaciatok)
+    najlepsi = min(casy)
+    return {
+        'unit': benchmark.jednotka,
+        'count': pocet,
+        'best': round(najlepsi, 6),
+        'median': round(statistics.median(casy), 6),
+        'times': [round(cas, 6) for cas in casy],
+        'rate': round(pocet / najlepsi, 1) if najlepsi else None,
+    }
+
+
+def porovnaj(vysledky: dict, zaklad: dict, prah: float) -> list:
+    """Vypise porovnanie so zakladnym behom a vrati nazvy benchmarkov, ktore su pomalsie o viac ako prah"""
+    if zaklad.get('machine') != vysledky['machine']:
+        print('WARNING: the baseline was measured on a different machine, the comparison is not reliable')
+    if zaklad.get('scale') != vysledky['scale']:
+        print('WARNING: the baseline was measured with a different --scale')
+    if zaklad.get('inputs') != vysledky['inputs']:
+        print('The baseline was measured with different inputs (e.g. another version of the corpus generator), '
+              'the results are not comparable')
+        return []
+    pomalsie = []
+    print(f'\nComparison with {zaklad.get("commit") or "baseline"} ({zaklad.get("time")}), threshold {prah:.0%}:')
+    for nazov, vysledok in vysledky['results'].items():
+        zakladny = zaklad.get('results', {}).get(nazov)
+        if zakladny is None:
+            print(f'  {nazov:24} new')
+            continue
+        if zakladny['count'] != vysledok['count']:
+            print(f'  {nazov:24} not comparable, processed {vysledok["count"]} {vysledok["unit"]} instead of '
+                  f'{zakladny["count"]}')
+            continue
+        pomer = vysledok['best'] / zakladny['best']
+        if pomer > 1 + prah:
+            stav = 'SLOWER'
+            pomalsie.append(nazov)
+        elif pomer < 1 - prah:
+            stav = 'faster'
+        else:
+            stav = 'same'
+        print(f'  {nazov:24} {zakladny["best"]:9.4f}s -> {vysledok["best"]:9.4f}s {pomer:6.2f}x {stav}')
+    return pomalsie
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description=__doc__.split('USAGE')[0].strip())
+    parser.add_argument('--output', default='benchmark.json', help='JSON file with the results (default %(default)s)')
+    parser.add_argument('--compare', help='JSON file with the results of an earlier run to compare with')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='relative slowdown of the best time reported as a regression (default %(default)s)')
+    parser.add_argument('--filter', default='*', help='comma separated name patterns, e.g. "citac.*,zapis.shp"')
+    parser.add_argument('--repeat', type=int, default=5, help='repetitions of every benchmark (default %(default)s)')
+    parser.add_argument('--scale', type=int, default=1, help='multiplier of the input size (default %(default)s)')
+    parser.add_argument('--list', action='store_true', help='list the benchmarks and exit')
+    args = parser.parse_args()
+
+    vzory = args.filter.split(',')
+    vybrane = [b for b in BENCHMARKY if any(fnmatch.fnmatch(b.nazov, vzor) for vzor in vzory)]
+    if args.list:
+        for benchmark in vybrane:
+            print(f'{benchmark.nazov:24} {benchmark.jednotka}')
+        return
+    zaklad = None
+    if args.compare:
+        with open(args.compare) as f:
+            zaklad = json.load(f)
+
+    vysledky = {
+        'format': VERZIA_FORMATU,
+        'time': datetime.datetime.now().isoformat(timespec='seconds'),
+        'version': __VERSION__,
+        'commit': commit(),
+        'machine': stroj(),
+        'scale': args.scale,
+        'repeat': args.repeat,
+        'inputs': {},
+        'results': {},
+    }
+    with tempfile.TemporaryDirectory() as adresar:
+        vstupy_behu = vstupy.vytvor_vstupy(Path(adresar), args.scale)
+        vysledky['inputs'] = odtlacok(vstupy_behu)
+        print('Inputs: ' + ', '.join(f'{typ} {cesta.stat().st_size / 1048576:.1f} MB'
+                                      for typ, cesta in vstupy_behu.items()))
+        for benchmark in vybrane:
+            chybajuce = [m.replace('|', ' or ') for m in benchmark.poziadavky
+                         if all(importlib.util.find_spec(modul) is None for modul in m.split('|'))]
+            if chybajuce:
+                print(f'{benchmark.nazov:24} skipped, {", ".join(chybajuce)} is not installed')
+                continue
+            vysledok = zmeraj(benchmark, vstupy_behu, args.repeat)
+            vysledky['results'][benchmark.nazov] = vysledok
+            print(f'{benchmark.nazov:24} best={vysledok["best"]:9.4f}s median={vysledok["median"]:9.4f}s '
+                  f'{vysledok["count"]:8d} {vysledok["unit"]:8} {vysledok["rate"] or 0:12.0f}/s')
+
+    with open(args.output, 'w') as f:
+        json.dump(vysledky, f, indent=1)
+    print(f'Results were written into {args.output}')
+
+    if zaklad is not None:
+        pomalsie = porovnaj(vysledky, zaklad, args.threshold)
+        if pomalsie:
+            print(f'{len(pomalsie)} benchmark(s) are slower than the baseline by more than {args.threshold:.0%}: '
+                  f'{", ".join(pomalsie)}')
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
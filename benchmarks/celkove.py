@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+End-to-end benchmarks: process_files converting a KN, UO and BJ file and kt_sql converting a directory with the KN
+and UO file and the FPU file. Units are the written objects as counted by the metrics of the run.
+"""
+import json
+import shutil
+from pathlib import Path
+
+from katastertools import kt_sql
+from katastertools.kt_vgi2shp import process_files, KNOWN_LAYERS
+
+from benchmarks import Benchmark
+
+
+def konverzia_suboru(typ: str, output_format: str):
+    def priprav(vstupy_behu: dict, adresar: Path):
+        layers = {k: v[0] for k, v in KNOWN_LAYERS.items()}
+
+        def spusti():
+            return process_files(vstupy_behu[typ], layers, adresar, output_format=output_format).metrics.objekty
+        return spusti
+    return priprav
+
+
+def konverzia_adresara(export_format: str):
+    def priprav(vstupy_behu: dict, adresar: Path):
+        # kt_sql zapisuje vystupy do adresara so vstupmi, kazdy beh dostane vlastnu kopiu
+        (adresar / 'vgi').mkdir()
+        (adresar / 'fpu').mkdir()
+        for typ in ('KN', 'UO'):
+            shutil.copy(vstupy_behu[typ], adresar / 'vgi')
+        shutil.copy(vstupy_behu['FPU'], adresar / 'fpu')
+
+        def spusti():
+            kt_sql.main(['--directory', str(adresar), '--export-format', export_format], standalone_mode=False,
+                        obj={})
+            return json.loads((adresar / 'log' / 'metrics.json').read_text())['objekty']
+        return spusti
+    return priprav
+
+
+BENCHMARKY = [
+    *(Benchmark(f'process_files.{typ}', 'objects', konverzia_suboru(typ, 'sql-copy')) for typ in ('KN', 'UO', 'BJ')),
+    Benchmark('process_files.KN.shp', 'objects', konverzia_suboru('KN', 'shp'), ('osgeo',)),
+    Benchmark('kt_sql.sql', 'objects', konverzia_adresara('sql')),
+    Benchmark('kt_sql.sql,shp,dgn', 'objects', konverzia_adresara('sql,shp,dgn'), ('osgeo',)),
+]
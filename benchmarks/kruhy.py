@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Benchmark of polygon ring assembly. Generates synthetic KLADPAR objects made of a grid of parts, every part
+with a hole and every other hole with an island, and measures the throughput of building their geometry.
+
+USAGE: python -m benchmarks.kruhy [number-of-parts ...]
+
+    number-of-parts		number of grid parts in one object (default 10 100 1000)
+"""
+import sys
+import time
+
+from katastertools.VgiShp import data
+
+
+def kruh(y, x, strana, body_strany=10):
+    """Vety stvorcoveho kruhu so zaciatkom v bode y, x"""
+    body = []
+    for i in range(body_strany):
+        body.append((y + strana * i / body_strany, x))
+    for i in range(body_strany):
+        body.append((y + strana, x + strana * i / body_strany))
+    for i in range(body_strany):
+        body.append((y + strana - strana * i / body_strany, x + strana))
+    for i in range(body_strany):
+        body.append((y, x + strana - strana * i / body_strany))
+    body.append(body[0])
+    return [f'&L P {body[0][0]:.2f} {body[0][1]:.2f}'] + [f'L {by:.2f} {bx:.2f}' for by, bx in body[1:]]
+
+
+def vety_objektu(pocet_casti):
+    vety = ['&O KLADPAR 1', '&A PARCIS=1/1']
+    strana = int(pocet_casti ** 0.5) + 1
+    for i in range(pocet_casti):
+        y = 400000 + (i % strana) * 100
+        x = 1200000 + (i // strana) * 100
+        vety += kruh(y, x, 90)
+        vety += kruh(y + 10, x + 10, 60)
+        if i % 2:
+            vety += kruh(y + 20, x + 20, 30)
+    return vety
+
+
+def main():
+    pocty = [int(pocet) for pocet in sys.argv[1:]] or [10, 100, 1000]
+    atributy_suboru = {'KU': '800001', 'SUBOR': 'benchmark', 'AKTUAL': (2020, 1, 1, 0, 0, 0, 0)}
+    for pocet in pocty:
+        vety = vety_objektu(pocet)
+        objekt = data.KLADPAR(atributy_suboru)
+        for veta in vety:
+            objekt.pridaj_riadok(veta)
+        pocet_kruhov = len(objekt.wl._ciary)
+        zaciatok = time.perf_counter()
+        wkb = objekt.wl.wkb()
+        trvanie = time.perf_counter() - zaciatok
+        print(f'parts={pocet:6d} rings={pocet_kruhov:6d} wkb={len(wkb):9d} B time={trvanie:.3f}s '
+              f'({pocet_kruhov / trvanie:.0f} rings/s)')
+
+
+if __name__ == '__main__':
+    main()
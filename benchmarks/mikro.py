@@ -0,0 +1,180 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Micro-benchmarks of single stages of the conversion: reading records (io.Citac), splitting them into objects
+(io.CitacObjektov), parsing records (Objekt.pridaj_riadok), building geometry (WktGeneric, ring assembly, jumps)
+and writing outputs (Zapisovac). Every stage gets its input prepared by the previous stages outside of the measured
+time.
+"""
+import functools
+from pathlib import Path
+
+from katastertools.VgiShp import io
+from katastertools.VgiShp import data
+from katastertools.kt_vgi2shp import objekt_vrstvy
+
+from benchmarks import Benchmark, kruhy, skoky, vstupy
+
+# vystupne formaty Zapisovaca a moduly, ktore potrebuju, GeoParquet berie suradnicovy system z GDAL alebo pyproj
+FORMATY = {'sql-copy': (), 'parquet': ('pyarrow', 'osgeo|pyproj'), 'shp': ('osgeo',), 'dgn': ('osgeo',), 'gpkg': ('osgeo',),
+           'fgb': ('osgeo',)}
+
+
+def atributy_suboru(cesta: Path) -> dict:
+    return {'KU': str(vstupy.KU), 'SUBOR': cesta.name, 'AKTUAL': (2020, 2, 1, 10, 11, 12, 104)}
+
+
+def citac_objektov(cesta: Path) -> io.CitacObjektov:
+    """Citac objektov suboru za hlavickou"""
+    citac = io.Citac(cesta)
+    for veta in citac:
+        if veta[:2] not in ('&V', '&R', '&B'):
+            citac.spat(1)
+            break
+    return io.CitacObjektov(citac)
+
+
+@functools.lru_cache(maxsize=None)
+def surove_objekty(cesta: Path) -> tuple:
+    return tuple(citac_objektov(cesta))
+
+
+def parsovane_objekty(cesta: Path, arc_step=None) -> list:
+    atributy = atributy_suboru(cesta)
+    krok_obluku = data.krok_obluku(arc_step)
+    objekty = []
+    for surovy_objekt in surove_objekty(cesta):
+        objekt = objekt_vrstvy(surovy_objekt['meno_vrstvy'], atributy, krok_obluku)
+        for veta in surovy_objekt['riadky']:
+            objekt.pridaj_riadok(veta)
+        objekty.append(objekt)
+    return objekty
+
+
+@functools.lru_cache(maxsize=None)
+def data_objektov(cesta: Path) -> tuple:
+    """Data objektov s geometriou, ako ich dostava Zapisovac. Zapisovace data nemenia, mozu sa pouzit opakovane"""
+    return tuple(d for d in (objekt.data() for objekt in parsovane_objekty(cesta)) if d['geometricke_objekty'])
+
+
+def citanie_viet(vstupy_behu: dict, adresar: Path):
+    def spusti():
+        citac = io.Citac(vstupy_behu['KN'])
+        pocet = 0
+        try:
+            while True:
+                citac.dalsia_veta()
+                pocet += 1
+        except IndexError:
+            return pocet
+    return spusti
+
+
+def citanie_objektov(vstupy_behu: dict, adresar: Path):
+    def spusti():
+        return sum(1 for _ in citac_objektov(vstupy_behu['KN']))
+    return spusti
+
+
+def parsovanie(typ: str):
+    def priprav(vstupy_behu: dict, adresar: Path):
+        cesta = vstupy_behu[typ]
+        objekty = surove_objekty(cesta)
+        atributy = atributy_suboru(cesta)
+
+        def spusti():
+            pocet = 0
+            for surovy_objekt in objekty:
+                objekt = objekt_vrstvy(surovy_objekt['meno_vrstvy'], atributy)
+                for veta in surovy_objekt['riadky']:
+                    objekt.pridaj_riadok(veta)
+                pocet += len(surovy_objekt['riadky'])
+            return pocet
+        return spusti
+    return priprav
+
+
+def parsuj(veta: str):
+    parser = data.PARSERY_VIET.get(veta[:1])
+    return parser(veta) if parser is not None else None
+
+
+def kreslenie(vstupy_behu: dict, adresar: Path):
+    """Vety su rozparsovane vopred, meria sa iba kreslenie (WktGeneric.kresli, skoc a rotuj) so zhustovanim oblukov"""
+    cesta = vstupy_behu['KN']
+    atributy = atributy_suboru(cesta)
+    krok_obluku = data.krok_obluku('compat')
+    objekty = [(o['meno_vrstvy'], [parsuj(veta) for veta in o['riadky']]) for o in surove_objekty(cesta)]
+
+    def spusti():
+        pocet = 0
+        for meno_vrstvy, vety in objekty:
+            objekt = objekt_vrstvy(meno_vrstvy, atributy, krok_obluku)
+            for veta in vety:
+                if veta is not None:
+                    getattr(objekt, veta[0])(veta[1])
+            pocet += len(vety)
+        return pocet
+    return spusti
+
+
+def geometria(typ: str):
+    def priprav(vstupy_behu: dict, adresar: Path):
+        objekty = parsovane_objekty(vstupy_behu[typ])
+
+        def spusti():
+            for objekt in objekty:
+                objekt.data()
+            return len(objekty)
+        return spusti
+    return priprav
+
+
+def kruhy_parcely(vstupy_behu: dict, adresar: Path):
+    objekt = data.KLADPAR(atributy_suboru(vstupy_behu['KN']))
+    for veta in kruhy.vety_objektu(1000):
+        objekt.pridaj_riadok(veta)
+
+    def spusti():
+        objekt.wl.wkb()
+        return len(objekt.wl._ciary)
+    return spusti
+
+
+def skoky_hranice(vstupy_behu: dict, adresar: Path):
+    pocet_skokov = 5000
+    objekt = data.KATUZ(atributy_suboru(vstupy_behu['KN']))
+    for veta in skoky.vety_objektu('KATUZ', pocet_skokov):
+        objekt.pridaj_riadok(veta)
+
+    def spusti():
+        objekt.data()
+        return pocet_skokov
+    return spusti
+
+
+def zapis(format: str):
+    def priprav(vstupy_behu: dict, adresar: Path):
+        cesta = vstupy_behu['KN']
+        objekty = data_objektov(cesta)
+
+        def spusti():
+            zapisovac = data.Zapisovac(cesta.stem, str(adresar), format, subor=cesta.name)
+            for objekt_data in objekty:
+                zapisovac.uloz(objekt_data)
+            zapisovac.zatvor()
+            return len(objekty)
+        return spusti
+    return priprav
+
+
+BENCHMARKY = [
+    Benchmark('citac.vety', 'records', citanie_viet),
+    Benchmark('citac.objekty', 'objects', citanie_objektov),
+    *(Benchmark(f'parser.{typ}', 'records', parsovanie(typ)) for typ in ('KN', 'UO', 'BJ')),
+    Benchmark('geometria.kreslenie', 'records', kreslenie),
+    *(Benchmark(f'geometria.{typ}', 'objects', geometria(typ)) for typ in ('KN', 'UO', 'BJ')),
+    Benchmark('geometria.kruhy', 'rings', kruhy_parcely),
+    Benchmark('geometria.skoky', 'jumps', skoky_hranice),
+    *(Benchmark(f'zapis.{format}', 'objects', zapis(format), poziadavky) for format, poziadavky in FORMATY.items()),
+]
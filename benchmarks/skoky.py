@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Benchmark of jump (NL/NC/NR) resolution in VGI geometry. Generates synthetic KATUZ and BPEJ objects
+with the given number of jump records and measures the time of their processing.
+
+USAGE: python -m benchmarks.skoky [number-of-jumps ...]
+
+    number-of-jumps		number of jump records in one object (default 1000 5000 20000)
+"""
+import sys
+import time
+
+from katastertools.VgiShp import data
+
+
+def vety_objektu(meno_vrstvy, pocet_skokov, body_useku=5):
+    """Vety objektu, ktory sa sklada z kratkych usekov. Kazdy druhy skok pokracuje na konci niektoreho
+    z predchadzajucich usekov, ostatne zacinaju novu ciaru"""
+    vety = [f'&O {meno_vrstvy} 1', '&A BJ=0000000']
+    konce = []
+    y, x = 400000.0, 1200000.0
+    for i in range(pocet_skokov):
+        if konce and i % 2:
+            y, x = konce[(i * 7919) % len(konce)]
+        else:
+            y, x = 400000.0 + i, 1200000.0 + (i % 97)
+        vety.append(f'NL {y:.2f} {x:.2f}' if i else f'&L P {y:.2f} {x:.2f}')
+        for j in range(body_useku):
+            y += 0.5
+            x += 0.25 * (j % 3)
+            vety.append(f'L {y:.2f} {x:.2f}')
+        konce.append((y, x))
+    return vety
+
+
+def zmeraj(trieda, vety):
+    atributy_suboru = {'KU': '800001', 'SUBOR': 'benchmark', 'AKTUAL': (2020, 1, 1, 0, 0, 0, 0)}
+    zaciatok = time.perf_counter()
+    objekt = trieda(atributy_suboru)
+    for veta in vety:
+        objekt.pridaj_riadok(veta)
+    objekt.data()
+    return time.perf_counter() - zaciatok
+
+
+def main():
+    pocty = [int(pocet) for pocet in sys.argv[1:]] or [1000, 5000, 20000]
+    for meno_vrstvy, trieda in (('KATUZ', data.KATUZ), ('BPEJ', data.BPEJ)):
+        for pocet in pocty:
+            vety = vety_objektu(meno_vrstvy, pocet)
+            trvanie = zmeraj(trieda, vety)
+            print(f'{meno_vrstvy:6} jumps={pocet:6d} records={len(vety):7d} time={trvanie:.3f}s '
+                  f'({pocet / trvanie:.0f} jumps/s)')
+
+
+if __name__ == '__main__':
+    main()
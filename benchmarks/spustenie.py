@@ -0,0 +1,36 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Start-up benchmarks: a new interpreter importing the command line tools, as every cron job or worker process does.
+The bare interpreter is measured too, so the cost of the imports is the difference. GDAL is imported only by the
+OGR writers (ogr_vystupy), the tools themselves must not load it. Details of a slow import show
+python -X importtime -c "import katastertools.kt_sql".
+"""
+import sys
+import subprocess
+from pathlib import Path
+
+from benchmarks import Benchmark
+
+# pocet spusteni interpretera v jednom merani, jedno spustenie je prilis kratke
+POCET_SPUSTENI = 10
+KOREN = Path(__file__).parents[1]
+
+
+def spustenie(prikaz: str):
+    def priprav(vstupy_behu: dict, adresar: Path):
+        def spusti():
+            for _ in range(POCET_SPUSTENI):
+                subprocess.run([sys.executable, '-c', prikaz], cwd=KOREN, check=True)
+            return POCET_SPUSTENI
+        return spusti
+    return priprav
+
+
+BENCHMARKY = [
+    Benchmark('spustenie.python', 'processes', spustenie('pass')),
+    Benchmark('spustenie.kt_vgi2shp', 'processes', spustenie('import katastertools.kt_vgi2shp')),
+    Benchmark('spustenie.kt_sql', 'processes', spustenie('import katastertools.kt_sql'), ('click',)),
+    Benchmark('spustenie.kt_daemon', 'processes', spustenie('import katastertools.kt_daemon'), ('click',)),
+    Benchmark('spustenie.ogr_vystupy', 'processes', spustenie('import katastertools.VgiShp.ogr_vystupy'), ('osgeo',)),
+]
@@ -0,0 +1,38 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Inputs of the benchmark suite: one cadastral unit of the synthetic corpus (katastertools.utils.corpus) with a KN, UO
+and BJ VGI file and an FPU file. The files are deterministic for the given scale.
+
+USAGE: python -m benchmarks.vstupy directory [scale]
+
+    scale		multiplier of the number of parcels (default 1, i.e. 2000 KN parcels)
+"""
+import sys
+from pathlib import Path
+
+from katastertools.utils import corpus
+
+KU = corpus.FIRST_KU
+# pocet parciel suboru KN pri mierke 1, subor UO ma polovicu
+POCET_PARCIEL = 2000
+
+
+def vytvor_vstupy(adresar: Path, mierka: int = 1) -> dict:
+    """Zapise vstupy do adresara <adresar>/vgi a <adresar>/fpu (struktura, ktoru ocakava kt_sql) a vrati ich cesty
+    podla typu suboru"""
+    corpus.generate(adresar, 1, corpus.CorpusSettings(parcels=POCET_PARCIEL * mierka))
+    vstupy = {typ: adresar / 'vgi' / f'{typ}{KU}.vgi' for typ in ('KN', 'UO', 'BJ')}
+    vstupy['FPU'] = adresar / 'fpu' / f'{KU}.FPU'
+    return vstupy
+
+
+def main():
+    if len(sys.argv) < 2:
+        sys.exit(__doc__)
+    for typ, cesta in vytvor_vstupy(Path(sys.argv[1]), int(sys.argv[2]) if len(sys.argv) > 2 else 1).items():
+        print(f'{typ}: {cesta} ({cesta.stat().st_size} B)')
+
+
+if __name__ == '__main__':
+    main()
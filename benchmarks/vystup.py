@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Benchmark of the OGR writers for ESRI Shapefile and DGN output. Writes the same synthetic KLADPAR parcels
+twice: with the former per-feature loop (a new feature for every geometry, fields set by name, no transactions)
+and with Vystup_vrstvy (one reused feature, resolved field indexes, unchanged file attributes skipped, batched
+transactions), and prints the throughput of both.
+
+USAGE: python -m benchmarks.vystup [number-of-parcels] [batch-size]
+
+    number-of-parcels	number of written parcels (default 20000)
+    batch-size		features in one layer transaction of Vystup_vrstvy (default 10000)
+"""
+import os
+import sys
+import time
+import tempfile
+
+from osgeo import ogr
+
+from katastertools.VgiShp import data, ogr_vystupy
+from benchmarks.kruhy import kruh
+
+
+FORMATY = {
+    'shp': ('ESRI Shapefile', '', []),
+    'dgn': ('DGN', 'benchmark.dgn', ['ORIGIN=-393839,-1232725,0', 'MASTER_UNIT_NAME=m']),
+}
+
+
+def objekty(pocet):
+    """Data syntetickych parciel, ako ich dostava Zapisovac"""
+    atributy_suboru = {'KU': '800001', 'SUBOR': 'benchmark.vgi', 'AKTUAL': (2020, 1, 1, 0, 0, 0, 104)}
+    zoznam = []
+    for i in range(pocet):
+        objekt = data.KLADPAR(atributy_suboru)
+        y = 400000 + (i % 100) * 100
+        x = 1200000 + (i // 100) * 100
+        for veta in [f'&O KLADPAR {i + 1}', f'&A PARCIS={i + 1}.1'] + kruh(y, x, 90, body_strany=5):
+            objekt.pridaj_riadok(veta)
+        zoznam.append(objekt.data())
+    return zoznam
+
+
+def zapis_povodny(vystup, zoznam, cad):
+    """Zapis objektov tak, ako ho robil Vystup_vrstvy pred zavedenim davok a znovu pouzivaneho feature"""
+    for objekt_data in zoznam:
+        if cad:
+            objekt_data['atributy'] = {}
+        elif not vystup.polia:
+            vystup.priprav_polia(objekt_data['meta']['polia'])
+        for objekt in objekt_data['geometricke_objekty']:
+            f = ogr.Feature(feature_def=vystup.vrstva.GetLayerDefn())
+            atributy = objekt_data['atributy']
+            atributy.update(objekt.get('atributy', {}))
+            for atribut, hodnota in atributy.items():
+                if isinstance(hodnota, tuple):
+                    f.SetField(atribut, *hodnota)
+                else:
+                    f.SetField(atribut, hodnota)
+            f.SetGeometryDirectly(ogr.CreateGeometryFromWkb(objekt['wkb']))
+            if cad:
+                f.SetStyleString('PEN(c:#FF0000)')
+            vystup.vrstva.CreateFeature(f)
+            f.Destroy()
+
+
+def zapis_aktualny(vystup, zoznam, cad):
+    zapisovac = ogr_vystupy.CAD_vystup(vystup) if cad else vystup
+    for objekt_data in zoznam:
+        zapisovac.uloz(objekt_data)
+
+
+def zmeraj(format, zapis, pocet, velkost_davky):
+    driver, nazov_suboru, nastavenia = FORMATY[format]
+    zoznam = objekty(pocet)
+    with tempfile.TemporaryDirectory() as adresar:
+        vystup = ogr_vystupy.Vystup_vrstvy(os.path.join(adresar, nazov_suboru), driver, ogr.wkbMultiPolygon,
+                                           'kn_kladpar', nastavenia_vrstvy=nastavenia, velkost_davky=velkost_davky)
+        zaciatok = time.perf_counter()
+        zapis(vystup, zoznam, format == 'dgn')
+        vystup.zatvor()
+        return time.perf_counter() - zaciatok
+
+
+def main():
+    pocet = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    velkost_davky = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+    for format in FORMATY:
+        povodny = zmeraj(format, zapis_povodny, pocet, 0)
+        aktualny = zmeraj(format, zapis_aktualny, pocet, velkost_davky)
+        print(f'{format}: features={pocet} before={povodny:.3f}s ({pocet / povodny:.0f}/s) '
+              f'after={aktualny:.3f}s ({pocet / aktualny:.0f}/s) speedup={povodny / aktualny:.2f}x')
+
+
+if __name__ == '__main__':
+    main()
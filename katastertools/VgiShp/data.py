@@ -2,11 +2,26 @@
 # -*- coding: utf-8 -*-
 import os
 import re
+import copy
+import json
+import sys
+import shutil
+import struct
 import math
+import time
 import logging
+import operator
+import functools
+import datetime
+from array import array
 from typing import Optional
 
-from osgeo import ogr
+# typy geometrie WKB (hodnoty ogr.wkb*), GDAL sa pri citani a tvorbe geometrie nepouziva
+WKB_BOD = 1
+WKB_LINIA = 2
+WKB_POLYGON = 3
+WKB_MULTILINIA = 5
+WKB_MULTIPOLYGON = 6
 
 
 class NepodporovanaVeta(Exception):
@@ -16,10 +31,12 @@ class NepodporovanaVeta(Exception):
 class Objekt:
     nazov_vrstvy = None
     polia = ()
+    # cas zhustovania oblukov objektu v sekundach (metriky spracovania)
+    cas_oblukov = 0.0
 
     """Zaklady abstraktny objekt v katastri"""
 
-    def __init__(self, atributy_suboru):
+    def __init__(self, atributy_suboru, krok_obluku=None):
         # v spravach sa zbieraju chybove hlasky ktore sa po spracovani vypisu
         self.spravy = []
         self.wl: Optional[WktPolygon] = None
@@ -28,6 +45,8 @@ class Objekt:
         self.atributy_objektu = {'ID': ''}
         # atributy suboru su rovnake pre vsetky objektu v danom subore
         self.atributy_suboru = atributy_suboru
+        # krok zhustovania oblukov (vety R), None znamena ze sa body obluku spracuju ako body ciary
+        self.krok_obluku = krok_obluku
 
         self.textove_elementy = []
 
@@ -39,40 +58,25 @@ class Objekt:
         self.meta['polia'].append({'nazov': 'stav_k', 'typ': 'OFTDateTime'})
         self.meta['polia'].append({'nazov': 'subor', 'typ': 'OFTString', 'sirka': 32})
 
-        # regex vyrazy riadkov suboru, druhy parameter je prefix funkcie ?_riadok ktora ma
-        # dany riadok spracovat
-        self.reg_riadky = (
-            (re.compile(r"(&L +)?P (?P<y>\d+(\.\d\d|\.\d)?) (?P<x>\d+(\.\d\d|\.\d)?)(?P<info>.*)"), 'p'),
-            (re.compile(r"([LCR]) (?P<y>\d+(\.\d\d|\.\d)?) (?P<x>\d+(\.\d\d|\.\d)?)(?P<info>.*)"), 'lc'),
-            # obluky sa spracuvavaju ako ciary
-            # (re.compile(r"""(R|NR) (?P<y>\d+(\.\d\d|\.\d)?) (?P<x>\d+(\.\d\d|\.\d)?)"""), 'r'),
-            (re.compile(r"(NL|NC|NR) (?P<y>\d+(\.\d\d|\.\d)?) (?P<x>\d+(\.\d\d|\.\d)?)(?P<info>.*)"), 'n'),
-            (re.compile(r"""&A (?P<nazov>.{1,6})=(?P<hodnota>.{1,40})"""), 'a'),
-            (re.compile(r"""&T (?P<y>\d+(\.\d\d|\.\d)?) (?P<x>\d+(\.\d\d|\.\d)?) ['"](?P<text>.+)['"](?P<info>.*)"""),
-             't'),
-            (re.compile(r"&O (?P<nazov>.{1,8}) (?P<id>\d+)"), 'o'),
-            (re.compile(r"&*"), 'vynechaj')
-        )
-
         self.buffer_obluku = None  # obluk sa sklada z troch bodov, tu sa ulozi druhy, kym sa nenacita treti
         self.prvy = False  # priznak ci uz bol spracovany prvy objekt
         self.index = 0
 
     def spracuj_info(self, text):
-        info = {}
-        for param in text.split():
-            param = param.strip()
-            if param and '=' in param:
-                meno, hodnota = param.split('=', 1)
-                info[meno] = hodnota
-        return info
+        if not text:
+            return {}
+        return dict(_parametre_info(text))
 
     def o_riadok(self, data):
         self.atributy_objektu['ID'] = data['id']
         self.meta['meno_objektu'] = data['nazov']
 
     def r_riadok(self, data):
-        self.wl.rotuj(data['y'], data['x'])
+        if self.krok_obluku is None or self.wl is None:
+            # bez nastaveneho kroku sa body obluku spracuju ako body ciary
+            self.lc_riadok(data)
+        else:
+            self.wl.rotuj(data['y'], data['x'], self.krok_obluku)
 
     def lc_riadok(self, data):
         self.wl.kresli(data['y'], data['x'])
@@ -95,7 +99,7 @@ class Objekt:
         text = data['text']
         info = self.spracuj_info(data['info'])
         self.textove_elementy.append({
-            'wkt': f'POINT({-float(data["y"]):.2f} {-float(data["x"]):.2f})',
+            'wkb': bod_wkb(data['y'], data['x']),
             'y': -float(data['y']),
             'x': -float(data['x']),
             'text': text,
@@ -106,27 +110,12 @@ class Objekt:
         pass
 
     def pridaj_riadok(self, riadok):
-        """Funkcia prechaza regularnymi vyrazmi a hlada ktory zapasuje, vysledok sa preda
-        na spracovanie definovanej funkcie"""
-        for reg, fcia in self.reg_riadky:
-            m = reg.match(riadok)
-            if m:
-                if fcia == "lc":
-                    self.lc_riadok(m.groupdict())
-                elif fcia == "p":
-                    self.p_riadok(m.groupdict())
-                elif fcia == "n":
-                    self.n_riadok(m.groupdict())
-                elif fcia == "o":
-                    self.o_riadok(m.groupdict())
-                elif fcia == "r":
-                    self.r_riadok(m.groupdict())
-                elif fcia == "a":
-                    self.a_riadok(m.groupdict())
-                elif fcia == "t":
-                    self.t_riadok(m.groupdict())
-                return
-        raise NepodporovanaVeta
+        """Funkcia podla zaciatku riadku vyberie parser vety, vysledok sa preda na spracovanie funkcii ?_riadok.
+        Riadky, ktore sa nepodarilo rozpoznat, sa vynechaju"""
+        parser = PARSERY_VIET.get(riadok[:1])
+        veta = parser(riadok) if parser is not None else None
+        if veta is not None:
+            getattr(self, veta[0])(veta[1])
 
     def spolocne_atributy(self):
         pass
@@ -152,15 +141,14 @@ class Objekt:
 
 
 class Bodovy_objekt(Objekt):
-    def __init__(self, atributy_suboru):
-        super(Bodovy_objekt, self).__init__(atributy_suboru)
-        self.meta['wkb_typ'] = ogr.wkbPoint
+    def __init__(self, atributy_suboru, krok_obluku=None):
+        super(Bodovy_objekt, self).__init__(atributy_suboru, krok_obluku)
+        self.meta['wkb_typ'] = WKB_BOD
         self.body = []
 
     def p_riadok(self, data):
-        wkt = f'POINT({-float(data["y"]):.2f} {-float(data["x"]):.2f})'
         info = self.spracuj_info(data['info'])
-        self.body.append({'wkt': wkt, 'text': '', 'info': info})
+        self.body.append({'wkb': bod_wkb(data['y'], data['x']), 'text': '', 'info': info})
 
     def lc_riadok(self, data):
         raise NepodporovanaVeta
@@ -172,16 +160,16 @@ class Liniovy_objekt(Objekt):
     )
     aktual_k = None
 
-    def __init__(self, atributy_suboru):
-        super(Liniovy_objekt, self).__init__(atributy_suboru)
-        self.meta['wkb_typ'] = ogr.wkbMultiLineString
+    def __init__(self, atributy_suboru, krok_obluku=None):
+        super(Liniovy_objekt, self).__init__(atributy_suboru, krok_obluku)
+        self.meta['wkb_typ'] = WKB_MULTILINIA
         self.linie = []
         self.wl = WktLinia(self)
 
     def _ukonci_liniu(self):
-        wkt = self.wl.wkt()
-        if wkt:
-            objekt = {'wkt': wkt, 'atributy': {'g_k': int(self.aktual_k)}}
+        wkb = self.wl.wkb()
+        if wkb:
+            objekt = {'wkb': wkb, 'atributy': {'g_k': int(self.aktual_k)}}
             self.linie.append(objekt)
         self.wl = WktLinia(self)
 
@@ -223,19 +211,26 @@ class Liniovy_objekt(Objekt):
 
 
 class Plosny_objekt(Objekt):
-    def __init__(self, atributy_suboru):
-        super(Plosny_objekt, self).__init__(atributy_suboru)
-        self.meta['wkb_typ'] = ogr.wkbMultiPolygon
+    def __init__(self, atributy_suboru, krok_obluku=None):
+        super(Plosny_objekt, self).__init__(atributy_suboru, krok_obluku)
+        self.meta['wkb_typ'] = WKB_MULTIPOLYGON
 
         self.wl = WktPolygon(self)
 
+    def pridaj_riadok(self, riadok):
+        # geometria kresli aj variant s posunutymi skokmi, podla vety urci, ako sa v nom veta zmeni
+        self.wl.posun_vety(riadok)
+        super(Plosny_objekt, self).pridaj_riadok(riadok)
+
     def geometricke_objekty(self):
-        wkt = self.wl.wkt()
-        return [{'wkt': wkt}] if wkt else []
+        wkb = self.wl.wkb()
+        return [{'wkb': wkb}] if wkb else []
 
     def data(self):
         data = super(Plosny_objekt, self).data()
         data["pocet_uzatvoreni"] = self.wl.pocet_uzatvoreni
+        if self.wl.otocenie:
+            data["otocenie"] = self.wl.otocenie
         return data
 
 
@@ -374,7 +369,7 @@ class POPIS(Bodovy_objekt):
         for textovy_element in self.textove_elementy:
             info = textovy_element['info']
             objekty.append({
-                'wkt': textovy_element['wkt'],
+                'wkb': textovy_element['wkb'],
                 'atributy': {
                     'text': textovy_element['text'],
                     'g_k': int(info.get('K', 1)),
@@ -402,7 +397,7 @@ class ZNACKY(Bodovy_objekt):
         objekty = []
         for bod in self.body:
             objekty.append({
-                'wkt': bod['wkt'],
+                'wkb': bod['wkb'],
                 'atributy': {
                     'g_s': int(bod['info'].get('S', 1)),
                     'g_u': float(bod['info'].get('U', 0)),
@@ -441,7 +436,7 @@ class INE_BODY(Bodovy_objekt):
         objekty = []
         for bod in self.body + self.textove_elementy:
             objekty.append({
-                'wkt': bod['wkt'],
+                'wkb': bod['wkb'],
                 'atributy': {
                     'text': bod['text'],
                 }
@@ -450,121 +445,223 @@ class INE_BODY(Bodovy_objekt):
 
 
 class INE_LINIE(Liniovy_objekt):
-    def __init__(self, atributy_suboru, nazov_vrstvy):
+    def __init__(self, atributy_suboru, nazov_vrstvy, krok_obluku=None):
         self.nazov_vrstvy = f'kn_{nazov_vrstvy.lower()}'
-        super(INE_LINIE, self).__init__(atributy_suboru)
+        super(INE_LINIE, self).__init__(atributy_suboru, krok_obluku)
 
 
 # ------------ Triedy zapisujuce vrstvy ---------------
 
-class Vystup_vrstvy(object):
-    """Zakladna trieda ktora sa stara o vytvorenie a zapis objektov jednej vrstvy do vystupneho suboru"""
-    datovy_zdroj = None
-
-    def __init__(self, nazov_suboru, driver, geom_type, nazov_vrstvy, nastavenia_vrstvy=None, kodovanie='utf-8'):
-        self.driver = driver
-        self.kodovanie = kodovanie
-        driver = ogr.GetDriverByName(driver)
-        self.datovy_zdroj = driver.CreateDataSource(nazov_suboru, options=nastavenia_vrstvy)
-        self.vrstva = self.datovy_zdroj.CreateLayer(nazov_vrstvy, geom_type=geom_type, options=nastavenia_vrstvy)
+class Copy_vystup(object):
+    """Zapis objektov jednej vrstvy do SQL suboru ako blok COPY do existujucej tabulky, bez GDAL. Geometria sa
+    zapisuje ako hex EWKB so SRID, riadky sa zapisuju do suboru po vacsich blokoch"""
+    velkost_buffra = 1 << 20
+
+    def __init__(self, nazov_suboru, nazov_vrstvy, nastavenia_vrstvy):
+        self.nazov_suboru = nazov_suboru
+        self.nazov_vrstvy = nazov_vrstvy
+        self.schema = nastavenia_vrstvy.get('SCHEMA', 'public')
+        self.nazov_geometrie = nastavenia_vrstvy.get('GEOMETRY_NAME', 'geom')
+        self.srid = int(nastavenia_vrstvy.get('SRID', 0))
+        self.subor = None
         self.polia = None
 
     def __del__(self):
         self.zatvor()
 
     def zatvor(self):
-        if self.datovy_zdroj:
-            self.datovy_zdroj.Destroy()
-            self.datovy_zdroj = None
+        if self.subor:
+            self.subor.write('\\.\nCOMMIT;\n')
+            self.subor.close()
+            self.subor = None
+
+    def zahod(self):
+        """Zatvori subor neuspesnej konverzie bez ukoncenia bloku COPY a zmaze ho"""
+        if self.subor:
+            self.subor.close()
+            self.subor = None
+        if self.polia is not None and os.path.exists(self.nazov_suboru):
+            os.remove(self.nazov_suboru)
 
     def priprav_polia(self, meta_polia):
-        for pole in meta_polia:
-            # pridanie vynimky pre ESRI Shapefile format, ktory nepodporuje datovy typ datetime
-            if self.driver == 'ESRI Shapefile' and pole['typ'] == 'OFTDateTime':
-                pole['typ'] = 'OFTDate'
-            typ = f'ogr.{pole["typ"]}'
-
-            fd = ogr.FieldDefn(pole['nazov'], eval(typ))
-            if 'sirka' in pole:
-                fd.SetWidth(pole['sirka'])
-            if 'presnost' in pole:
-                fd.SetPrecision(pole['presnost'])
-            self.vrstva.CreateField(fd)
-
-        self.polia = True
-
-    def features(self, data):
-        for objekt in data['geometricke_objekty']:
-            f = ogr.Feature(feature_def=self.vrstva.GetLayerDefn())
+        self.polia = [(pole['nazov'], _formatovac_copy(pole)) for pole in meta_polia]
+        stlpce = ', '.join(f'"{nazov}"' for nazov in [self.nazov_geometrie] + [pole['nazov'] for pole in meta_polia])
+        self.subor = open(self.nazov_suboru, 'w', encoding='utf-8', newline='\n', buffering=self.velkost_buffra)
+        self.subor.write("SET client_encoding = 'UTF8';\nBEGIN;\n"
+                         f'COPY "{self.schema}"."{self.nazov_vrstvy}" ({stlpce}) FROM STDIN;\n')
 
-            atributy = data['atributy']
+    def riadky(self, data):
+        for objekt in data['geometricke_objekty']:
+            atributy = dict(data['atributy'])
             atributy.update(objekt.get('atributy', {}))
-            for atribut, hodnota in atributy.items():
-                if isinstance(hodnota, tuple):
-                    # datetime hodnota
-                    f.SetField(atribut, *hodnota)
-                else:
-                    # if isinstance(hodnota, str):
-                    #     f.SetField(atribut, hodnota.encode(self.kodovanie))
-                    # else:
-                    f.SetField(atribut, hodnota)
-
-            wkt = objekt['wkt']
-            geom = ogr.CreateGeometryFromWkt(wkt)
-            if geom.GetGeometryType() == ogr.wkbLineString:
-                geom = ogr.ForceToMultiLineString(geom)
-            elif geom.GetGeometryType() == ogr.wkbPolygon:
-                geom = ogr.ForceToMultiPolygon(geom)
-            f.SetGeometryDirectly(geom)
-            yield f
+            riadok = [ewkb_hex(objekt['wkb'], self.srid)]
+            for nazov, formatovac in self.polia:
+                hodnota = atributy.get(nazov)
+                riadok.append('\\N' if hodnota is None else formatovac(hodnota))
+            yield '\t'.join(riadok) + '\n'
 
     def uloz(self, data):
-        if not self.polia:
+        if self.polia is None:
             self.priprav_polia(data['meta']['polia'])
-        for feature in self.features(data):
-            self.vrstva.CreateFeature(feature)
-            feature.Destroy()
+        self.subor.writelines(self.riadky(data))
 
 
-class CAD_vystup(object):
-    def __init__(self, vystup):
-        self.vystup = vystup
+class Postgis_vystup(object):
+    """Zapis objektov jednej vrstvy priamo do databazy. Riadky sa zbieraju pocas spracovania suboru a pri zatvoreni
+    sa odovzdaju nahravacu (katastertools.postgis.Nahravac) ako jedna davka binarneho COPY"""
+
+    def __init__(self, nahravac, nazov_vrstvy, nastavenia_vrstvy):
+        self.nahravac = nahravac
+        self.nazov_vrstvy = nazov_vrstvy
+        self.schema = nastavenia_vrstvy.get('SCHEMA', 'public')
+        self.nazov_geometrie = nastavenia_vrstvy.get('GEOMETRY_NAME', 'geom')
+        self.srid = int(nastavenia_vrstvy.get('SRID', 0))
+        self.polia = None
+        self.riadky = []
+
+    def zatvor(self):
+        if self.riadky:
+            stlpce = [self.nazov_geometrie] + [nazov for nazov, _ in self.polia]
+            self.nahravac.nahraj(self.schema, self.nazov_vrstvy, stlpce, self.riadky, binarne=True)
+            self.riadky = []
+
+    def zahod(self):
+        self.riadky = []
+
+    def priprav_polia(self, meta_polia):
+        self.polia = [(pole['nazov'], _prevodnik_postgis(pole)) for pole in meta_polia]
 
     def uloz(self, data):
-        # Ak objekt obsahuje textove elementy (vety), potom sa pre kazdy element vytvori bodovy objekt na danej
-        # pozicii s hodnotou textu ulozenou v atribute 'Text'. Vsetky povodne atributy sa zmazu, resp. neulozia.
-        data['atributy'] = {}
-        data['meta']['polia'] = []
-        for geom_objekt in data['geometricke_objekty']:
-            geom_objekt['atributy'] = {}
-
-        for f in self.vystup.features(data):
-            f.SetStyleString('PEN(c:#FF0000)')
-            self.vystup.vrstva.CreateFeature(f)
-            f.Destroy()
-        if data.get('textove_elementy'):
-            for text_element in data['textove_elementy']:
-                f = ogr.Feature(feature_def=self.vystup.vrstva.GetLayerDefn())
-                geom = ogr.CreateGeometryFromWkt(text_element['wkt'])
-                f.SetGeometry(geom)
-                f.SetField('Text', text_element['text'].encode(self.vystup.kodovanie))
-                f.SetStyleString('LABEL(f:"Times New Roman",s:10pt)')
-                self.vystup.vrstva.CreateFeature(f)
-                f.Destroy()
+        if self.polia is None:
+            self.priprav_polia(data['meta']['polia'])
+        for objekt in data['geometricke_objekty']:
+            atributy = dict(data['atributy'])
+            atributy.update(objekt.get('atributy', {}))
+            riadok = [ewkb(objekt['wkb'], self.srid)]
+            for nazov, prevodnik in self.polia:
+                hodnota = atributy.get(nazov)
+                riadok.append(None if hodnota is None else prevodnik(hodnota))
+            self.riadky.append(riadok)
+
+
+class Parquet_vystup(object):
+    """Zapis objektov jednej vrstvy do suboru GeoParquet (geometria ako WKB). Riadky sa zapisuju po davkach (record
+    batch), takze pamat nezavisi od velkosti vrstvy. Subor obsahuje objekty jedneho VGI suboru, teda jedneho KU.
+    Stlpce subor a stav_k su ulozene slovnikovym kodovanim"""
+    velkost_davky = 65536
+    slovnikove_polia = ('subor', 'stav_k')
+    # subory su v adresaroch <pole>=<hodnota> (hive), stlpec doplnia citacie z cesty, v subore by mal iny typ ako
+    # v ceste a dataset vrstvy by sa nedal nacitat
+    pole_oddielu = 'ku'
+
+    def __init__(self, nazov_suboru, geom_type, nastavenia_vrstvy):
+        self.pa, self.pq = _pyarrow()
+        self.nazov_suboru = nazov_suboru
+        self.geom_type = geom_type
+        self.nazov_geometrie = nastavenia_vrstvy.get('GEOMETRY_NAME', 'geom')
+        self.srid = int(nastavenia_vrstvy.get('SRID', 0))
+        self.zapisovac = None
+        self.polia = None
+
+    def __del__(self):
+        self.zatvor()
+
+    def zatvor(self):
+        if self.zapisovac:
+            self.zapis_davku()
+            self.zapisovac.close()
+            self.zapisovac = None
+
+    def zahod(self):
+        if self.zapisovac:
+            self.zapisovac.close()
+            self.zapisovac = None
+        if self.polia is not None and os.path.exists(self.nazov_suboru):
+            os.remove(self.nazov_suboru)
+
+    def priprav_polia(self, meta_polia):
+        pa = self.pa
+        meta_polia = [pole for pole in meta_polia if pole['nazov'] != self.pole_oddielu]
+        self.polia = [(pole['nazov'], _prevodnik_parquet(pole)) for pole in meta_polia]
+        stlpce = [pa.field(self.nazov_geometrie, pa.binary())]
+        stlpce += [pa.field(pole['nazov'], _typ_parquet(pa, pole)) for pole in meta_polia]
+        geo = {
+            'version': '1.0.0',
+            'primary_column': self.nazov_geometrie,
+            'columns': {self.nazov_geometrie: {
+                'encoding': 'WKB',
+                'geometry_types': [_NAZVY_WKB_TYPOV[self.geom_type]] if self.geom_type in _NAZVY_WKB_TYPOV else [],
+                'crs': _projjson(self.srid),
+            }},
+        }
+        self.schema = pa.schema(stlpce, metadata={'geo': json.dumps(geo)})
+        nazvy = [stlpec.name for stlpec in stlpce]
+        self.zapisovac = self.pq.ParquetWriter(self.nazov_suboru, self.schema, compression='zstd',
+                                               use_dictionary=[n for n in self.slovnikove_polia if n in nazvy])
+        self.stlpce = [[] for _ in stlpce]
+
+    def zapis_davku(self):
+        if self.stlpce[0]:
+            davka = self.pa.record_batch([self.pa.array(hodnoty, type=stlpec.type)
+                                          for hodnoty, stlpec in zip(self.stlpce, self.schema)], schema=self.schema)
+            self.zapisovac.write_batch(davka, row_group_size=self.velkost_davky)
+            self.stlpce = [[] for _ in self.stlpce]
+
+    def uloz(self, data):
+        if self.polia is None:
+            self.priprav_polia(data['meta']['polia'])
+        geometrie = self.stlpce[0]
+        for objekt in data['geometricke_objekty']:
+            atributy = dict(data['atributy'])
+            atributy.update(objekt.get('atributy', {}))
+            geometrie.append(objekt['wkb'])
+            for stlpec, (nazov, prevodnik) in zip(self.stlpce[1:], self.polia):
+                hodnota = atributy.get(nazov)
+                stlpec.append(None if hodnota is None else prevodnik(hodnota))
+            if len(geometrie) >= self.velkost_davky:
+                self.zapis_davku()
+                geometrie = self.stlpce[0]
 
 
 class Zapisovac:
-    def __init__(self, nazov, cesta, format, nazvy_vrstiev=None, nastavenia_vrstvy=None):
+    """Zapis objektov jedneho VGI suboru do vystupu v danom formate. Ak su zadane vrstvy, zapisuju sa iba objekty
+    tychto vrstiev, ostatne su urcene pre ine vystupy toho isteho spracovania"""
+    def __init__(self, nazov, cesta, format, nazvy_vrstiev=None, nastavenia_vrstvy=None, nahravac=None,
+                 subor=None, nahradzane_vrstvy=None, velkost_davky=None, spolocny_vystup=None, vrstvy=None):
         self.__zapisovac_vrstvy = {}
+        self.__vrstvy = vrstvy
         self.__nazov = nazov
         self.__cesta = os.path.join(cesta, nazov)
         self.__format = format
         self.__nazvy_vrstiev = nazvy_vrstiev
         self.__nastavenia_vrstvy = nastavenia_vrstvy
+        self.__nahravac = nahravac
+        # GeoPackage je spolocny pre vsetky subory, objekty suboru v nom nahradzaju objekty predchadzajuceho importu
+        self.__geopackage = None
+        self.__koren = cesta
+        self.__nazov_geopackage = os.path.join(cesta, 'kataster.gpkg')
+        self.__subor = subor or nazov
+        self.__nahradzane_vrstvy = nahradzane_vrstvy
+        self.__velkost_davky = velkost_davky
+        # vrstvy FlatGeobuf su spolocne pre cely beh, ak ich nikto nezdiela, patria iba tomuto suboru
+        self.__vlastny_vystup = format == 'fgb' and spolocny_vystup is None
+        self.__spolocny_vystup = spolocny_vystup
+        if self.__vlastny_vystup:
+            from katastertools.VgiShp.ogr_vystupy import Spolocny_vystup
+            self.__spolocny_vystup = Spolocny_vystup(self.__cesta)
+
+    def __otvor_geopackage(self):
+        if self.__geopackage is None:
+            if not os.path.exists(os.path.dirname(self.__nazov_geopackage)):
+                os.makedirs(os.path.dirname(self.__nazov_geopackage))
+            from katastertools.VgiShp.ogr_vystupy import Geopackage
+            self.__geopackage = Geopackage(self.__nazov_geopackage, self.__subor, self.__nahradzane_vrstvy)
+        return self.__geopackage
 
     def uloz(self, data):
-        os.environ['PG_USE_COPY'] = 'YES' if self.__format == 'sql-copy' else 'NO'
         vrstva = data['meta']['nazov_vrstvy']
+        if self.__vrstvy is not None and vrstva not in self.__vrstvy:
+            return
         if not vrstva.lower() in self.__zapisovac_vrstvy:
             if self.__nazvy_vrstiev and vrstva in self.__nazvy_vrstiev:
                 nazov_vystupnej_vrstvy = self.__nazvy_vrstiev[vrstva].lower()
@@ -573,12 +670,16 @@ class Zapisovac:
 
             kodovanie = 'utf-8'
             nastavenia_vrstvy = {}
+            konfiguracia = None
             if self.__format == 'shp':
                 driver = 'ESRI Shapefile'
                 kodovanie = 'cp1250'
                 # Shapefile driver vygeneruje nazvy suborov podla nazvov vrstiev
                 nazov_suboru = ''
                 nazov_vystupnej_vrstvy = f'{self.__nazov}_{nazov_vystupnej_vrstvy}'
+            elif self.__format in ('gpkg', 'fgb'):
+                driver = None
+                nazov_suboru = ''
             elif self.__format == 'dgn':
                 driver = 'DGN'
                 nazov_suboru = f'{self.__nazov}_{nazov_vystupnej_vrstvy}.dgn'
@@ -588,6 +689,8 @@ class Zapisovac:
                 }
             else:
                 driver = 'PGDump'
+                # INSERT namiesto COPY, iba pre tento vystup
+                konfiguracia = {'PG_USE_COPY': 'NO'}
                 nazov_suboru = f'{self.__nazov}_{nazov_vystupnej_vrstvy}.sql'
                 nastavenia_vrstvy = {
                     'CREATE_TABLE': 'OFF',
@@ -599,57 +702,392 @@ class Zapisovac:
                 }
             if self.__nastavenia_vrstvy:
                 nastavenia_vrstvy.update(dict(item.split("=") for item in self.__nastavenia_vrstvy))
-            nastavenia_vrstvy = [f"{key}={value}" for key, value in nastavenia_vrstvy.items()]
 
-            nazov_suboru = os.path.join(self.__cesta, nazov_suboru)
+            if self.__format == 'parquet':
+                # subory su rozdelene do adresarov podla vrstvy a KU (<vrstva>/ku=<KU>/<subor>.parquet)
+                pole = Parquet_vystup.pole_oddielu
+                nazov_suboru = os.path.join(self.__koren, nazov_vystupnej_vrstvy, f'{pole}={data["atributy"][pole]}',
+                                            f'{self.__nazov}.parquet')
+            else:
+                nazov_suboru = os.path.join(self.__cesta, nazov_suboru)
             cesta = os.path.dirname(nazov_suboru)
-            if not os.path.exists(cesta):
+            if self.__format not in ('postgis', 'gpkg', 'fgb') and not os.path.exists(cesta):
                 os.makedirs(cesta)
 
-            vystup = Vystup_vrstvy(nazov_suboru, driver, data['meta']['wkb_typ'],
-                                   nazov_vystupnej_vrstvy, nastavenia_vrstvy=nastavenia_vrstvy, kodovanie=kodovanie)
+            if self.__format == 'fgb':
+                vystup = self.__spolocny_vystup.vrstva(nazov_vystupnej_vrstvy, data['meta']['wkb_typ'],
+                                                       self.__velkost_davky)
+            elif self.__format == 'gpkg':
+                from katastertools.VgiShp.ogr_vystupy import Vystup_gpkg_vrstvy
+                vystup = Vystup_gpkg_vrstvy(self.__otvor_geopackage(), data['meta']['wkb_typ'],
+                                            nazov_vystupnej_vrstvy)
+            elif self.__format == 'postgis':
+                # objekty sa nahravaju priamo do databazy, nevytvara sa ziadny subor
+                vystup = Postgis_vystup(self.__nahravac, nazov_vystupnej_vrstvy, nastavenia_vrstvy)
+            elif self.__format == 'parquet':
+                vystup = Parquet_vystup(nazov_suboru, data['meta']['wkb_typ'], nastavenia_vrstvy)
+            elif self.__format == 'sql-copy':
+                # COPY bloky sa zapisuju priamo, bez GDAL PGDump
+                vystup = Copy_vystup(nazov_suboru, nazov_vystupnej_vrstvy, nastavenia_vrstvy)
+            else:
+                # GDAL sa nacita az pri prvom vystupe cez OGR
+                from katastertools.VgiShp.ogr_vystupy import Vystup_vrstvy, CAD_vystup
+                vystup = Vystup_vrstvy(nazov_suboru, driver, data['meta']['wkb_typ'], nazov_vystupnej_vrstvy,
+                                       nastavenia_vrstvy=[f"{key}={value}" for key, value in nastavenia_vrstvy.items()],
+                                       kodovanie=kodovanie, velkost_davky=self.__velkost_davky,
+                                       konfiguracia=konfiguracia)
             if self.__format == 'dgn':
                 vystup = CAD_vystup(vystup)
             self.__zapisovac_vrstvy[vrstva.lower()] = vystup
 
         self.__zapisovac_vrstvy[vrstva.lower()].uloz(data)
 
+    def zatvor(self):
+        if self.__format == 'fgb':
+            # spolocne vrstvy zatvara ten, kto ich vytvoril
+            if self.__vlastny_vystup:
+                self.__spolocny_vystup.zatvor()
+            return
+        for vystup in self.__zapisovac_vrstvy.values():
+            if self.__format == 'dgn':
+                vystup = vystup.vystup
+            vystup.zatvor()
+        if self.__format == 'gpkg':
+            # aj subor bez objektov nahradi objekty predchadzajuceho importu
+            self.__otvor_geopackage().zatvor()
+            self.__geopackage = None
+
+    def zahod(self):
+        """Zrusi vystupy neuspesnej konverzie: transakcia GeoPackage sa vrati spat, objekty sa nenahraju do databazy
+        a ciastocne zapisane subory sa zmazu. Objekty zapisane do spolocnych vrstiev FlatGeobuf zahodi ten, kto ich
+        vytvoril"""
+        if self.__format == 'fgb':
+            if self.__vlastny_vystup:
+                self.__spolocny_vystup.zahod()
+                shutil.rmtree(self.__cesta, ignore_errors=True)
+            return
+        for vystup in self.__zapisovac_vrstvy.values():
+            if self.__format == 'dgn':
+                vystup = vystup.vystup
+            vystup.zahod()
+        self.__zapisovac_vrstvy = {}
+        if self.__format == 'gpkg':
+            if self.__geopackage is not None:
+                self.__geopackage.zahod()
+                self.__geopackage = None
+        elif self.__format not in ('postgis', 'parquet'):
+            # vystupy suboru su v jeho adresari
+            shutil.rmtree(self.__cesta, ignore_errors=True)
 
-# ------------ Pomocne triedy ---------------
-
-class HBod(object):
-    """Trieda v ktorej sa ukladaju suradnice konkretneho bodu"""
-
-    def __init__(self, bx, by):
-        self.__str = f"-{bx} -{by}"
-        self.x = float(bx)
-        self.y = float(by)
-
-    def __str__(self):
-        return self.__str
 
-    def __repr__(self):
-        return self.__str
+# ------------ Pomocne triedy ---------------
 
-    def __eq__(self, iny_bod):
-        """Funcia porovnava dva HBody ak sa pouziju vo vyraze HBod1 == HBod2"""
-        return isinstance(iny_bod, HBod) and self.x == iny_bod.x and self.y == iny_bod.y
+_ESCAPE_COPY = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+
+def ewkb(wkb: bytes, srid: int) -> bytes:
+    """WKB s hlavickou v little endian doplni o SRID (EWKB)"""
+    typ, = struct.unpack_from('<I', wkb, 1)
+    return struct.pack('<BII', 1, typ | 0x20000000, srid) + wkb[5:]
+
+
+def ewkb_hex(wkb: bytes, srid: int) -> str:
+    """EWKB ako hex text pre COPY v textovom formate"""
+    return ewkb(wkb, srid).hex().upper()
+
+
+def text_casu(hodnota: tuple) -> str:
+    """Datum a cas v tvare (rok, mesiac, den, hodina, minuta, sekunda, casove pasmo GDAL) ako text pre PostgreSQL.
+    Casove pasmo 100 je GMT, kazda jednotka navyse alebo menej je posun o 15 minut, 0 a 1 pasmo neurcuju"""
+    text = '%04d-%02d-%02d %02d:%02d:%02d' % hodnota[:6]
+    pasmo = hodnota[6] if len(hodnota) > 6 else 0
+    if pasmo > 1:
+        posun = (pasmo - 100) * 15
+        znamienko = '+' if posun >= 0 else '-'
+        hodiny, minuty = divmod(abs(posun), 60)
+        text += f'{znamienko}{hodiny:02d}' + (f':{minuty:02d}' if minuty else '')
+    return text
+
+
+def cas_datetime(hodnota: tuple) -> datetime.datetime:
+    """Datum a cas v tvare (rok, mesiac, den, hodina, minuta, sekunda, casove pasmo GDAL) ako datetime. Pri pasme
+    0 a 1 vrati cas bez pasma"""
+    cas = datetime.datetime(*hodnota[:6])
+    pasmo = hodnota[6] if len(hodnota) > 6 else 0
+    if pasmo > 1:
+        cas = cas.replace(tzinfo=datetime.timezone(datetime.timedelta(minutes=(pasmo - 100) * 15)))
+    return cas
+
+
+def _prevodnik_postgis(pole: dict):
+    """Funkcia, ktora prevedie hodnotu pola na Python typ pre binarny COPY"""
+    typ = pole['typ']
+    if typ == 'OFTInteger':
+        return int
+    if typ == 'OFTReal':
+        return float
+    if typ in ('OFTDateTime', 'OFTDate'):
+        return cas_datetime
+    sirka = pole.get('sirka')
+    if sirka:
+        return lambda hodnota: str(hodnota)[:sirka]
+    return str
+
+
+_NAZVY_WKB_TYPOV = {
+    WKB_BOD: 'Point',
+    WKB_LINIA: 'LineString',
+    WKB_POLYGON: 'Polygon',
+    WKB_MULTILINIA: 'MultiLineString',
+    WKB_MULTIPOLYGON: 'MultiPolygon',
+}
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError('Vystup GeoParquet vyzaduje balik pyarrow')
+    return pyarrow, pyarrow.parquet
+
+
+@functools.lru_cache(maxsize=None)
+def _projjson(srid: int):
+    """Suradnicovy system ako PROJJSON pre metadata GeoParquet, z GDAL alebo, ak nie je nainstalovany, z pyproj"""
+    if not srid:
+        return None
+    try:
+        from osgeo import osr
+    except ImportError:
+        import pyproj
+        return pyproj.CRS.from_epsg(srid).to_json_dict()
+    srs = osr.SpatialReference()
+    srs.ImportFromEPSG(srid)
+    return json.loads(srs.ExportToPROJJSON())
+
+
+def _typ_parquet(pa, pole: dict):
+    typ = pole['typ']
+    if typ == 'OFTInteger':
+        return pa.int32()
+    if typ == 'OFTReal':
+        return pa.float64()
+    if typ in ('OFTDateTime', 'OFTDate'):
+        return pa.timestamp('s', tz='UTC')
+    return pa.string()
+
+
+def _cas_utc(hodnota: tuple) -> datetime.datetime:
+    # cas bez pasma sa uklada ako UTC
+    cas = cas_datetime(hodnota)
+    return cas.astimezone(datetime.timezone.utc) if cas.tzinfo else cas
+
+
+def _prevodnik_parquet(pole: dict):
+    """Funkcia, ktora prevedie hodnotu pola na Python typ stlpca GeoParquet"""
+    if pole['typ'] in ('OFTDateTime', 'OFTDate'):
+        return _cas_utc
+    return _prevodnik_postgis(pole)
+
+
+def _formatovac_copy(pole: dict):
+    """Funkcia, ktora prevedie hodnotu pola na text pre COPY"""
+    typ = pole['typ']
+    if typ == 'OFTInteger':
+        return lambda hodnota: str(int(hodnota))
+    if typ == 'OFTReal':
+        return lambda hodnota: repr(float(hodnota))
+    if typ in ('OFTDateTime', 'OFTDate'):
+        return text_casu
+    sirka = pole.get('sirka')
+    if sirka:
+        # dlhsie texty GDAL PGDump oreze na sirku pola
+        return lambda hodnota: str(hodnota)[:sirka].translate(_ESCAPE_COPY)
+    return lambda hodnota: str(hodnota).translate(_ESCAPE_COPY)
+
+
+def na_centimetre(hodnota: str) -> int:
+    """Prevedie suradnicu v tvare 123, 123.4 alebo 123.45 na cele centimetre. Suradnice maju najviac dve desatinne
+    miesta a su mensie ako 2^40 cm, takze chyba float-u sa zaokruhlenim vzdy odstrani"""
+    return round(float(hodnota) * 100)
+
+
+def text_suradnice(centimetre: int) -> str:
+    """Suradnica vo vystupe ako text. Vo vystupe su suradnice zaporne"""
+    return '%.2f' % (-centimetre / 100)
+
+
+@functools.lru_cache(maxsize=1024)
+def _format_bodov(pocet_bodov: int) -> str:
+    return ', '.join(['%.2f %.2f'] * pocet_bodov)
+
+
+def suradnice_wkb(body: array) -> bytes:
+    """Suradnice ulozene v centimetroch prevedie na pole double hodnot vo WKB (little endian)"""
+    suradnice = array('d', [-c / 100 for c in body])
+    if sys.byteorder != 'little':
+        suradnice.byteswap()
+    return suradnice.tobytes()
+
+
+def pocet_bodov_wkb(wkb: bytes, pozicia: int = 0) -> int:
+    """Pocet bodov 2D geometrie vo WKB (little endian)"""
+    return _body_wkb(wkb, pozicia)[0]
+
+
+def _body_wkb(wkb: bytes, pozicia: int) -> tuple:
+    typ, = struct.unpack_from('<I', wkb, pozicia + 1)
+    pozicia += 5
+    if typ == WKB_BOD:
+        return 1, pozicia + 16
+    pocet, = struct.unpack_from('<I', wkb, pozicia)
+    pozicia += 4
+    if typ == WKB_LINIA:
+        return pocet, pozicia + 16 * pocet
+    body = 0
+    for _ in range(pocet):
+        if typ == WKB_POLYGON:
+            # kruh polygonu nema vlastnu hlavicku, iba pocet bodov
+            n, = struct.unpack_from('<I', wkb, pozicia)
+            pozicia += 4 + 16 * n
+        else:
+            n, pozicia = _body_wkb(wkb, pozicia)
+        body += n
+    return body, pozicia
+
+
+def bod_wkb(y: str, x: str) -> bytes:
+    return struct.pack('<BIdd', 1, WKB_BOD, -float(y), -float(x))
+
+
+def text_bodov(body: array) -> str:
+    return _format_bodov(len(body) // 2) % tuple([-c / 100 for c in body])
+
+
+def otoc_body(body: array) -> array:
+    """Vrati body v opacnom poradi"""
+    otocene = array('q', body)
+    otocene[0::2] = body[-2::-2]
+    otocene[1::2] = body[-1::-2]
+    return otocene
+
+
+def dvojnasobna_plocha(body: array) -> int:
+    """Dvojnasobok orientovanej plochy uzatvoreneho kruhu v cm2, kladna ak su body proti smeru hodinovych ruciciek.
+    Suradnice vo vystupe su zaporne, co je otocenie o 180 stupnov, takze orientacia sa nemeni"""
+    x = body[0::2]
+    y = body[1::2]
+    return sum(map(operator.mul, x, y[1:])) - sum(map(operator.mul, x[1:], y))
+
+
+def poloha_bodu(bx: int, by: int, body: array) -> int:
+    """Poloha bodu voci uzatvorenemu kruhu: 1 vnutri, -1 mimo, 0 na hranici"""
+    vnutri = False
+    x1, y1 = body[0], body[1]
+    for i in range(2, len(body), 2):
+        x2, y2 = body[i], body[i + 1]
+        if (y1 > by) != (y2 > by):
+            vektorovy_sucin = (x2 - x1) * (by - y1) - (bx - x1) * (y2 - y1)
+            if vektorovy_sucin == 0:
+                return 0
+            if (vektorovy_sucin > 0) == (y2 > y1):
+                vnutri = not vnutri
+        elif y1 == by == y2 and min(x1, x2) <= bx <= max(x1, x2):
+            return 0
+        elif (bx, by) == (x2, y2):
+            return 0
+        x1, y1 = x2, y2
+    return 1 if vnutri else -1
+
+
+def obdlznik_bodov(body: array) -> tuple:
+    x = body[0::2]
+    y = body[1::2]
+    return min(x), min(y), max(x), max(y)
+
+
+class MriezkaKruhov:
+    """Jednoducha priestorova mriezka kruhov, bunka obsahuje kruhy, ktorych obdlznik do nej zasahuje"""
+
+    def __init__(self, obdlznik, pocet):
+        self.minx, self.miny = obdlznik[0], obdlznik[1]
+        strana = max(obdlznik[2] - obdlznik[0], obdlznik[3] - obdlznik[1], 1)
+        self.velkost = max(strana // max(math.isqrt(pocet), 1), 1)
+        self.bunky = {}
+
+    def pridaj(self, kruh, obdlznik):
+        v = self.velkost
+        for i in range((obdlznik[0] - self.minx) // v, (obdlznik[2] - self.minx) // v + 1):
+            for j in range((obdlznik[1] - self.miny) // v, (obdlznik[3] - self.miny) // v + 1):
+                self.bunky.setdefault((i, j), []).append(kruh)
+
+    def kruhy_v_bode(self, bx, by):
+        return self.bunky.get(((bx - self.minx) // self.velkost, (by - self.miny) // self.velkost), ())
+
+
+def vnor_kruhy(kruhy: list) -> list:
+    """Kruhy (body, dvojnasobna plocha) rozdeli na obvody a diery. Kruh vnoreny v obvode je diera, kruh vnoreny
+    v diere je dalsi obvod. Vrati zoznam (index obvodu, [indexy dier]) v poradi kruhov"""
+    if len(kruhy) == 1:
+        return [(0, [])]
+
+    obdlzniky = [obdlznik_bodov(body) for body, _ in kruhy]
+    mriezka = MriezkaKruhov((min(o[0] for o in obdlzniky), min(o[1] for o in obdlzniky),
+                             max(o[2] for o in obdlzniky), max(o[3] for o in obdlzniky)), len(kruhy))
+    rodic = {}
+    hlbka = {}
+    # vacsie kruhy sa spracuju skor, najmensi obsahujuci kruh je preto priamy rodic
+    for i in sorted(range(len(kruhy)), key=lambda k: -abs(kruhy[k][1])):
+        body = kruhy[i][0]
+        o = obdlzniky[i]
+        najmensi = None
+        for j in mriezka.kruhy_v_bode(body[0], body[1]):
+            oj = obdlzniky[j]
+            if oj[0] > o[0] or oj[1] > o[1] or oj[2] < o[2] or oj[3] < o[3]:
+                continue
+            if najmensi is not None and abs(kruhy[j][1]) >= abs(kruhy[najmensi][1]):
+                continue
+            for k in range(0, len(body) - 2, 2):
+                poloha = poloha_bodu(body[k], body[k + 1], kruhy[j][0])
+                if poloha:
+                    break
+            if poloha > 0:
+                najmensi = j
+        rodic[i] = najmensi
+        hlbka[i] = 0 if najmensi is None else hlbka[najmensi] + 1
+        mriezka.pridaj(i, o)
+
+    polygony = {i: [] for i in range(len(kruhy)) if hlbka[i] % 2 == 0}
+    for i in range(len(kruhy)):
+        if hlbka[i] % 2:
+            polygony[rodic[i]].append(i)
+    return list(polygony.items())
+
+
+def pocet_uzatvoreni(neuzatvorene: list) -> int:
+    """Pocet kruhov, ktore sa musia nasilu uzatvorit, kratsie ciary sa zmazu"""
+    return sum(1 for body in neuzatvorene if len(body) > 6)
+
+
+def wkb_kruhu(body: array, otocit: bool) -> bytes:
+    if otocit:
+        body = otoc_body(body)
+    return struct.pack('<I', len(body) // 2) + suradnice_wkb(body)
 
 
 class HLinia(object):
-    """Trieda v ktorej sa ukladaju HBod-y ktore tvoria konkretnu liniu alebo polygon"""
+    """Trieda v ktorej sa ukladaju body, ktore tvoria konkretnu liniu alebo polygon. Suradnice bodov sa ukladaju
+    v celych centimetroch za sebou v jednom poli (y1, x1, y2, x2, ...), text sa vytvara az pri vystupe"""
 
     def __init__(self, i):
         self.__index = i
-        self.__body = []
+        self.__body = array('q')
         self.pocet_bodov = 0
         self.zatvorena = False
 
     def __preved_na_str(self):
-        str_body = []
-        for bod in self.__body:
-            str_body.append(str(bod))
-        return ', '.join(str_body)
+        return text_bodov(self.__body)
 
     def __str__(self):
         return self.__preved_na_str()
@@ -658,43 +1096,63 @@ class HLinia(object):
         return self.__preved_na_str()
 
     def __getitem__(self, index):
-        return self.__body[index]
+        """Vrati suradnice bodu ako dvojicu celych centimetrov"""
+        if index < 0:
+            index += self.pocet_bodov
+        if not 0 <= index < self.pocet_bodov:
+            raise IndexError(index)
+        return self.__body[2 * index], self.__body[2 * index + 1]
+
+    def suradnice(self) -> array:
+        return self.__body
+
+    def kopia(self):
+        kopia = copy.copy(self)
+        kopia.__body = array('q', self.__body)
+        return kopia
+
+    def wkb_linie(self) -> bytes:
+        return struct.pack('<BII', 1, WKB_LINIA, self.pocet_bodov) + suradnice_wkb(self.__body)
 
     def pridaj(self, bx, by):
-        if self.zatvorena:
-            self.zatvorena = False
-        self.__body.append(HBod(bx, by))
+        bx = round(float(bx) * 100)
+        by = round(float(by) * 100)
+        body = self.__body
+        body.append(bx)
+        body.append(by)
         self.pocet_bodov += 1
-        if self.pocet_bodov > 1 and self.__body[0] == self.__body[-1]:
-            self.zatvorena = True
-
-    def porovnaj(self, bx, by):
-        """Funcia porovna suradnice so suradnicami posledneho bodu v linii. Vyuziva sa to pri
-        hladani ciary, na ktorej mam pokracovat, pri odskokoch na inu ciaru"""
-        bod = HBod(bx, by)
+        self.zatvorena = self.pocet_bodov > 1 and body[0] == bx and body[1] == by
 
-        if self.__body[-1] == bod:
-            return self.__index
-        else:
-            return False
+    def pridaj_cm(self, bx: int, by: int):
+        body = self.__body
+        body.append(bx)
+        body.append(by)
+        self.pocet_bodov += 1
+        self.zatvorena = self.pocet_bodov > 1 and body[0] == bx and body[1] == by
 
     def zatvor(self):
         """Funkcia zatvori polygon, cize prida na koniec rovnaky bod ako je na zaciatku"""
         self.__body.append(self.__body[0])
+        self.__body.append(self.__body[1])
         self.pocet_bodov += 1
         self.zatvorena = True
 
 
 class WktGeneric(object):
-    """Toto je jadro celeho skriptu, objekt ktory sa stara o spravne vygenerovanie WKT z vlozenej
+    """Toto je jadro celeho skriptu, objekt ktory sa stara o spravne vygenerovanie geometrie (WKB) z vlozenej
     postupnosti bodov"""
-    _wkt = None
+    _wkb = None
+    # varovania kreslenia, ktore sa zapisu do logu az ked sa geometria pouzije, None znamena zapis hned
+    _odlozene = None
 
     def __init__(self, objekt):
         self.__index = False
         self.__index_indexov = 1
         self.__buffer_obluku = None
         self._ciary = {}
+        # index koncovych bodov ciar: (y, x) v cm -> mnozina indexov ciar, ktore v tom bode koncia
+        self._konce = {}
+        self._koniec_ciary = {}
         self._objekt = objekt
         self.spravy = []
         self.pocet_uzatvoreni = 0
@@ -707,9 +1165,24 @@ class WktGeneric(object):
         else:
             return uhol
 
+    def _varuj(self, sprava):
+        if self._odlozene is None:
+            logging.warning(sprava)
+        else:
+            self._odlozene.append(sprava)
+
+    def kopia(self):
+        """Kopia rozkreslenej geometrie, dalsie body sa do kopie kreslia nezavisle"""
+        kopia = copy.copy(self)
+        kopia._ciary = {i: ciara.kopia() for i, ciara in self._ciary.items()}
+        kopia._konce = {bod: set(ciary) for bod, ciary in self._konce.items()}
+        kopia._koniec_ciary = dict(self._koniec_ciary)
+        kopia.spravy = []
+        return kopia
+
     def kresli(self, bx, by):
         if self.__buffer_obluku:
-            logging.warning(f"Nespravna definicia obluku v objekte {self._objekt.atributy_objektu['ID']}")
+            self._varuj(f"Nespravna definicia obluku v objekte {self._objekt.atributy_objektu['ID']}")
             self.__buffer_obluku = None
 
         if not self.__index_indexov in self._ciary:
@@ -718,33 +1191,46 @@ class WktGeneric(object):
 
         self._ciary[self.__index].pridaj(bx, by)
 
+    def __aktualizuj_koniec(self, index):
+        """Zapise do indexu koncovy bod ciary. Body sa pridavaju iba do aktualnej ciary, preto staci koniec
+        aktualizovat vzdy pred odskokom na inu ciaru"""
+        koniec = self._ciary[index][-1]
+        povodny_koniec = self._koniec_ciary.get(index)
+        if povodny_koniec != koniec:
+            if povodny_koniec is not None:
+                self._konce[povodny_koniec].discard(index)
+            self._konce.setdefault(koniec, set()).add(index)
+            self._koniec_ciary[index] = koniec
+
     def skoc(self, bx, by):
-        index = False
-        for i in self._ciary.keys():
-            index = self._ciary[i].porovnaj(bx, by)
-            if index:
-                break
+        if self.__index in self._ciary:
+            self.__aktualizuj_koniec(self.__index)
+        # ak konci v bode viac ciar, pokracuje sa na prvej z nich
+        ciary = self._konce.get((na_centimetre(bx), na_centimetre(by)))
+        index = min(ciary) if ciary else False
 
         if self.__buffer_obluku:
-            logging.warning(f"Nespravna definicia obluku v objekte {self._objekt.atributy_objektu['ID']}")
+            self._varuj(f"Nespravna definicia obluku v objekte {self._objekt.atributy_objektu['ID']}")
             self.__buffer_obluku = None
 
         if index:
             self.__index = index
         else:
             self.__index_indexov += 1
-            self.kresli(bx, by)
+            WktGeneric.kresli(self, bx, by)
 
-    def rotuj(self, bx, by):
+    def rotuj(self, bx, by, krok=None):
         if self.__buffer_obluku:
-            koncovy_bod = HBod(bx, by)
+            zaciatok_obluku = time.perf_counter()
+            koncovy_bod = (na_centimetre(bx), na_centimetre(by))
 
-            x1 = self._ciary[self.__index][-1].x
-            y1 = self._ciary[self.__index][-1].y
-            x2 = self.__buffer_obluku.x
-            y2 = self.__buffer_obluku.y
-            x3 = koncovy_bod.x
-            y3 = koncovy_bod.y
+            posledny_bod = self._ciary[self.__index][-1]
+            x1 = posledny_bod[0] / 100
+            y1 = posledny_bod[1] / 100
+            x2 = self.__buffer_obluku[0] / 100
+            y2 = self.__buffer_obluku[1] / 100
+            x3 = koncovy_bod[0] / 100
+            y3 = koncovy_bod[1] / 100
 
             try:
                 k = (x1 - x3) / (x1 - x2)
@@ -770,8 +1256,8 @@ class WktGeneric(object):
                         else:
                             ys = ((x2 - x1) / 2) + x1
                     else:
-                        logging.warning(f"Nespravna definicia obluku v objekte {self._objekt.atributy_objektu['ID']}")
-                        self._ciary[self.__index].pridaj(f"{x3:.2f}", f"{y3:.2f}")
+                        self._varuj(f"Nespravna definicia obluku v objekte {self._objekt.atributy_objektu['ID']}")
+                        self._ciary[self.__index].pridaj_cm(*koncovy_bod)
                         return False
 
             zaciatok = Bod([xs, ys], [x1, y1])
@@ -787,80 +1273,208 @@ class WktGeneric(object):
             opa = self.__oprav_uhol(pa - za)
             oka = self.__oprav_uhol(ka - za)
 
-            ret = ''
-            if opa < oka:  # ak je uhol prechodoveho bodu mensi ako uhol koncoveho tak v smere hodinovych ruciciek
-                oza = 0
-                while oza < oka:
-                    #	ret = ret + ',' + zaciatok.get()
-                    zaciatok.otoc()
-                    rx, ry = zaciatok.get()
-                    self._ciary[self.__index].pridaj(rx, ry)
-                    oza = oza + 5  # cislo je uhol o ktory sa otacam
-            else:
-                oza = 360
-                while oza > oka:
-                    #	ret = ret + ',' + zaciatok.get()
-                    zaciatok.otoc(False)
-                    rx, ry = zaciatok.get()
-                    self._ciary[self.__index].pridaj(rx, ry)
-                    oza = oza - 5
-
-            self._ciary[self.__index].pridaj(f"{x3:.2f}", f"{y3:.2f}")
+            # ak je uhol prechodoveho bodu mensi ako uhol koncoveho tak v smere hodinovych ruciciek
+            for bod in zhusti_obluk((xs, ys), (x1, y1), oka, opa < oka, krok or KOMPATIBILNY_KROK):
+                self._ciary[self.__index].pridaj_cm(*bod)
+
+            self._ciary[self.__index].pridaj_cm(*koncovy_bod)
             self.__buffer_obluku = None
+            self._objekt.cas_oblukov += time.perf_counter() - zaciatok_obluku
 
         else:
-            self.__buffer_obluku = HBod(bx, by)
+            self.__buffer_obluku = (na_centimetre(bx), na_centimetre(by))
 
-    def __str__(self):
-        if self._wkt is None:
-            self._wkt = self._preved_na_wkt()
-        return self._wkt
-
-    def __repr__(self):
-        return self.__str__()
-
-    def wkt(self):
-        return self.__str__()
+    def wkb(self) -> bytes:
+        if self._wkb is None:
+            self._wkb = self._preved_na_wkb()
+        return self._wkb
 
 
 class WktLinia(WktGeneric):
 
-    def _preved_na_wkt(self):
+    def _preved_na_wkb(self):
         ciary = self._ciary
-        str_ciary = []
+        wkb_ciary = []
         for i in ciary.keys():
             if ciary[i].pocet_bodov > 1:
-                str_ciary.append(str(ciary[i]))
+                wkb_ciary.append(ciary[i].wkb_linie())
             else:
                 logging.warning(f"Mazem ({ciary[i]}) v objekte {self._objekt.atributy_objektu['ID']}")
-        if str_ciary:
-            return f"MULTILINESTRING(({'),('.join(str_ciary)}))"
+        if wkb_ciary:
+            return struct.pack('<BII', 1, WKB_MULTILINIA, len(wkb_ciary)) + b''.join(wkb_ciary)
         else:
             logging.warning(f"Neplatna linia v objekte {self._objekt.atributy_objektu['ID']}")
-            return ""
+            return b""
+
+
+# vety skokov, vo variante s posunutymi skokmi sa z nich stanu ciary
+SKOKY = ("NL", "NR", "NC")
 
 
 class WktPolygon(WktGeneric):
+    """Z ciar objektu posklada uzatvorene kruhy, diery vnori do obvodov a vytvori platny multipolygon.
+    Sucasne s ciarami objektu kresli aj variant s posunutymi skokmi: v useku ciar od vety &L P po dalsiu vetu &
+    sa skok zmeni na ciaru a ciara za nim na skok, ina veta za skokom sa vynecha. Ak sa niektore kruhy musia
+    nasilu uzatvorit a variant ich ma menej, pouzije sa variant"""
+    # ciary s posunutymi skokmi, vytvoria sa kopiou pri prvej zmenenej vete, dovtedy su oba varianty rovnake
+    _posunuty = None
+    # 'skusane' ak sa variant s posunutymi skokmi porovnaval, 'pouzite' ak sa pouzil
+    otocenie = None
 
-    def _preved_na_wkt(self):
-        ciary = self._ciary
-        str_ciary = []
-        for i in ciary.keys():
-            if ciary[i].pocet_bodov > 3:
-                if not ciary[i].zatvorena:
-                    ciary[i].zatvor()
-                    self.pocet_uzatvoreni += 1
-                    logging.warning(f"Zatvaram polygon v objekte {self._objekt.atributy_objektu['ID']}")
-                str_ciary.append(str(ciary[i]))
+    def __init__(self, objekt):
+        super(WktPolygon, self).__init__(objekt)
+        self.__v_useku = False
+        self.__skocil = False
+        # zmena aktualnej vety vo variante s posunutymi skokmi: None, 'ciara', 'obluk', 'skok' alebo 'vynechaj'
+        self.__posun = None
+
+    def posun_vety(self, riadok):
+        """Urci, ako sa veta, ktora sa prave spracuje, zmeni vo variante s posunutymi skokmi"""
+        if riadok[:1] == '&':
+            self.__v_useku = riadok[:4] == '&L P' and 'S=' not in riadok
+            self.__skocil = False
+            self.__posun = None
+            return
+        if not self.__v_useku:
+            # mimo useku sa nic neposuva, __posun zostal None od vety &, ktora usek ukoncila
+            return
+        typ = riadok[:2]
+        posun = None
+        if typ in SKOKY:
+            # zo skoku hned za zmenenym skokom sa ciara nestane
+            if not self.__skocil:
+                posun = 'obluk' if typ == 'NR' else 'ciara'
+                self.__skocil = True
+        elif self.__skocil:
+            # skokom sa moze stat iba ciara alebo obluk
+            posun = 'skok' if typ[:1] in ('L', 'C', 'R') else 'vynechaj'
+            self.__skocil = False
+        self.__posun = posun
+
+    def kresli(self, bx, by):
+        if self.__posun is not None or self._posunuty is not None:
+            self.__kresli_posunuty(WktGeneric.kresli, bx, by)
+        super(WktPolygon, self).kresli(bx, by)
+
+    def skoc(self, bx, by):
+        if self.__posun is not None or self._posunuty is not None:
+            self.__kresli_posunuty(WktGeneric.skoc, bx, by)
+        super(WktPolygon, self).skoc(bx, by)
+
+    def rotuj(self, bx, by, krok=None):
+        if self.__posun is not None or self._posunuty is not None:
+            self.__kresli_posunuty(WktGeneric.rotuj, bx, by, krok)
+        super(WktPolygon, self).rotuj(bx, by, krok)
+
+    def __kresli_posunuty(self, funkcia, bx, by, *parametre):
+        if self._posunuty is None:
+            self._posunuty = self.kopia()
+            self._posunuty._odlozene = []
+        posunuty = self._posunuty
+        if self.__posun is None:
+            funkcia(posunuty, bx, by, *parametre)
+        elif self.__posun == 'skok':
+            WktGeneric.skoc(posunuty, bx, by)
+        elif self.__posun == 'obluk' and self._objekt.krok_obluku is not None:
+            WktGeneric.rotuj(posunuty, bx, by, self._objekt.krok_obluku)
+        elif self.__posun != 'vynechaj':
+            WktGeneric.kresli(posunuty, bx, by)
+
+    def __spoj_ciary(self):
+        """Otvorene ciary spoji podla koncovych bodov. Vrati zoznam uzatvorenych kruhov a zoznam ciar,
+        ktore sa uzatvorit nepodarilo"""
+        kruhy = []
+        otvorene = {}
+        for i, ciara in self._ciary.items():
+            if ciara.zatvorena:
+                kruhy.append(ciara.suradnice())
+            elif ciara.pocet_bodov > 1:
+                otvorene[i] = ciara.suradnice()
+        if len(otvorene) < 2:
+            return kruhy, list(otvorene.values())
+
+        konce = {}
+        for i, body in otvorene.items():
+            konce.setdefault((body[0], body[1]), []).append(i)
+            konce.setdefault((body[-2], body[-1]), []).append(i)
+
+        def najdi_pokracovanie(bod):
+            for j in konce.get(bod, ()):
+                if j in otvorene:
+                    return j
+
+        neuzatvorene = []
+        for i in list(otvorene):
+            if i not in otvorene:
+                continue
+            # body ciar sa nemenia, spajaju sa do novej kopie
+            body = array('q', otvorene.pop(i))
+            while (body[0], body[1]) != (body[-2], body[-1]):
+                # pokracuje sa na konci ciary, ak tam nic nie je, tak na jej zaciatku
+                j = najdi_pokracovanie((body[-2], body[-1]))
+                if j is None:
+                    j = najdi_pokracovanie((body[0], body[1]))
+                    if j is None:
+                        break
+                    body = otoc_body(body)
+                dalsia = otvorene.pop(j)
+                if (dalsia[0], dalsia[1]) != (body[-2], body[-1]):
+                    dalsia = otoc_body(dalsia)
+                body.extend(dalsia[2:])
+            if len(body) > 2 and (body[0], body[1]) == (body[-2], body[-1]):
+                kruhy.append(body)
+            else:
+                neuzatvorene.append(body)
+        return kruhy, neuzatvorene
+
+    def __kruhy(self):
+        kruhy, neuzatvorene = self.__spoj_ciary()
+        posunuty = self._posunuty
+        self._posunuty = None
+        if posunuty is not None and pocet_uzatvoreni(neuzatvorene):
+            logging.debug("Skusam otocit objekt")
+            self.otocenie = 'skusane'
+            kruhy_posunute, neuzatvorene_posunute = posunuty.__spoj_ciary()
+            if pocet_uzatvoreni(neuzatvorene_posunute) < pocet_uzatvoreni(neuzatvorene):
+                logging.debug("Vyberam otoceny objekt")
+                self.otocenie = 'pouzite'
+                kruhy, neuzatvorene = kruhy_posunute, neuzatvorene_posunute
+                for sprava in posunuty._odlozene:
+                    logging.warning(sprava)
+
+        for body in neuzatvorene:
+            if len(body) > 6:
+                body = array('q', body)
+                body.append(body[0])
+                body.append(body[1])
+                kruhy.append(body)
+                self.pocet_uzatvoreni += 1
+                logging.warning(f"Zatvaram polygon v objekte {self._objekt.atributy_objektu['ID']}")
             else:
-                if ciary[i].pocet_bodov > 1:
-                    logging.warning(f"Mazem ({ciary[i]}) v objekte {self._objekt.atributy_objektu['ID']}")
+                logging.warning(f"Mazem ({text_bodov(body)}) v objekte {self._objekt.atributy_objektu['ID']}")
 
-        if str_ciary:
-            return f"POLYGON(({'),('.join(str_ciary)}))"
-        else:
+        platne = []
+        for body in kruhy:
+            plocha = dvojnasobna_plocha(body)
+            if len(body) > 6 and plocha != 0:
+                platne.append((body, plocha))
+            else:
+                logging.warning(f"Mazem ({text_bodov(body)}) v objekte {self._objekt.atributy_objektu['ID']}")
+        return platne
+
+    def _preved_na_wkb(self):
+        kruhy = self.__kruhy()
+        if not kruhy:
             logging.warning(f"Neplatny polygon v objekte {self._objekt.atributy_objektu['ID']}")
-            return ""
+            return b""
+
+        # obvody su proti smeru hodinovych ruciciek (kladna plocha), diery v smere
+        polygony = []
+        for obvod, diery in vnor_kruhy(kruhy):
+            wkb_kruhov = [wkb_kruhu(kruhy[obvod][0], kruhy[obvod][1] < 0)]
+            wkb_kruhov.extend(wkb_kruhu(kruhy[diera][0], kruhy[diera][1] > 0) for diera in diery)
+            polygony.append(struct.pack('<BII', 1, WKB_POLYGON, len(wkb_kruhov)) + b''.join(wkb_kruhov))
+        return struct.pack('<BII', 1, WKB_MULTIPOLYGON, len(polygony)) + b''.join(polygony)
 
 
 class Bod:
@@ -898,6 +1512,11 @@ class Bod:
     def get(self):
         return f"{round(self.__x + self.__xs, 2):.2f}", f"{round(self.__y + self.__ys, 2):.2f}"
 
+    def get_cm(self):
+        """Suradnice bodu zaokruhlene na centimetre rovnako ako v get()"""
+        rx, ry = self.get()
+        return na_centimetre(rx), na_centimetre(ry)
+
     def otoc(self, smer_otocenia=True):  # smer_otocenia: True = v smere hodinovych ruciciek
         if smer_otocenia:
             uhol_otocenia = 5
@@ -910,4 +1529,138 @@ class Bod:
             novy_uhol = 360 + novy_uhol
         self.__zmen_argument(self.__nu2cu(novy_uhol))
 
+
+# ------------ Zhustovanie oblukov ---------------
+
+# povodny sposob: bod sa postupne otaca o 5 stupnov, posledny bod moze koncovy bod obluku aj presiahnut
+KOMPATIBILNY_KROK = ('kompatibilny', 5.0)
+
+
+def krok_obluku(hodnota: Optional[str]) -> Optional[tuple]:
+    """Prevedie nastavenie kroku obluku na dvojicu (sposob, hodnota). Prazdna hodnota znamena, ze sa obluky
+    nezhustuju, 'compat' je povodny krok 5 stupnov, '<n>' alebo '<n>deg' je pevny uhol v stupnoch a '<n>m'
+    je najvacsia odchylka tetivy od obluku v metroch"""
+    if not hodnota:
+        return None
+    hodnota = hodnota.strip().lower()
+    if hodnota == 'compat':
+        return KOMPATIBILNY_KROK
+    if hodnota.endswith('m'):
+        sposob, cislo = 'odchylka', hodnota[:-1]
+    else:
+        sposob, cislo = 'uhol', hodnota[:-3] if hodnota.endswith('deg') else hodnota
+    try:
+        cislo = float(cislo)
+    except ValueError:
+        raise ValueError(f"Neplatny krok obluku '{hodnota}'")
+    if not cislo > 0 or (sposob == 'uhol' and cislo > 180):
+        raise ValueError(f"Neplatny krok obluku '{hodnota}'")
+    return sposob, cislo
+
+
+def zhusti_obluk(stred: tuple, zaciatok: tuple, uhol_konca: float, v_smere_hodin: bool, krok: tuple) -> list:
+    """Vrati body obluku v cm od zaciatku ku koncu, bez zaciatocneho a koncoveho bodu. uhol_konca je uhol
+    koncoveho bodu od zaciatku v smere hodinovych ruciciek (0 - 360). Vsetky body sa pocitaju naraz zo
+    stredu, polomeru a uhla zaciatku, v kompatibilnom rezime sa zachova povodne postupne otacanie"""
+    sposob, hodnota = krok
+    if sposob == 'kompatibilny':
+        bod = Bod(stred, zaciatok)
+        body = []
+        if v_smere_hodin:
+            oza = 0
+            while oza < uhol_konca:
+                bod.otoc()
+                body.append(bod.get_cm())
+                oza = oza + 5
+        else:
+            oza = 360
+            while oza > uhol_konca:
+                bod.otoc(False)
+                body.append(bod.get_cm())
+                oza = oza - 5
+        return body
+
+    xs, ys = stred
+    dx, dy = zaciatok[0] - xs, zaciatok[1] - ys
+    polomer = math.hypot(dx, dy)
+    rozpatie = uhol_konca if v_smere_hodin else 360 - uhol_konca
+    if sposob == 'odchylka':
+        # odchylka tetivy od obluku je r * (1 - cos(uhol / 2))
+        krok_uhla = 180 if hodnota >= polomer else 2 * math.degrees(math.acos(1 - hodnota / polomer))
+    else:
+        krok_uhla = hodnota
+    pocet = max(1, math.ceil(rozpatie / krok_uhla - 1e-9))
+    # v smere hodinovych ruciciek sa matematicky uhol zmensuje
+    uhol = math.radians(rozpatie / pocet) * (-1 if v_smere_hodin else 1)
+    uhol_zaciatku = math.atan2(dy, dx)
+    uhly = [uhol_zaciatku + i * uhol for i in range(1, pocet)]
+    return [(round((xs + polomer * math.cos(u)) * 100), round((ys + polomer * math.sin(u)) * 100)) for u in uhly]
+
+
+# ------------ Parser viet ---------------
+
+# suradnice v tvare '<y> <x><info>', kde y a x su cisla s najviac dvomi desatinnymi miestami
+SURADNICE = r"(?P<y>\d+(?:\.\d\d?)?) (?P<x>\d+(?:\.\d\d?)?)(?P<info>.*)"
+
+REG_BOD = re.compile(r"(?:&L +)?P " + SURADNICE)
+REG_CIARA = re.compile(r"[LCR] " + SURADNICE)
+REG_SKOK = re.compile(r"N[LCR] " + SURADNICE)
+REG_ATRIBUT = re.compile(r"""&A (?P<nazov>.{1,6})=(?P<hodnota>.{1,40})""")
+REG_TEXT = re.compile(r"""&T (?P<y>\d+(?:\.\d\d?)?) (?P<x>\d+(?:\.\d\d?)?) ['"](?P<text>.+)['"](?P<info>.*)""")
+REG_OBJEKT = re.compile(r"&O (?P<nazov>.{1,8}) (?P<id>\d+)")
+
+
+@functools.lru_cache(maxsize=4096)
+def _parametre_info(text):
+    parametre = []
+    for param in text.split():
+        if '=' in param:
+            parametre.append(tuple(param.split('=', 1)))
+    return tuple(parametre)
+
+
+def _parser(reg, funkcia):
+    match = reg.match
+
+    # funkcie ?_riadok citaju hodnoty skupin cez data['meno'], co objekt Match podporuje priamo bez vytvarania slovnika
+    def parsuj(riadok):
+        m = match(riadok)
+        if m:
+            return funkcia, m
+    return parsuj
+
+
+_veta_bod = _parser(REG_BOD, 'p_riadok')
+_veta_ciara = _parser(REG_CIARA, 'lc_riadok')
+_veta_obluk = _parser(REG_CIARA, 'r_riadok')
+_veta_skok = _parser(REG_SKOK, 'n_riadok')
+_veta_atribut = _parser(REG_ATRIBUT, 'a_riadok')
+_veta_text = _parser(REG_TEXT, 't_riadok')
+_veta_objekt = _parser(REG_OBJEKT, 'o_riadok')
+
+_VETY_AMP = {
+    'L': _veta_bod,
+    'A': _veta_atribut,
+    'T': _veta_text,
+    'O': _veta_objekt,
+}
+
+
+def _veta_amp(riadok):
+    parser = _VETY_AMP.get(riadok[1:2])
+    if parser is not None:
+        return parser(riadok)
+
+
+# parser vety podla prveho znaku riadku, vracia dvojicu (funkcia ktora ma vetu spracovat, data vety)
+PARSERY_VIET = {
+    'P': _veta_bod,
+    'L': _veta_ciara,
+    'C': _veta_ciara,
+    # bez nastaveneho kroku obluku sa obluky spracuvavaju ako ciary (r_riadok)
+    'R': _veta_obluk,
+    'N': _veta_skok,
+    '&': _veta_amp,
+}
+
 # vim: set ts=4 sts=4 sw=4 noet:
@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import os
+import json
+import logging
+from pathlib import Path
+from typing import List, Optional
+
+from katastertools.VgiShp.io import Citac, FilterObjektov, meno_vrstvy
+from katastertools.VgiShp.data import REG_TEXT
+
+# vety, ktore nesu suradnice bodu
+VETY_BODOV = (b'P ', b'L ', b'C ', b'R ', b'NL', b'NC', b'NR', b'&L')
+
+
+def suradnice_vety(veta: bytes):
+    """Vrati suradnice Y, X vety s bodom, ak sa daju precitat"""
+    casti = veta.split()
+    i = 2 if casti[0] == b'&L' else 1
+    try:
+        return float(casti[i]), float(casti[i + 1])
+    except (IndexError, ValueError):
+        return None
+
+
+class ObjektIndexu:
+    """Poloha a zakladne informacie o jednom objekte (&O) vo VGI subore"""
+    __slots__ = ('zaciatok', 'dlzka', 'meno_vrstvy', 'id', 'pocet_bodov', 'bbox')
+
+    def __init__(self, zaciatok, dlzka, meno_vrstvy, id, pocet_bodov, bbox=None):
+        self.zaciatok = zaciatok
+        self.dlzka = dlzka
+        self.meno_vrstvy = meno_vrstvy
+        self.id = id
+        self.pocet_bodov = pocet_bodov
+        # obdlznik objektu (minx, miny, maxx, maxy) v suradniciach vystupu
+        self.bbox = bbox
+
+    def zaznam(self):
+        return [self.zaciatok, self.dlzka, self.meno_vrstvy, self.id, self.pocet_bodov, self.bbox]
+
+    def pridaj_suradnice(self, y: float, x: float):
+        # vo vystupe su suradnice otocene a zaporne, POINT(-y -x)
+        bx, by = -y, -x
+        if self.bbox is None:
+            self.bbox = [bx, by, bx, by]
+        else:
+            bbox = self.bbox
+            if bx < bbox[0]:
+                bbox[0] = bx
+            elif bx > bbox[2]:
+                bbox[2] = bx
+            if by < bbox[1]:
+                bbox[1] = by
+            elif by > bbox[3]:
+                bbox[3] = by
+
+
+class IndexObjektov:
+    """Index objektov VGI suboru. Uklada sa vedla suboru (<subor>.idx) a pri zmene velkosti alebo casu zmeny
+    VGI suboru sa automaticky vytvori nanovo"""
+    verzia = 3
+    pripona = '.idx'
+
+    def __init__(self, velkost: int, cas_zmeny: int, objekty: List[ObjektIndexu], ukonceny: bool):
+        self.velkost = velkost
+        self.cas_zmeny = cas_zmeny
+        self._objekty = objekty
+        # priznak ci subor obsahuje koncovu vetu &K
+        self.ukonceny = ukonceny
+
+    def __len__(self):
+        return len(self._objekty)
+
+    def objekty(self, filter: Optional[FilterObjektov] = None):
+        """Vrati objekty indexu, pripadne iba objekty vyhovujuce filtru, v poradi v akom su v subore"""
+        if filter is None:
+            return list(self._objekty)
+        return [o for o in self._objekty
+                if filter.prijima_vrstvu(o.meno_vrstvy) and filter.prijima_obdlznik(o.bbox)]
+
+    def rozdel(self, objekty: List[ObjektIndexu], pocet: int) -> List['IndexObjektov']:
+        """Rozdeli objekty na najviac dany pocet casti s priblizne rovnakou velkostou v bajtoch. Kazda cast je
+        samostatny index, ktory sa da spracovat nezavisle"""
+        celkom = sum(o.dlzka for o in objekty)
+        velkost_casti = max(celkom // max(pocet, 1), 1)
+        casti = []
+        cast = []
+        velkost = 0
+        for objekt in objekty:
+            cast.append(objekt)
+            velkost += objekt.dlzka
+            if velkost >= velkost_casti:
+                casti.append(IndexObjektov(self.velkost, self.cas_zmeny, cast, True))
+                cast = []
+                velkost = 0
+        if cast:
+            casti.append(IndexObjektov(self.velkost, self.cas_zmeny, cast, True))
+        return casti
+
+    @classmethod
+    def cesta_indexu(cls, file_path: Path) -> Path:
+        return file_path.with_name(file_path.name + cls.pripona)
+
+    @classmethod
+    def pre_subor(cls, file_path: Path, citac: Optional[Citac] = None) -> 'IndexObjektov':
+        """Nacita platny index suboru, alebo ho vytvori a ulozi"""
+        st = os.stat(str(file_path))
+        cesta = cls.cesta_indexu(file_path)
+        index = cls.nacitaj(cesta, st.st_size, st.st_mtime_ns)
+        if index is None:
+            logging.debug(f"Vytvaram index suboru {str(file_path)}")
+            index = cls.vytvor(citac or Citac(file_path), st.st_size, st.st_mtime_ns)
+            index.uloz(cesta)
+        return index
+
+    @classmethod
+    def nacitaj(cls, cesta: Path, velkost: int, cas_zmeny: int) -> Optional['IndexObjektov']:
+        try:
+            with open(str(cesta), 'r') as f:
+                obsah = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if obsah.get('verzia') != cls.verzia or obsah.get('velkost') != velkost or \
+                obsah.get('cas_zmeny') != cas_zmeny:
+            return None
+        objekty = [ObjektIndexu(*zaznam) for zaznam in obsah['objekty']]
+        return cls(velkost, cas_zmeny, objekty, obsah['ukonceny'])
+
+    @classmethod
+    def vytvor(cls, citac: Citac, velkost: int, cas_zmeny: int) -> 'IndexObjektov':
+        """Prejde cely subor po vetach a zaznamena polohu kazdeho objektu"""
+        objekty = []
+        aktualny = None
+        ukonceny = False
+        pozicia = 0
+        while True:
+            zaciatok = pozicia
+            veta, pozicia = citac.veta_na(zaciatok)
+            if veta is None or veta[:2] == b'&K':
+                ukonceny = veta is not None
+                break
+
+            if veta[:2] == b'&O':
+                if aktualny is not None:
+                    aktualny.dlzka = zaciatok - aktualny.zaciatok
+                casti = veta.split(b' ')
+                vrstva = meno_vrstvy(veta) if len(casti) > 1 else ''
+                objekt_id = casti[2].decode('cp1250') if len(casti) > 2 else ''
+                aktualny = ObjektIndexu(zaciatok, 0, vrstva, objekt_id, 0)
+                objekty.append(aktualny)
+            elif aktualny is not None and veta[:2] in VETY_BODOV:
+                aktualny.pocet_bodov += 1
+                suradnice = suradnice_vety(veta)
+                if suradnice:
+                    aktualny.pridaj_suradnice(*suradnice)
+            elif aktualny is not None and veta[:2] == b'&T':
+                # iba texty, ktore prijme parser viet, inak by obdlznik siahal k textu, ktory sa do vystupu nedostane
+                text = REG_TEXT.match(veta.decode('cp1250'))
+                if text:
+                    aktualny.pridaj_suradnice(float(text['y']), float(text['x']))
+
+        if aktualny is not None:
+            aktualny.dlzka = zaciatok - aktualny.zaciatok
+        return cls(velkost, cas_zmeny, objekty, ukonceny)
+
+    def uloz(self, cesta: Path):
+        obsah = {
+            'verzia': self.verzia,
+            'velkost': self.velkost,
+            'cas_zmeny': self.cas_zmeny,
+            'ukonceny': self.ukonceny,
+            'objekty': [o.zaznam() for o in self._objekty],
+        }
+        try:
+            with open(str(cesta), 'w') as f:
+                json.dump(obsah, f, separators=(',', ':'))
+        except OSError as e:
+            # index je len pomocny, pri nemoznosti zapisu sa pracuje s indexom v pamati
+            logging.debug(f"Index {str(cesta)} sa nepodarilo ulozit: {e}")
+
+# vim: set ts=4 sts=4 sw=4 noet:
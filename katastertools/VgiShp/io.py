@@ -1,69 +1,141 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 import os
-import sys
+import logging
+import mmap
 import stat
+import time
+from collections import deque
 from pathlib import Path
+from typing import Optional
+
+
+# biele znaky, ktore po dekodovani z cp1250 odstrani str.strip()
+BIELE_ZNAKY = b' \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f\xa0'
 
 
 class Citac:
-    """Trieda starajuca sa o citanie vstupneho suboru. Citanie prebieha po riadkoch. Dokaze sa
-    posuvat aj dozadu"""
+    """Trieda starajuca sa o citanie vstupneho suboru. Subor sa namapuje do pamate a vety sa oddeluju priamo
+    nad bajtmi v jednom prechode, bez posuvania v subore. Dokaze sa vratit o niekolko viet spat"""
+
+    # kolko zaciatkov viet si citac pamata pre potreby funkcie spat
+    pamat_viet = 16
 
     def __init__(self, file_path: Path):
+        self._file = None
+        self._data = None
         try:
             mode = os.stat(str(file_path))[stat.ST_MODE]
             if stat.S_ISREG(mode):
-                self._file = open(str(file_path), "r", encoding='cp1250')
-
                 if ' ' in str(file_path):
                     raise MedzeraVNazveSuboru(str(file_path))
-                if self._file.read(2) != "&V":
+
+                self._file = open(str(file_path), "rb")
+                if self._file.read(2) != b"&V":
+                    self.zavriet()
                     raise ZlyTypSuboru(str(file_path))
+                self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
             else:
                 raise NieJeSubor(str(file_path))
         except OSError as e:
             raise NieJeSubor(e)
 
-        self._file.seek(0)
-        self._precitane_bajty = 0
-        self._dlzka_riadkov = []
-        self._precitany_riadok = self._file.readline()
+        self._velkost = len(self._data)
+        self._pozicia = 0
+        self._zaciatky_viet = deque(maxlen=self.pamat_viet)
+        self._zaciatok_citania = time.perf_counter()
 
     def __del__(self):
         self.zavriet()
 
     def __getitem__(self, index):
-        riadok = self._precitany_riadok
-        self._dlzka_riadkov.append(len(riadok))
-        self._precitane_bajty += len(riadok)
+        veta = self.dalsia_veta()
+        return veta.decode('cp1250')
 
-        if riadok == "":
+    def dalsia_veta(self) -> bytes:
+        """Vrati dalsiu vetu suboru ako bajty, bez dekodovania"""
+        if self._data is None:
+            raise ChybaKoncovaVeta
+
+        zaciatok = self._pozicia
+        veta, self._pozicia = self.veta_na(zaciatok)
+        if veta is None:
             self.zavriet()
             raise ChybaKoncovaVeta
-        elif riadok[:2] == '&K':
+        self._zaciatky_viet.append(zaciatok)
+
+        if veta[:2] == b'&K':
             self.zavriet()
             raise IndexError
+        return veta
+
+    def veta_na(self, zaciatok: int):
+        """Vrati vetu zacinajucu na danej pozicii a poziciu nasledujucej vety. Aktualnu poziciu citaca nemeni.
+        Na konci suboru vrati namiesto vety None"""
+        data = self._data
+        if zaciatok >= self._velkost:
+            return None, zaciatok
+
+        koniec = data.find(b'\n', zaciatok)
+        koniec = self._velkost if koniec < 0 else koniec + 1
+        veta = data[zaciatok:koniec]
+
+        # ak veta pokracuje na dalsom riadku vo vstupnom subore, spoj ju do jedneho riadku
+        while koniec < self._velkost and data[koniec] == 9:
+            dalsi = data.find(b'\n', koniec)
+            dalsi = self._velkost if dalsi < 0 else dalsi + 1
+            veta = veta.rstrip(BIELE_ZNAKY) + b' ' + data[koniec:dalsi].lstrip(BIELE_ZNAKY)
+            koniec = dalsi
+
+        return veta.strip(BIELE_ZNAKY), koniec
+
+    def vety_useku(self, zaciatok: int, dlzka: int):
+        """Vrati vety v useku suboru, napr. jeden objekt podla indexu"""
+        vety = []
+        pozicia = zaciatok
+        koniec = zaciatok + dlzka
+        while pozicia < koniec:
+            veta, pozicia = self.veta_na(pozicia)
+            if veta is None:
+                break
+            vety.append(veta)
+        self._pozicia = max(self._pozicia, pozicia)
+        return vety
+
+    def preskoc_objekt(self):
+        """Posunie citac na zaciatok dalsieho objektu (&O) alebo koncovej vety (&K). Vety preskakovaneho objektu
+        sa nedelia ani nedekoduju"""
+        data = self._data
+        # hlada sa od konca predchadzajuceho riadku, aby sa nasla aj veta zacinajuca priamo na aktualnej pozicii
+        od = max(self._pozicia - 1, 0)
+        dalsi_objekt = data.find(b'\n&O', od)
+        koniec = data.find(b'\n&K', od, dalsi_objekt + 3 if dalsi_objekt >= 0 else self._velkost)
+        if koniec >= 0:
+            self._pozicia = koniec + 1
+        elif dalsi_objekt >= 0:
+            self._pozicia = dalsi_objekt + 1
         else:
-            self._precitany_riadok = self._file.readline()
-            # ak veta pokracuje na dalsom riadku vo vstupnom subore, spoj ju do jedneho riadku
-            if self._precitany_riadok.startswith("\t"):
-                self._precitane_bajty += len(self._precitany_riadok)
-                self._dlzka_riadkov[-1] += len(self._precitany_riadok)
-                riadok = riadok.rstrip() + ' ' + self._precitany_riadok.lstrip()
-                self._precitany_riadok = self._file.readline()
-            return riadok.strip()
-
-    def spat(self, index: int):  # posunie sa spat o dany pocet riadkov
-        z = 0
-        for x in self._dlzka_riadkov[-index:]:
-            z += x
-        self._precitane_bajty -= z
-        self._file.seek(self._precitane_bajty)
-        self._precitany_riadok = self._file.readline()
-        self._precitany_riadok = self._file.readline()
+            self._pozicia = self._velkost
+
+    def spat(self, index: int):  # posunie sa spat o dany pocet viet
+        if index > len(self._zaciatky_viet):
+            raise ValueError(f"Citac si pamata iba {len(self._zaciatky_viet)} viet")
+        for _ in range(index - 1):
+            self._zaciatky_viet.pop()
+        self._pozicia = self._zaciatky_viet.pop()
+
+    def precitane_bajty(self) -> int:
+        return min(self._pozicia, self._velkost)
+
+    def rychlost(self) -> float:
+        """Rychlost citania v MB/s od otvorenia suboru"""
+        cas = time.perf_counter() - self._zaciatok_citania
+        return self.precitane_bajty() / 1048576 / cas if cas > 0 else 0.0
 
     def zavriet(self):
+        if self._data is not None:
+            self._data.close()
+            self._data = None
         if self._file:
             self._file.close()
             self._file = None
@@ -76,93 +148,118 @@ class CitacObjektov:
     """Trieda pomocou Citaca cita subor. Citanie prebieha po objektoch. V pripade potreby dokaze otocit poradie
     riadkov v objekte"""
 
-    def __init__(self, citac: Citac):
+    def __init__(self, citac: Citac, index=None, filter: Optional['FilterObjektov'] = None):
         self.__citac: Citac = citac
         self.__koniec_suboru = False
+        # prva veta nasledujuceho objektu, ktora sa uz precitala pri hladani konca aktualneho objektu
+        self.__dalsia_veta = None
+        self.__filter = filter
+
+        # ak je k dispozicii index suboru, citaju sa priamo iba objekty, ktore prejdu filtrom
+        self.__objekty_indexu = None
+        if index is not None:
+            self.__objekty_indexu = iter(index.objekty(filter))
+            self.__index = index
 
     def __nacitaj_dalsi_objekt(self):
         self.__objekt = []
         self.__meno_vrstvy = ""
         prvy = False
+        veta = self.__dalsia_veta
+        self.__dalsia_veta = None
         try:
-            for riadok in self.__citac:
-                if riadok[:2] == "&O" and not prvy:
-                    prvy = True
-                    self.__meno_vrstvy = riadok.split(' ')[1].upper()
-                    self.__objekt.append(riadok)
-                elif riadok[:2] == "&O" and prvy:
-                    self.__citac.spat(1)
+            while True:
+                if veta is None:
+                    veta = self.__citac.dalsia_veta()
+                if veta[:2] == b"&O" and not prvy and self.__filter is not None and \
+                        not self.__filter.prijima_vrstvu(meno_vrstvy(veta)):
+                    # objekt nevyhovuje filtru, jeho vety sa preskocia bez citania
+                    self.__citac.preskoc_objekt()
+                    veta = None
+                    continue
+                if not self.__pridaj_vetu(veta, prvy):
+                    self.__dalsia_veta = veta
                     return
-                elif riadok[:2] == "&*":
-                    pass
-                else:
-                    self.__objekt.append(riadok)
+                prvy = prvy or veta[:2] == b"&O"
+                veta = None
+        except IndexError:
+            return
         except ChybaKoncovaVeta:
-            sys.stderr.write("[ERROR]: Chyba koncova veta\n")
+            logging.error("Chyba koncova veta")
             return
 
+    def __nacitaj_objekt_z_indexu(self, objekt_indexu):
+        self.__objekt = []
+        self.__meno_vrstvy = ""
+        prvy = False
+        for veta in self.__citac.vety_useku(objekt_indexu.zaciatok, objekt_indexu.dlzka):
+            self.__pridaj_vetu(veta, prvy)
+            prvy = prvy or veta[:2] == b"&O"
+
+    def __pridaj_vetu(self, veta: bytes, prvy: bool) -> bool:
+        """Prida vetu do objektu. Ak veta patri uz dalsiemu objektu, vrati False"""
+        if veta[:2] == b"&O" and not prvy:
+            self.__meno_vrstvy = meno_vrstvy(veta)
+            self.__objekt.append(veta.decode('cp1250'))
+        elif veta[:2] == b"&O" and prvy:
+            return False
+        elif veta[:2] == b"&*":
+            pass
+        else:
+            self.__objekt.append(veta.decode('cp1250'))
+        return True
+
     def __getitem__(self, index):
-        if not self.__citac.je_koniec_suboru():
+        if self.__objekty_indexu is not None:
+            objekt_indexu = next(self.__objekty_indexu, None)
+            if objekt_indexu is None:
+                if not self.__index.ukonceny and not self.__koniec_suboru:
+                    logging.error("Chyba koncova veta")
+                self.__koniec_suboru = True
+                raise IndexError
+            self.__nacitaj_objekt_z_indexu(objekt_indexu)
+        elif self.__dalsia_veta is not None or not self.__citac.je_koniec_suboru():
             self.__nacitaj_dalsi_objekt()
-            return {
-                "meno_vrstvy": self.__meno_vrstvy,
-                "riadky": self.__objekt,
-            }
         else:
             raise IndexError
+        return {
+            "meno_vrstvy": self.__meno_vrstvy,
+            "riadky": self.__objekt,
+        }
 
-    def posun_skoky(self):
-        hranice = []
-        zaciatok = False
-        skok = False
-        i = 0
-        for riadok in self.__objekt:
-            if riadok[:4] == "&L P" and "S=" not in riadok:
-                if zaciatok:
-                    if skok:
-                        hranice.append((zaciatok, i))
-                    zaciatok = i
-                    skok = False
-                else:
-                    zaciatok = i
-            elif riadok[:1] == "&" and zaciatok:
-                if skok:
-                    hranice.append((zaciatok, i))
-                zaciatok = False
-                skok = False
-            elif riadok[:2] in ("NL", "NR", "NC"):
-                skok = True
-            i += 1
-
-        if zaciatok and skok:
-            hranice.append((zaciatok, i))
-
-        if hranice:
-            ret = self.__objekt[:hranice[0][0]]
-            for hranica in hranice:
-                o = self.__objekt[hranica[0]:hranica[1]]
-                upravene_o = []
-                skocil = False
-                for riadok_o in o:
-                    if riadok_o[:2] in ("NL", "NR", "NC"):
-                        if skocil:
-                            upravene_o.append(riadok_o)
-                        else:
-                            skocil = True
-                            upravene_o.append(riadok_o[1:])
-                    else:
-                        if skocil:
-                            upravene_o.append(f"N{riadok_o}")
-                            skocil = False
-                        else:
-                            upravene_o.append(riadok_o)
-
-                ret += upravene_o
-            if hranice[-1][1] < len(self.__objekt):
-                ret += self.__objekt[hranice[-1][1]:]
-            return ret
-        else:
-            return self.__objekt
+
+def meno_vrstvy(veta: bytes) -> str:
+    """Vrati meno vrstvy z vety objektu (&O)"""
+    return veta.split(b' ')[1].decode('cp1250').upper()
+
+
+class FilterObjektov:
+    """Filter objektov podla vrstvy, katastralneho uzemia a obdlznika (minx, miny, maxx, maxy) v suradniciach
+    vystupu (EPSG:5514). Hodnota None znamena, ze sa podla danej vlastnosti nefiltruje"""
+
+    def __init__(self, vrstvy=None, ku=None, bbox=None):
+        self.vrstvy = set(vrstvy) if vrstvy is not None else None
+        self.ku = {int(k) for k in ku} if ku is not None else None
+        self.bbox = tuple(bbox) if bbox is not None else None
+
+    def prijima_ku(self, ku) -> bool:
+        if self.ku is None:
+            return True
+        try:
+            return int(ku) in self.ku
+        except ValueError:
+            return False
+
+    def prijima_vrstvu(self, meno_vrstvy: str) -> bool:
+        return self.vrstvy is None or meno_vrstvy in self.vrstvy
+
+    def prijima_obdlznik(self, bbox) -> bool:
+        if self.bbox is None:
+            return True
+        if bbox is None:
+            return False
+        return bbox[0] <= self.bbox[2] and bbox[2] >= self.bbox[0] and \
+            bbox[1] <= self.bbox[3] and bbox[3] >= self.bbox[1]
 
 
 class NieJeSubor(Exception):
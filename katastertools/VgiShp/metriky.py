@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Metriky spracovania VGI suborov: casy jednotlivych etap, zapis a zatvorenie kazdeho vystupu a pocty objektov,
+geometrii a bodov po vrstvach"""
+import time
+
+from katastertools.VgiShp.data import pocet_bodov_wkb
+
+# etapy spracovania objektov v poradi, v akom prebiehaju
+ETAPY = ('citanie', 'parsovanie', 'zhustovanie_oblukov', 'geometria')
+
+
+class Metriky:
+    """Casy v sekundach sa scitavaju, pri paralelnom spracovani je sucet casov etap vacsi ako trvanie"""
+
+    def __init__(self):
+        self.etapy = dict.fromkeys(ETAPY, 0.0)
+        # format vystupu -> cas zapisu objektov, resp. zatvorenia vystupu (vyprazdnenie buffrov, indexy, commit)
+        self.zapis = {}
+        self.zatvorenie = {}
+        # nazov vrstvy -> [objekty, geometrie, body, cas]
+        self.vrstvy = {}
+        self.subory = 0
+        self.objekty = 0
+        self.precitane_bajty = 0
+        self.trvanie = 0.0
+
+    def vrstva(self, nazov: str) -> list:
+        vrstva = self.vrstvy.get(nazov)
+        if vrstva is None:
+            vrstva = self.vrstvy[nazov] = [0, 0, 0, 0.0]
+        return vrstva
+
+    def citaj(self, objekty):
+        """Prechadza objekty a cas cakania na dalsi objekt pripocita k etape citanie"""
+        objekty = iter(objekty)
+        while True:
+            zaciatok = time.perf_counter()
+            try:
+                objekt = next(objekty)
+            except StopIteration:
+                self.etapy['citanie'] += time.perf_counter() - zaciatok
+                return
+            self.etapy['citanie'] += time.perf_counter() - zaciatok
+            yield objekt
+
+    def pridaj_objekt(self, objekt, objekt_data: dict, parsovanie: float, geometria: float):
+        """Zaznamena spracovany objekt, cas parsovania viet (vratane zhustovania oblukov) a vytvorenia geometrie"""
+        self.etapy['parsovanie'] += parsovanie - objekt.cas_oblukov
+        self.etapy['zhustovanie_oblukov'] += objekt.cas_oblukov
+        self.etapy['geometria'] += geometria
+        vrstva = self.vrstva(objekt_data['meta']['nazov_vrstvy'])
+        vrstva[0] += 1
+        vrstva[1] += len(objekt_data['geometricke_objekty'])
+        vrstva[2] += sum(pocet_bodov_wkb(g['wkb']) for g in objekt_data['geometricke_objekty'])
+        vrstva[3] += parsovanie + geometria
+
+    def pridaj_zapis(self, format: str, nazov_vrstvy: str, cas: float):
+        self.zapis[format] = self.zapis.get(format, 0.0) + cas
+        self.vrstva(nazov_vrstvy)[3] += cas
+
+    def pridaj_zatvorenie(self, format: str, cas: float):
+        self.zatvorenie[format] = self.zatvorenie.get(format, 0.0) + cas
+
+    def zluc(self, ine: 'Metriky'):
+        """Pripocita metriky ineho spracovania (casti suboru alebo ineho suboru)"""
+        for etapa, cas in ine.etapy.items():
+            self.etapy[etapa] = self.etapy.get(etapa, 0.0) + cas
+        for format, cas in ine.zapis.items():
+            self.zapis[format] = self.zapis.get(format, 0.0) + cas
+        for format, cas in ine.zatvorenie.items():
+            self.zatvorenie[format] = self.zatvorenie.get(format, 0.0) + cas
+        for nazov, hodnoty in ine.vrstvy.items():
+            vrstva = self.vrstva(nazov)
+            for i, hodnota in enumerate(hodnoty):
+                vrstva[i] += hodnota
+        self.subory += ine.subory
+        self.objekty += ine.objekty
+        self.precitane_bajty += ine.precitane_bajty
+
+    def text(self) -> str:
+        casy = [f'{etapa} {cas:.2f} s' for etapa, cas in self.etapy.items()]
+        casy += [f'zapis {format} {cas:.2f} s' for format, cas in self.zapis.items()]
+        casy += [f'zatvorenie {format} {cas:.2f} s' for format, cas in self.zatvorenie.items()]
+        return ', '.join(casy)
+
+    def sprava(self) -> dict:
+        """Metriky ako slovnik pre JSON spravu"""
+        def za_sekundu(pocet, cas):
+            return round(pocet / cas, 1) if cas else None
+
+        return {
+            'subory': self.subory,
+            'trvanie': round(self.trvanie, 4),
+            'precitane_bajty': self.precitane_bajty,
+            'mb_za_s': za_sekundu(self.precitane_bajty / 1048576, self.etapy['citanie']),
+            'objekty': self.objekty,
+            'etapy': {etapa: round(cas, 4) for etapa, cas in self.etapy.items()},
+            'zapis': {format: round(cas, 4) for format, cas in self.zapis.items()},
+            'zatvorenie': {format: round(cas, 4) for format, cas in self.zatvorenie.items()},
+            'vrstvy': {
+                nazov: {
+                    'objekty': objekty,
+                    'geometrie': geometrie,
+                    'body': body,
+                    'cas': round(cas, 4),
+                    'objekty_za_s': za_sekundu(objekty, cas),
+                    'body_za_s': za_sekundu(body, cas),
+                } for nazov, (objekty, geometrie, body, cas) in sorted(self.vrstvy.items())
+            },
+        }
+
+# vim: set ts=4 sts=4 sw=4 noet:
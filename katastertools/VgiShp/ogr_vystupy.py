@@ -0,0 +1,295 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Vystupy cez OGR (ESRI Shapefile, DGN, GeoPackage, FlatGeobuf a PGDump). Modul importuje GDAL, preto ho Zapisovac
+nacita az pri prvom vystupe, ktory ho potrebuje"""
+import os
+import contextlib
+
+from osgeo import gdal, ogr
+
+
+@contextlib.contextmanager
+def konfiguracia_gdal(nastavenia):
+    """Nastavi konfiguracne volby GDAL iba pre aktualne vlakno a po skonceni vrati povodne hodnoty. Na rozdiel od
+    premennych prostredia neovplyvni ine vystupy ani ine konverzie v tom istom procese"""
+    if not nastavenia:
+        yield
+        return
+    povodne = {kluc: gdal.GetThreadLocalConfigOption(kluc, None) for kluc in nastavenia}
+    for kluc, hodnota in nastavenia.items():
+        gdal.SetThreadLocalConfigOption(kluc, hodnota)
+    try:
+        yield
+    finally:
+        for kluc, hodnota in povodne.items():
+            gdal.SetThreadLocalConfigOption(kluc, hodnota)
+
+
+class Vystup_vrstvy(object):
+    """Zakladna trieda ktora sa stara o vytvorenie a zapis objektov jednej vrstvy do vystupneho suboru. Objekty sa
+    zapisuju cez jeden znovu pouzivany feature v transakciach po velkost_davky objektoch. Konfiguracne volby GDAL
+    (konfiguracia) plati pri kazdom volani driveru tejto vrstvy"""
+    datovy_zdroj = None
+    konfiguracia = None
+    # pocet objektov zapisanych v jednej transakcii vrstvy, 0 znamena zapis bez transakcii
+    velkost_davky = 10000
+    feature = None
+    v_davke = 0
+
+    def __init__(self, nazov_suboru, driver, geom_type, nazov_vrstvy, nastavenia_vrstvy=None, kodovanie='utf-8',
+                 velkost_davky=None, konfiguracia=None):
+        self.driver = driver
+        self.kodovanie = kodovanie
+        self.konfiguracia = konfiguracia
+        driver = ogr.GetDriverByName(driver)
+        with konfiguracia_gdal(self.konfiguracia):
+            self.datovy_zdroj = driver.CreateDataSource(nazov_suboru, options=nastavenia_vrstvy)
+            self.vrstva = self.datovy_zdroj.CreateLayer(nazov_vrstvy, geom_type=geom_type, options=nastavenia_vrstvy)
+        self.polia = None
+        if velkost_davky is not None:
+            self.velkost_davky = velkost_davky
+
+    def __del__(self):
+        self.zatvor()
+
+    def zatvor(self):
+        if self.datovy_zdroj:
+            with konfiguracia_gdal(self.konfiguracia):
+                self.ukonci_davku()
+                self.feature = None
+                self.datovy_zdroj.Destroy()
+            self.datovy_zdroj = None
+
+    def zahod(self):
+        """Zatvori vrstvu bez potvrdenia rozpracovanej davky, subory vrstvy maze Zapisovac"""
+        if self.datovy_zdroj:
+            with konfiguracia_gdal(self.konfiguracia):
+                if self.v_davke:
+                    self.vrstva.RollbackTransaction()
+                    self.v_davke = 0
+                self.feature = None
+                self.datovy_zdroj.Destroy()
+            self.datovy_zdroj = None
+
+    def priprav_polia(self, meta_polia):
+        for pole in meta_polia:
+            typ = pole['typ']
+            # pridanie vynimky pre ESRI Shapefile format, ktory nepodporuje datovy typ datetime
+            if self.driver == 'ESRI Shapefile' and typ == 'OFTDateTime':
+                typ = 'OFTDate'
+
+            fd = ogr.FieldDefn(pole['nazov'], getattr(ogr, typ))
+            if 'sirka' in pole:
+                fd.SetWidth(pole['sirka'])
+            if 'presnost' in pole:
+                fd.SetPrecision(pole['presnost'])
+            self.vrstva.CreateField(fd)
+
+        self.polia = True
+
+    def priprav_feature(self):
+        """Vytvori feature, ktory sa pouziva pre vsetky objekty vrstvy. Volat az po vytvoreni poli"""
+        self.definicia = self.vrstva.GetLayerDefn()
+        self.feature = ogr.Feature(feature_def=self.definicia)
+        self.indexy_poli = {}
+        self.hodnoty = {}
+
+    def index_pola(self, nazov):
+        index = self.indexy_poli.get(nazov)
+        if index is None:
+            index = self.indexy_poli[nazov] = self.definicia.GetFieldIndex(nazov)
+        return index
+
+    def features(self, data):
+        """Pre kazdy geometricky objekt nastavi hodnoty poli a geometriu feature-u a vrati ho. Hodnoty, ktore sa
+        od predchadzajuceho objektu nezmenili (napr. atributy suboru), sa nenastavuju znova. Data objektu sa nemenia,
+        takze ich moze zapisat aj dalsi vystup"""
+        if self.feature is None:
+            self.priprav_feature()
+        f = self.feature
+        hodnoty = self.hodnoty
+        for objekt in data['geometricke_objekty']:
+            atributy = data['atributy']
+            if objekt.get('atributy'):
+                atributy = {**atributy, **objekt['atributy']}
+            for atribut in [a for a in hodnoty if a not in atributy]:
+                f.UnsetField(self.index_pola(atribut))
+                del hodnoty[atribut]
+            for atribut, hodnota in atributy.items():
+                if atribut in hodnoty and hodnoty[atribut] == hodnota:
+                    continue
+                index = self.index_pola(atribut)
+                if index < 0:
+                    continue
+                if isinstance(hodnota, tuple):
+                    # datetime hodnota
+                    f.SetField(index, *hodnota)
+                else:
+                    f.SetField(index, hodnota)
+                hodnoty[atribut] = hodnota
+
+            # WKB uz obsahuje vysledny typ geometrie (MultiPolygon, MultiLineString alebo Point)
+            f.SetGeometryDirectly(ogr.CreateGeometryFromWkb(objekt['wkb']))
+            # CreateFeature nastavi feature-u FID, dalsi objekt musi dostat novy
+            f.SetFID(ogr.NullFID)
+            yield f
+
+    def zapis(self, feature):
+        if self.velkost_davky and not self.v_davke:
+            self.vrstva.StartTransaction()
+        self.vrstva.CreateFeature(feature)
+        if self.velkost_davky:
+            self.v_davke += 1
+            if self.v_davke >= self.velkost_davky:
+                self.ukonci_davku()
+
+    def ukonci_davku(self):
+        if self.v_davke:
+            self.vrstva.CommitTransaction()
+            self.v_davke = 0
+
+    def uloz(self, data):
+        with konfiguracia_gdal(self.konfiguracia):
+            if not self.polia:
+                self.priprav_polia(data['meta']['polia'])
+            for feature in self.features(data):
+                self.zapis(feature)
+
+
+class Spolocny_vystup(object):
+    """Vrstvy spolocne pre vsetky spracovane subory, pre kazdu vrstvu jeden subor FlatGeobuf s packed Hilbert
+    R-tree indexom. Index sa zostavi az pri zatvoreni, preto sa vrstvy zatvaraju az po spracovani vsetkych suborov"""
+    driver = 'FlatGeobuf'
+    pripona = 'fgb'
+    nastavenia_vrstvy = ['SPATIAL_INDEX=YES']
+
+    def __init__(self, cesta):
+        self.cesta = cesta
+        self.vrstvy = {}
+
+    def __del__(self):
+        self.zatvor()
+
+    def vrstva(self, nazov_vrstvy, geom_type, velkost_davky=None) -> Vystup_vrstvy:
+        if nazov_vrstvy not in self.vrstvy:
+            if not os.path.exists(self.cesta):
+                os.makedirs(self.cesta)
+            nazov_suboru = os.path.join(self.cesta, f'{nazov_vrstvy}.{self.pripona}')
+            self.vrstvy[nazov_vrstvy] = Vystup_vrstvy(nazov_suboru, self.driver, geom_type, nazov_vrstvy,
+                                                      nastavenia_vrstvy=self.nastavenia_vrstvy,
+                                                      velkost_davky=velkost_davky)
+        return self.vrstvy[nazov_vrstvy]
+
+    def zatvor(self):
+        for vystup in self.vrstvy.values():
+            vystup.zatvor()
+        self.vrstvy = {}
+
+    def zahod(self):
+        """Zatvori vrstvy bez zostavenia indexu a zmaze ich subory"""
+        for nazov_vrstvy, vystup in self.vrstvy.items():
+            vystup.zahod()
+            nazov_suboru = os.path.join(self.cesta, f'{nazov_vrstvy}.{self.pripona}')
+            if os.path.exists(nazov_suboru):
+                os.remove(nazov_suboru)
+        self.vrstvy = {}
+
+
+class Geopackage(object):
+    """Spolocny GeoPackage pre vsetky spracovane subory. Objekty jedneho VGI suboru sa nahradzaju v jednej transakcii:
+    najprv sa zo zadanych vrstiev zmazu riadky suboru z predchadzajuceho importu, potom sa vlozia nove objekty.
+    Transakciu potvrdi iba zatvor(), GeoPackage zatvoreny inak (zahod(), __del__) zostane bez zmeny"""
+    datovy_zdroj = None
+
+    def __init__(self, nazov_suboru, subor, nazvy_vrstiev=None):
+        if os.path.exists(nazov_suboru):
+            self.datovy_zdroj = ogr.Open(nazov_suboru, update=1)
+        else:
+            self.datovy_zdroj = ogr.GetDriverByName('GPKG').CreateDataSource(nazov_suboru)
+        self.datovy_zdroj.StartTransaction()
+
+        if nazvy_vrstiev is None:
+            nazvy_vrstiev = [self.datovy_zdroj.GetLayerByIndex(i).GetName()
+                             for i in range(self.datovy_zdroj.GetLayerCount())]
+        subor = subor.replace("'", "''")
+        for nazov_vrstvy in nazvy_vrstiev:
+            if self.datovy_zdroj.GetLayerByName(nazov_vrstvy) is not None:
+                self.datovy_zdroj.ExecuteSQL(f"DELETE FROM \"{nazov_vrstvy}\" WHERE subor = '{subor}'")
+
+    def __del__(self):
+        self.zahod()
+
+    def vrstva(self, nazov_vrstvy, geom_type):
+        """Vrati vrstvu a priznak, ci bola prave vytvorena. Nova vrstva ma R-tree index geometrie"""
+        vrstva = self.datovy_zdroj.GetLayerByName(nazov_vrstvy)
+        if vrstva is not None:
+            return vrstva, False
+        vrstva = self.datovy_zdroj.CreateLayer(nazov_vrstvy, geom_type=geom_type,
+                                               options=['GEOMETRY_NAME=geom', 'FID=gid', 'SPATIAL_INDEX=YES'])
+        return vrstva, True
+
+    def zatvor(self):
+        if self.datovy_zdroj:
+            self.datovy_zdroj.CommitTransaction()
+            self.datovy_zdroj.Destroy()
+            self.datovy_zdroj = None
+
+    def zahod(self):
+        """Zrusi zmazanie aj vlozenie objektov suboru, objekty predchadzajuceho importu zostanu"""
+        if self.datovy_zdroj:
+            self.datovy_zdroj.RollbackTransaction()
+            self.datovy_zdroj.Destroy()
+            self.datovy_zdroj = None
+
+
+class Vystup_gpkg_vrstvy(Vystup_vrstvy):
+    """Vrstva v spolocnom GeoPackage. Datovy zdroj aj transakciu spravuje objekt Geopackage"""
+    driver = 'GPKG'
+    velkost_davky = 0
+
+    def __init__(self, geopackage, geom_type, nazov_vrstvy, kodovanie='utf-8'):
+        self.geopackage = geopackage
+        self.kodovanie = kodovanie
+        self.nazov_vrstvy = nazov_vrstvy
+        self.vrstva, nova = geopackage.vrstva(nazov_vrstvy, geom_type)
+        # polia existujucej vrstvy su uz vytvorene z predchadzajuceho importu
+        self.polia = not nova
+
+    def zatvor(self):
+        self.feature = None
+
+    def zahod(self):
+        # zmeny vrstvy vrati spat transakcia GeoPackage
+        self.feature = None
+
+    def priprav_polia(self, meta_polia):
+        super().priprav_polia(meta_polia)
+        # podla suboru sa mazu riadky pri opakovanom importe
+        self.geopackage.datovy_zdroj.ExecuteSQL(
+            f'CREATE INDEX "idx_{self.nazov_vrstvy}_subor" ON "{self.nazov_vrstvy}" (subor)')
+
+
+class CAD_vystup(object):
+    def __init__(self, vystup):
+        self.vystup = vystup
+
+    def uloz(self, data):
+        # Ak objekt obsahuje textove elementy (vety), potom sa pre kazdy element vytvori bodovy objekt na danej
+        # pozicii s hodnotou textu ulozenou v atribute 'Text'. Povodne atributy sa neulozia, data objektu sa vsak
+        # nemenia, aby ich mohli zapisat aj ostatne vystupy.
+        geometrie = {'atributy': {}, 'geometricke_objekty': [{'wkb': geom_objekt['wkb']}
+                                                            for geom_objekt in data['geometricke_objekty']]}
+        for f in self.vystup.features(geometrie):
+            f.SetStyleString('PEN(c:#FF0000)')
+            self.vystup.zapis(f)
+        if data.get('textove_elementy'):
+            for text_element in data['textove_elementy']:
+                f = ogr.Feature(feature_def=self.vystup.vrstva.GetLayerDefn())
+                geom = ogr.CreateGeometryFromWkb(text_element['wkb'])
+                f.SetGeometry(geom)
+                f.SetField('Text', text_element['text'].encode(self.vystup.kodovanie))
+                f.SetStyleString('LABEL(f:"Times New Roman",s:10pt)')
+                self.vystup.zapis(f)
+                f.Destroy()
+
+# vim: set ts=4 sts=4 sw=4 noet:
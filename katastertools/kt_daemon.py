@@ -0,0 +1,252 @@
+"""
+Konvertuje VGI subory vlozene do vstupneho adresara. Proces bezi trvalo a drzi pripravene pracovne procesy, takze sa
+Python a GDAL nespustaju pre kazdy subor znova.
+Pouzitie: kt_daemon --directory <daemon_dir>
+
+Struktura adresara <daemon_dir>:
+ * adresar 'inbox'      - nove subory VGI, subor sa spracuje, ked sa jeho velkost prestane menit
+ * adresar 'work'       - subory, ktore sa prave konvertuju
+ * adresar 'done'       - skonvertovane subory
+ * adresar 'quarantine' - subory, ktore sa nepodarilo skonvertovat, s popisom chyby v subore <subor>.error
+ * adresare 'sql_g', 'shp', 'dgn', 'parquet' - vystupy ako pri kt_sql, adresar 'log' - logy a metriky suborov
+
+Chybny subor sa presunie do karanteny a spracovanie pokracuje dalsimi subormi. Subor s nazvom uz skonvertovaneho suboru
+nahradi jeho vystupy.
+"""
+import sys
+import json
+import shutil
+import signal
+import threading
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+import click
+
+from katastertools.kt_sql import KNOWN_LAYERS, KN_LAYERS, UO_LAYERS, SHARED_FORMATS, check_export_requirements, \
+    convert_file, delete_outputs, file_outputs, file_sinks, parse_arc_step, parse_bbox, parse_export_format, \
+    parse_ku, parse_layers, record_metrics, start_worker
+from katastertools.kt_vgi2shp import BJ_LAYERS, configure_logging
+from katastertools.VgiShp.metriky import Metriky
+
+DIRECTORIES = ('inbox', 'work', 'done', 'quarantine', 'log')
+# layers of the VGI file types, the type is given by the prefix of the file name
+FILE_TYPES = {'KN': KN_LAYERS, 'UO': UO_LAYERS, 'BJ': BJ_LAYERS}
+# a file whose worker process crashed is converted again in a new pool, then it is quarantined
+ATTEMPTS = 2
+
+
+def start_daemon_worker(worker_memory: int):
+    # the daemon stops on SIGINT of the terminal after the running conversions end, workers must not be interrupted
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    start_worker(worker_memory)
+
+
+class Daemon:
+    """Converts files of the inbox in a pool of worker processes. Files are claimed by moving them into the work
+    directory, so a file is never converted twice and files left there by an interrupted run are converted again"""
+
+    def __init__(self, directory: Path, choices: dict, export_formats: tuple, layers: tuple, workers: int = 1,
+                 worker_memory: int = 0):
+        self.directory = directory
+        self.choices = choices
+        self.export_formats = export_formats
+        self.layers = layers
+        self.workers = workers
+        self.worker_memory = worker_memory
+        self.metrics = Metriky()
+        self.stopping = threading.Event()
+        # file in the work directory -> number of started conversions
+        self.attempts = {}
+        # future -> (file in the work directory, choices of the conversion, pool)
+        self.running = {}
+        # size and time of the last change of inbox files seen by the previous poll
+        self.seen = {}
+        self.executor = None
+
+    def start_pool(self):
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=start_daemon_worker,
+                                            initargs=(self.worker_memory,))
+
+    def stop(self, *_):
+        if not self.stopping.is_set():
+            print('* Stopping, waiting for files being converted...')
+        self.stopping.set()
+
+    def run(self, poll_interval: float = 2.0, once: bool = False):
+        """Converts files until stop() is called (SIGTERM, SIGINT). With once only the files in the inbox are converted
+        and the daemon stops when they are done"""
+        for d in DIRECTORIES:
+            (self.directory / d).mkdir(parents=True, exist_ok=True)
+        for f in sorted((self.directory / 'work').glob('*.vgi')):
+            print(f'* Converting "{f.name}" left from an interrupted run again')
+            shutil.move(str(f), str(self.directory / 'inbox' / f.name))
+
+        self.start_pool()
+        print(f'* Watching "{str(self.directory / "inbox")}" with {self.workers} worker(s)...')
+        try:
+            while True:
+                if not self.stopping.is_set():
+                    for f in self.ready_files(settled=not once):
+                        # a file with the name of a file being converted waits until the conversion ends
+                        if self.directory / 'work' / f.name not in self.attempts:
+                            self.submit(self.claim(f))
+                if once and not self.running and not self.ready_files(settled=False):
+                    break
+                if self.stopping.is_set() and not self.running:
+                    break
+                if self.running:
+                    finished, _ = wait(list(self.running), timeout=poll_interval, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        self.finish(future)
+                else:
+                    self.stopping.wait(poll_interval)
+        finally:
+            self.executor.shutdown()
+
+    def ready_files(self, settled: bool = True) -> list:
+        """VGI files of the inbox, largest first. With settled only files whose size and time of the last change did
+        not change since the previous poll, other files may still be copied"""
+        sizes = {}
+        for f in (self.directory / 'inbox').glob('*.vgi'):
+            try:
+                st = f.stat()
+            except OSError:
+                continue
+            sizes[f] = (st.st_size, st.st_mtime_ns)
+        ready = [f for f, size in sizes.items() if not settled or self.seen.get(f) == size]
+        self.seen = {f: size for f, size in sizes.items() if f not in ready}
+        return sorted(ready, key=lambda f: sizes[f][0], reverse=True)
+
+    def claim(self, file_path: Path) -> Path:
+        claimed = self.directory / 'work' / file_path.name
+        shutil.move(str(file_path), str(claimed))
+        return claimed
+
+    def submit(self, file_path: Path):
+        group = FILE_TYPES.get(file_path.name[:2].upper())
+        if group is None:
+            self.quarantine(file_path, f'Unknown type of file, expected a name starting with '
+                                       f'{", ".join(FILE_TYPES)}')
+            return
+        sinks, _, layers = file_sinks(self.directory, self.export_formats, self.layers, group)
+        if not sinks:
+            self.quarantine(file_path, 'None of the selected layers is in files of this type')
+            return
+        choices = dict(self.choices, file_path=file_path, layers=layers, sinks=sinks)
+        # outputs of a file with the same name converted earlier
+        for outputs in file_outputs([file_path], choices).values():
+            delete_outputs(outputs)
+        self.attempts[file_path] = self.attempts.get(file_path, 0) + 1
+        try:
+            future = self.executor.submit(convert_file, choices, self.directory / 'log')
+        except BrokenProcessPool:
+            self.start_pool()
+            future = self.executor.submit(convert_file, choices, self.directory / 'log')
+        self.running[future] = (file_path, choices, self.executor)
+
+    def finish(self, future):
+        file_path, choices, executor = self.running.pop(future)
+        try:
+            log, error, result = future.result()
+        except BrokenProcessPool:
+            # a worker was killed (e.g. by --worker-memory), all conversions of the pool are lost with it
+            if executor is self.executor:
+                executor.shutdown(wait=False)
+                self.start_pool()
+            if self.attempts[file_path] < ATTEMPTS:
+                self.submit(file_path)
+                return
+            log, error, result = '', 'The worker process converting the file was terminated', None
+        except Exception as e:
+            log, error, result = '', repr(e), None
+
+        if error:
+            for outputs in file_outputs([file_path], choices).values():
+                delete_outputs(outputs)
+            self.quarantine(file_path, error, log)
+            return
+        record_metrics(self.directory / 'log', file_path, result, self.metrics)
+        self.write_metrics()
+        self.remove(file_path, self.directory / 'done')
+        print(f'* Converted "{file_path.name}": {result.metrics.objekty} objects, {len(result.warnings)} warnings '
+              f'in {result.metrics.trvanie:.2f} s')
+
+    def quarantine(self, file_path: Path, error: str, log: str = ''):
+        sys.stderr.write(f'Conversion of "{file_path.name}" failed, moved into quarantine: {error}\n')
+        quarantine = self.directory / 'quarantine'
+        (quarantine / f'{file_path.name}.error').write_text(f'{error}\n\n{log}')
+        self.remove(file_path, quarantine)
+
+    def remove(self, file_path: Path, directory: Path):
+        """Moves a converted file from the work directory and deletes its index"""
+        self.attempts.pop(file_path, None)
+        shutil.move(str(file_path), str(directory / file_path.name))
+        file_path.with_name(file_path.name + '.idx').unlink(missing_ok=True)
+
+    def write_metrics(self):
+        report = dict(self.metrics.sprava(), formaty=list(self.export_formats), procesy=self.workers)
+        (self.directory / 'log' / 'metrics.json').write_text(json.dumps(report, indent=1))
+
+
+@click.command()
+@click.option("--directory", help="Path to the daemon directory, the inbox is <directory>/inbox",
+              type=click.Path(file_okay=False), required=True)
+@click.option("--export-format", help="Comma separated formats for the exported files (sql, shp, dgn, parquet)",
+              type=str, default='sql', required=True)
+@click.option("--layers", help="Comma separated layers to convert (" +
+                               ", ".join(f"{k}={v[0]}" for k, v in KNOWN_LAYERS.items()) + "), default: " +
+                               ",".join(KN_LAYERS + UO_LAYERS), type=str, default='')
+@click.option("--ku", help="Comma separated cadastral units (KU) to convert, default: all", type=str, default='')
+@click.option("--bbox", help="Convert only objects intersecting minx,miny,maxx,maxy (EPSG:5514)", type=str,
+              default='')
+@click.option("--arc-step", help="Densify arcs (R records): 'compat' (5 degree steps), an angle in degrees or a maximum "
+                                 "chord deviation in metres (e.g. 0.05m), default: arc points are kept as line "
+                                 "vertices", type=str, default='')
+@click.option("--workers", help="Number of warm worker processes converting files in parallel",
+              type=click.IntRange(min=1), default=2)
+@click.option("--worker-memory", help="Address space limit of one worker process in MB, 0 means no limit",
+              type=click.IntRange(min=0), default=0)
+@click.option("--batch-size", help="Number of features written in one layer transaction of OGR outputs (shp, dgn), "
+                                  "0 disables transactions", type=click.IntRange(min=0), default=10000)
+@click.option("--poll-interval", help="Seconds between two scans of the inbox", type=click.FloatRange(min=0.1),
+              default=2.0)
+@click.option("--once", help="Convert the files which are in the inbox and exit", is_flag=True)
+@click.pass_context
+def main(ctx, directory: str, export_format: str, layers: str, ku: str, bbox: str, arc_step: str, workers: int,
+         worker_memory: int, batch_size: int, poll_interval: float, once: bool):
+    f"""{__doc__}"""
+    directory = Path(directory).resolve()
+    configure_logging()
+    export_formats = parse_export_format(export_format)
+    if any(f in SHARED_FORMATS for f in export_formats):
+        raise click.BadParameter(f'{", ".join(SHARED_FORMATS)} are not supported by the daemon',
+                                 param_hint='--export-format')
+    check_export_requirements(export_formats)
+    choices = {
+        'output_directory': None,
+        'output_format': None,
+        'layer_config': '',
+        'process_unknown_layers': False,
+        'ku': parse_ku(ku),
+        'bbox': parse_bbox(bbox),
+        'jobs': 1,
+        'arc_step': parse_arc_step(arc_step),
+        'batch_size': batch_size,
+    }
+
+    daemon = Daemon(directory, choices, export_formats, parse_layers(layers), workers, worker_memory)
+    signal.signal(signal.SIGTERM, daemon.stop)
+    signal.signal(signal.SIGINT, daemon.stop)
+    daemon.run(poll_interval, once)
+    print('Daemon finished.')
+
+
+def start():
+    main(obj={})
+
+
+if __name__ == "__main__":
+    start()
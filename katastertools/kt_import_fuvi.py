@@ -15,12 +15,14 @@ import os
 import _io
 from datetime import datetime
 from pathlib import Path
-from typing import List, Union
+from typing import List, Optional, Union
 
 from katastertools import __VERSION__
 
 
-def process_line(riadok: str, kluce: dict, zoznam_ku: list, result: list):
+def parse_line(riadok: str, kluce: dict, zoznam_ku: list) -> Optional[tuple]:
+    """Spracuje riadok FPU. Riadok s klucom (.KLUC hodnota) ulozi do kluce, pre riadok s datami vrati nazov tabulky,
+    nazvy stlpcov a hodnoty, oboje vratane cisla KU"""
     if re.match(r"^\.", riadok):
         prem = riadok.strip(".").split()[0]
 
@@ -39,22 +41,53 @@ def process_line(riadok: str, kluce: dict, zoznam_ku: list, result: list):
         pass
     else:
         # ziskanie cisla KU
-        sql_ku = kluce['KATASTRALNE_UZEMIE']
+        ku = kluce['KATASTRALNE_UZEMIE']
 
-        # ziskavanie nazvov stlpcov
-        pol = kluce['POLOZKY'].split(";")
-        pol2 = '\"' + '\",\"'.join(pol)
-        sql_stlpce = "\"ku\"," + pol2.replace("KN-", "")[:-2].lower()
+        # ziskavanie nazvov stlpcov, polozky aj hodnoty su ukoncene bodkociarkou
+        stlpce = ['ku'] + [p.replace("KN-", "").lower() for p in kluce['POLOZKY'].split(";")[:-1]]
 
         # ziskanie nazvu db tabulky
-        sql_tab = kluce['SKUPINA'].replace("KN-", "").lower()
+        tabulka = 'kn_' + kluce['SKUPINA'].replace("KN-", "").lower()
 
         # ziskanie hodnot
-        kn_hodn = riadok.split(";")
-        sql_hodn = f"$${sql_ku}$$, $${'$$, $$'.join(kn_hodn)[:-5]}$"
+        hodnoty = [ku] + riadok.split(";")[:-1]
+
+        return tabulka, stlpce, hodnoty
+    return None
+
+
+def process_line(riadok: str, kluce: dict, zoznam_ku: list, result: list):
+    riadok_dat = parse_line(riadok, kluce, zoznam_ku)
+    if riadok_dat is not None:
+        tabulka, stlpce, hodnoty = riadok_dat
+        sql_stlpce = ','.join(f'"{s}"' for s in stlpce)
+        sql_hodn = ', '.join(f'$${h}$$' for h in hodnoty)
 
         # vytvorenie SQL prikazu
-        result.append(f"INSERT INTO kn_{sql_tab} ({sql_stlpce}) VALUES ({sql_hodn});")
+        result.append(f"INSERT INTO {tabulka} ({sql_stlpce}) VALUES ({sql_hodn});")
+
+
+def fuvi_rows(data: List[str]) -> tuple:
+    """Vrati riadky s datami zoskupene podla tabulky, stlpcov a KU ako {(tabulka, stlpce, ku): [hodnoty, ...]} a
+    zoznam KU. Hodnoty su texty, rovnake ako v prikazoch INSERT"""
+    kluce = {}
+    zoznam_ku = []
+    davky = {}
+    for riadok in data:
+        riadok_dat = parse_line(riadok, kluce, zoznam_ku)
+        if riadok_dat is not None:
+            tabulka, stlpce, hodnoty = riadok_dat
+            davky.setdefault((tabulka, tuple(stlpce), hodnoty[0]), []).append(hodnoty)
+    return davky, zoznam_ku
+
+
+def parckey_statements(ku: str) -> List[str]:
+    """Prikazy pre vytvorenie jedinecneho identifikatora parcely - parckey v danom KU"""
+    return [
+        f"UPDATE kn_cs SET parckey = ku::text || '00' || to_char(cpa, 'FM000000000') WHERE ku = '{ku}';",
+        f"UPDATE kn_ep SET parckey = ku::text || to_char(cpu, 'FM00') || to_char(cpa, 'FM000000000') WHERE ku = '{ku}';",
+        f"UPDATE kn_pa SET parckey = ku::text || '00' || to_char(cpa, 'FM000000000') WHERE ku = '{ku}';",
+    ]
 
 
 def process_list(data: List[str]) -> tuple:
@@ -104,10 +137,7 @@ def import_fuvi(data: Union[Path, _io.BufferedRandom, list]) -> List[str]:
 
     # vytvorenie jedinecneho identifikatora parcely - parckey
     for u in zoznam_ku:
-        result.append(f"UPDATE kn_cs SET parckey = ku::text || '00' || to_char(cpa, 'FM000000000') WHERE ku = '{u}';")
-        result.append(
-            f"UPDATE kn_ep SET parckey = ku::text || to_char(cpu, 'FM00') || to_char(cpa, 'FM000000000') WHERE ku = '{u}';")
-        result.append(f"UPDATE kn_pa SET parckey = ku::text || '00' || to_char(cpa, 'FM000000000') WHERE ku = '{u}';")
+        result.extend(parckey_statements(u))
 
     result.append("END;")
     return result
@@ -1,21 +1,53 @@
 """
-Vykona konverziu dat Katastra do SQL, ESRI Shapefile a Microstation DGN 7.
+Vykona konverziu dat Katastra do SQL, ESRI Shapefile a Microstation DGN 7, alebo ich priamo nahra do PostGIS (--dsn).
 Pouzitie: kt_sql <kataster_dir>
 
 Struktura adresara <kataster_dir>:
  * adresar 'vgi'             - subory VGI
  * adresar 'dbf' alebo 'fpu' - subory DBF resp. FPU+FPT
 V pripade, ze existuje adresar 'dbf' aj 'fpu', na konverziu sa pouziju data vo formate FPU.
+
+Do suboru <kataster_dir>/manifest.json sa pre kazdy vstupny subor zapise hash obsahu, verzia a nastavenia konverzie.
+Pri dalsom spusteni sa konvertuju iba zmenene subory, vystupy ostatnych sa pouziju znova (--rebuild konvertuje vsetko).
 """
+import io
 import sys
+import json
+import time
 import click
+import cProfile
+import pstats
+import contextlib
+import importlib.util
 import tempfile
 import shutil
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Optional
 
 from katastertools.kt_vycisti_fuvi import vycisti_fuvi
-from katastertools.kt_import_fuvi import import_fuvi
-from katastertools.kt_vgi2shp import KNOWN_LAYERS, process_files
+from katastertools.kt_import_fuvi import import_fuvi, fuvi_rows, parckey_statements
+from katastertools.kt_vgi2shp import KNOWN_LAYERS, KN_LAYERS, UO_LAYERS, OutputSink, ConversionResult, \
+    ConversionError, configure_logging, process_files
+from katastertools.VgiShp.data import krok_obluku
+from katastertools.VgiShp.metriky import Metriky
+from katastertools.postgis import Nahravac, ChybaNahravania
+from katastertools.manifest import Manifest
+
+DB_SCHEMA = 'kataster'
+# options of process_files which change the output of a file, a file is converted again when any of them changes
+CONVERSION_SETTINGS = ('layers', 'sinks', 'layer_config', 'process_unknown_layers', 'ku', 'bbox', 'arc_step')
+# formats with separate outputs for every VGI file: (output format of process_files, output directory, name)
+FILE_FORMATS = {
+    'sql': ('sql-copy', 'sql_g', 'SQL'),
+    'shp': ('shp', 'shp', 'SHP'),
+    'dgn': ('dgn', 'dgn', 'DGN'),
+    'parquet': ('parquet', 'parquet', 'GeoParquet'),
+}
+# formats with outputs shared by all VGI files, they can not be combined with other formats
+SHARED_FORMATS = ('gpkg', 'fgb')
+# formats written through OGR, GDAL is imported only when one of them is used
+OGR_FORMATS = ('shp', 'dgn', 'gpkg', 'fgb')
 
 
 def create_temporary_copy(src: Path) -> tempfile.TemporaryFile:
@@ -40,69 +72,397 @@ def delete_folder(path: Path, only_content: bool = False):
         path.rmdir()
 
 
-def process_descriptive_files(directory: Path):
+def delete_outputs(paths):
+    for path in paths:
+        if path.is_dir():
+            delete_folder(path)
+        elif path.exists():
+            path.unlink()
+
+
+def process_descriptive_files(directory: Path, manifest: Manifest = None):
     # clean FPU files
     print('* Converting FPU into SQL...')
-    for f in (directory / 'fpu').glob('*.FPU'):
+    for f in sorted((directory / 'fpu').glob('*.FPU')):
+        output_file_path = directory / 'sql_p' / f'{f.stem}.sql'
+        if manifest is not None:
+            record = manifest.zaznam(f, {'output_format': 'sql'})
+            if manifest.aktualny(f, record):
+                print(f'* Reusing SQL of unchanged FPU "{str(f)}"')
+                continue
+            delete_outputs(manifest.zabudni(f))
+
         print(f'* Cleaning FPU "{str(f)}"...')
         cleared_lines = vycisti_fuvi(f)
 
         print(f'* Converting FPU into SQL "{str(f)}"...')
         result = import_fuvi(cleared_lines)
 
-        with open(directory / 'sql_p' / f'{f.stem}.sql', 'w') as f_sql:
+        with open(output_file_path, 'w') as f_sql:
             for line in result:
                 f_sql.write(f'{line}\n')
+        if manifest is not None:
+            manifest.zaznamenaj(f, record, [output_file_path])
 
-    join_sql_files(directory / 'sql_p', directory / 'sql' / 'popisne_udaje.sql')
-
-
-def process_geometry_files(directory: Path, choices: dict, export_format: str):
-    if export_format == 'sql':
-        generate_sql(directory, choices)
-    elif export_format == 'shp':
-        generate_shp(directory, choices)
-
-
-def generate_sql(directory: Path, choices: dict):
-    choices['output_format'] = 'sql-copy'
-    choices['output_directory'] = directory / 'sql_g'
-
-    print('* Converting KN into SQL (KATUZ, KLADPAR, LINIE, POPIS, ZAPPAR, ZNACKY, ZUOB)...')
-    choices['layers'] = {k: v[0] for k, v in KNOWN_LAYERS.items() if k in ('t', 'k', 'l', 'p', 'r', 'n', 'z',)}
-    for f in (directory / 'vgi').rglob('KN*.vgi'):
-        choices['file_path'] = f
-        process_files(**choices)
-
-    print("* Converting UO into SQL (UOV)...")
-    choices['layers'] = {k: v[0] for k, v in KNOWN_LAYERS.items() if k in ('u',)}
-    for f in (directory / 'vgi').rglob('UO*.vgi'):
-        choices['file_path'] = f
-        process_files(**choices)
 
-    join_sql_files(choices['output_directory'], directory / 'sql' / 'graficke_udaje.sql')
+def load_descriptive_files(directory: Path, loader: Nahravac):
+    print('* Loading FPU into PostGIS...')
+    for f in (directory / 'fpu').glob('*.FPU'):
+        print(f'* Cleaning FPU "{str(f)}"...')
+        cleared_lines = vycisti_fuvi(f)
 
+        print(f'* Loading FPU "{str(f)}"...')
+        batches, ku_list = fuvi_rows(cleared_lines)
+        loaded = {}
+        for (table, columns, ku), rows in batches.items():
+            loaded.setdefault(ku, []).append(loader.nahraj(DB_SCHEMA, table, columns, rows))
 
-def generate_shp(directory: Path, choices: dict):
-    choices['layers'] = {k: v[0] for k, v in KNOWN_LAYERS.items() if k in ('t', 'k', 'l', 'p', 'r', 'n', 'z',)}
-    choices['output_format'] = 'shp'
-    choices['output_directory'] = directory / 'shp'
+        # parckey is computed once all rows of the cadastral unit are loaded
+        for ku in ku_list:
+            loader.vykonaj(parckey_statements(ku), po=loaded.get(ku, ()), search_path=f'{DB_SCHEMA},public')
 
-    print("* Converting KN into SHP (all found layers)...")
-    for f in (directory / 'vgi').rglob('KN*.vgi'):
-        choices['file_path'] = f
-        process_files(**choices)
 
-    print("* Converting UO into SHP (all found layers)...")
-    for f in (directory / 'vgi').rglob('UO*.vgi'):
-        choices['file_path'] = f
-        process_files(**choices)
+def load_geometry_files(directory: Path, choices: dict, layers: tuple, loader: Nahravac, metrics: Metriky):
+    choices['output_format'] = 'postgis'
+    choices['output_directory'] = directory / 'sql_g'
+    choices['loader'] = loader
+
+    for prefix, group in (('KN', KN_LAYERS), ('UO', UO_LAYERS)):
+        choices['layers'] = select_layers(tuple(k for k in layers if k in group))
+        if choices['layers']:
+            print(f'* Loading {prefix} into PostGIS ({", ".join(sorted(choices["layers"].values()))})...')
+            for f in (directory / 'vgi').rglob(f'{prefix}*.vgi'):
+                choices['file_path'] = f
+                record_metrics(directory / 'log', f, convert(choices), metrics)
+
+
+def report_load(loader: Nahravac) -> bool:
+    errors = loader.cakaj()
+    total_rows = 0
+    for table, (rows, seconds) in sorted(loader.statistika.items()):
+        total_rows += rows
+        print(f'  * {table}: {rows} rows in {seconds:.2f} s ({rows / seconds if seconds else 0:.0f} rows/s per stream)')
+    elapsed = loader.trvanie()
+    print(f'  * Loaded {total_rows} rows in {elapsed:.2f} s ({total_rows / elapsed if elapsed else 0:.0f} rows/s)')
+    for batch, error in errors:
+        sys.stderr.write(f'Loading into {batch} failed and was rolled back: {error}\n')
+    return not errors
+
+
+def select_layers(keys: tuple) -> dict:
+    return {k: v[0] for k, v in KNOWN_LAYERS.items() if k in keys}
+
+
+def process_geometry_files(directory: Path, choices: dict, export_formats: tuple, layers: tuple, workers: int = 1,
+                           worker_memory: int = 0, manifest: Manifest = None, metrics: Metriky = None,
+                           profile: bool = False) -> bool:
+    pool = {'workers': workers, 'worker_memory': worker_memory, 'log_directory': directory / 'log',
+            'manifest': manifest, 'metrics': metrics, 'profile': profile}
+    if export_formats == ('gpkg',):
+        generate_gpkg(directory, choices, layers, metrics)
+    elif export_formats == ('fgb',):
+        generate_fgb(directory, choices, layers, metrics)
+    else:
+        return generate_files(directory, choices, export_formats, layers, **pool)
+    return True
+
+
+def start_worker(worker_memory: int):
+    configure_logging()
+    limit_worker_memory(worker_memory)
+
+
+def limit_worker_memory(worker_memory: int):
+    if not worker_memory:
+        return
+    try:
+        import resource
+    except ImportError:
+        return
+    limit = worker_memory * 1048576
+    hard = resource.getrlimit(resource.RLIMIT_AS)[1]
+    resource.setrlimit(resource.RLIMIT_AS, (limit if hard == resource.RLIM_INFINITY else min(limit, hard), hard))
+
+
+def convert(choices: dict) -> ConversionResult:
+    """Converts a single VGI file, a file which can not be converted stops the run"""
+    try:
+        return process_files(**choices)
+    except ConversionError as e:
+        sys.stderr.write(f'ERROR: {e}\n')
+        sys.exit(2)
+
+
+def convert_file(choices: dict, log_directory: Path, profile: bool = False) -> tuple:
+    # runs in a worker process, the log of the file is captured so that logs of parallel files do not interleave
+    log = io.StringIO()
+    error = None
+    result = None
+    profiler = cProfile.Profile() if profile else None
+    with contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+        try:
+            if profiler:
+                result = profiler.runcall(process_files, **choices)
+            else:
+                result = process_files(**choices)
+        except ConversionError as e:
+            error = str(e)
+        except Exception as e:
+            error = repr(e)
+    log = log.getvalue()
+    (log_directory / f'{choices["file_path"].stem}.log').write_text(log)
+    if profiler:
+        # merged into the profile of the run by write_profile
+        profiler.dump_stats(log_directory / f'{choices["file_path"].stem}.prof')
+    return log, error, result
+
+
+def record_metrics(log_directory: Path, file_path: Path, result: Optional[ConversionResult],
+                   metrics: Optional[Metriky]):
+    """Writes the metrics and warnings of a converted file into log/<file>.json and adds the metrics to the metrics of
+    the run"""
+    if result is None:
+        return
+    report = dict(result.metrics.sprava(), subor=str(file_path), varovania=list(result.warnings))
+    (log_directory / f'{file_path.stem}.json').write_text(json.dumps(report, indent=1))
+    if metrics is not None:
+        metrics.zluc(result.metrics)
+
+
+def write_profile(profiler: cProfile.Profile, log_directory: Path):
+    """Writes the profile of the run into log/profile.prof, profiles of worker processes are merged into it"""
+    stats = pstats.Stats(profiler)
+    for worker_profile in sorted(log_directory.glob('*.prof')):
+        if worker_profile.name != 'profile.prof':
+            stats.add(str(worker_profile))
+            worker_profile.unlink()
+    stats.dump_stats(log_directory / 'profile.prof')
+    print(f'  * Profile "{str(log_directory / "profile.prof")}" was written.')
+
+
+def conversion_settings(choices: dict) -> dict:
+    settings = {k: choices[k] for k in CONVERSION_SETTINGS}
+    if settings['ku'] is not None:
+        settings['ku'] = sorted(settings['ku'])
+    settings['sinks'] = [(sink.output_format, sorted(sink.layers)) for sink in settings['sinks']]
+    return settings
+
+
+def file_outputs(files, choices: dict) -> dict:
+    """Existing outputs of VGI files, a directory <output>/<file> or GeoParquet files <output>/<layer>/ku=<KU>/<file>"""
+    outputs = {f: [] for f in files}
+    by_stem = {f.stem: f for f in files}
+    for sink in choices['sinks']:
+        if sink.output_format == 'parquet':
+            # a single pass over the dataset, it has a directory for every layer and cadastral unit
+            for path in sorted(sink.output_directory.glob('*/*/*.parquet')):
+                if path.stem in by_stem:
+                    outputs[by_stem[path.stem]].append(path)
+        else:
+            for f in files:
+                if (sink.output_directory / f.stem).exists():
+                    outputs[f].append(sink.output_directory / f.stem)
+    return outputs
+
+
+def convert_files(files, choices: dict, workers: int = 1, worker_memory: int = 0, log_directory: Path = None,
+                  manifest: Manifest = None, metrics: Metriky = None, profile: bool = False) -> bool:
+    """Converts VGI files with process_files. With more workers the files are dispatched to a process pool, largest
+    first, and the log of every file is written to log/<file>.log and printed in file order. Files which are unchanged
+    according to the manifest are skipped and their outputs from the previous run are kept"""
+    files = sorted(files)
+    records = {}
+    if manifest is not None:
+        settings = conversion_settings(choices)
+        changed = []
+        for f in files:
+            records[f] = manifest.zaznam(f, settings)
+            if manifest.aktualny(f, records[f]):
+                print(f'  * Reusing output of unchanged "{str(f)}"')
+            else:
+                delete_outputs(manifest.zabudni(f))
+                changed.append(f)
+        for outputs in file_outputs(changed, choices).values():
+            delete_outputs(outputs)
+        files = changed
+
+    converted = []
+    try:
+        if workers <= 1 or len(files) <= 1:
+            for f in files:
+                record_metrics(log_directory, f, convert(dict(choices, file_path=f)), metrics)
+                converted.append(f)
+            return True
+
+        failed = []
+        largest_first = sorted(files, key=lambda f: f.stat().st_size, reverse=True)
+        with ProcessPoolExecutor(max_workers=min(workers, len(files)), initializer=start_worker,
+                                 initargs=(worker_memory,)) as executor:
+            futures = {f: executor.submit(convert_file, dict(choices, file_path=f), log_directory, profile)
+                       for f in largest_first}
+            for f in files:
+                try:
+                    log, error, result = futures[f].result()
+                except Exception as e:
+                    log, error, result = '', repr(e), None
+                sys.stdout.write(log)
+                if error:
+                    failed.append(f)
+                    sys.stderr.write(f'Conversion of "{str(f)}" failed: {error}\n')
+                else:
+                    record_metrics(log_directory, f, result, metrics)
+                    converted.append(f)
+        # partial outputs of a killed worker, failed files must not reach the joined SQL
+        for outputs in file_outputs(failed, choices).values():
+            delete_outputs(outputs)
+        if failed and worker_memory:
+            sys.stderr.write(f'{len(failed)} file(s) failed, --worker-memory {worker_memory} MB may be too low\n')
+        return not failed
+    finally:
+        # failed files get no record, so they are converted again in the next run
+        if manifest is not None:
+            for f, outputs in file_outputs(converted, choices).items():
+                manifest.zaznamenaj(f, records[f], outputs)
+
+
+def file_sinks(directory: Path, export_formats: tuple, layers: tuple, group: tuple) -> tuple:
+    """Outputs of VGI files of one type (layers of the group) in formats with separate outputs for every file. Returns
+    the sinks, names of their formats and all layers to convert"""
+    sinks = []
+    names = []
+    selected = {}
+    for export_format in export_formats:
+        output_format, output_directory, name = FILE_FORMATS[export_format]
+        # SQL holds only the layers of the file type, the other formats all found layers
+        sink_layers = select_layers(tuple(k for k in layers if k in group) if export_format == 'sql' else layers)
+        if sink_layers:
+            sinks.append(OutputSink(output_format, directory / output_directory, frozenset(sink_layers.values())))
+            names.append(name)
+            selected.update(sink_layers)
+    return sinks, names, selected
+
+
+def generate_files(directory: Path, choices: dict, export_formats: tuple, layers: tuple, **pool) -> bool:
+    """Converts VGI files into all given formats with separate outputs for every file, each file is parsed once and
+    its objects are written to all outputs"""
+    succeeded = True
+
+    for prefix, group in (('KN', KN_LAYERS), ('UO', UO_LAYERS)):
+        sinks, names, choices['layers'] = file_sinks(directory, export_formats, layers, group)
+        if sinks:
+            choices['sinks'] = sinks
+            print(f'* Converting {prefix} into {", ".join(names)} ({", ".join(sorted(choices["layers"].values()))})...')
+            succeeded &= convert_files((directory / 'vgi').rglob(f'{prefix}*.vgi'), choices, **pool)
+    return succeeded
+
+
+def generate_gpkg(directory: Path, choices: dict, layers: tuple, metrics: Metriky = None):
+    # the national GeoPackage is kept between runs, each VGI file replaces only its own rows
+    choices['layers'] = select_layers(layers)
+    choices['output_format'] = 'gpkg'
+    choices['output_directory'] = directory / 'gpkg'
+
+    print(f'* Updating GeoPackage "{str(choices["output_directory"] / "kataster.gpkg")}"...')
+    for pattern in ('KN*.vgi', 'UO*.vgi'):
+        for f in (directory / 'vgi').rglob(pattern):
+            choices['file_path'] = f
+            record_metrics(directory / 'log', f, convert(choices), metrics)
+
+
+def generate_fgb(directory: Path, choices: dict, layers: tuple, metrics: Metriky = None):
+    # one FlatGeobuf file per layer for the whole run, the spatial index is built when the layers are closed
+    choices['layers'] = select_layers(layers)
+    choices['output_format'] = 'fgb'
+    choices['output_directory'] = directory / 'fgb'
+    from katastertools.VgiShp.ogr_vystupy import Spolocny_vystup
+    choices['shared_output'] = Spolocny_vystup(str(directory / 'fgb'))
+
+    print(f'* Converting VGI into FlatGeobuf ({", ".join(sorted(choices["layers"].values()))})...')
+    try:
+        for pattern in ('KN*.vgi', 'UO*.vgi'):
+            for f in (directory / 'vgi').rglob(pattern):
+                choices['file_path'] = f
+                record_metrics(directory / 'log', f, convert(choices), metrics)
+    except BaseException:
+        # the layers hold objects of the failed file, they are not finished into a partial dataset
+        choices.pop('shared_output').zahod()
+        raise
+
+    print('  * Building spatial indexes...')
+    choices.pop('shared_output').zatvor()
+
+
+def parse_export_format(value: str) -> tuple:
+    formats = tuple(dict.fromkeys(f.strip().lower() for f in value.split(',') if f.strip()))
+    unknown = [f for f in formats if f not in FILE_FORMATS and f not in SHARED_FORMATS]
+    if not formats or unknown:
+        raise click.BadParameter(f'Unknown format in "{value}"', param_hint='--export-format')
+    if len(formats) > 1 and any(f in SHARED_FORMATS for f in formats):
+        raise click.BadParameter(f'{", ".join(SHARED_FORMATS)} can not be combined with other formats',
+                                 param_hint='--export-format')
+    return formats
+
+
+def check_export_requirements(export_formats: tuple):
+    """Fails before anything is converted when a package required by the export formats is not installed"""
+    if 'parquet' in export_formats and importlib.util.find_spec('pyarrow') is None:
+        raise click.UsageError('GeoParquet export requires the pyarrow package')
+    # the coordinate system of GeoParquet metadata
+    if 'parquet' in export_formats and importlib.util.find_spec('osgeo') is None and \
+            importlib.util.find_spec('pyproj') is None:
+        raise click.UsageError('GeoParquet export requires GDAL (the osgeo package) or pyproj')
+    ogr_formats = [f for f in export_formats if f in OGR_FORMATS]
+    if ogr_formats and importlib.util.find_spec('osgeo') is None:
+        raise click.UsageError(f'Export into {", ".join(ogr_formats)} requires GDAL (the osgeo package)')
+
+
+def parse_layers(value: str) -> tuple:
+    if not value:
+        return KN_LAYERS + UO_LAYERS
+    layers = tuple(k.strip().lower() for k in value.split(',') if k.strip())
+    unknown = [k for k in layers if k not in KNOWN_LAYERS]
+    if unknown:
+        raise click.BadParameter(f'Unknown layers: {", ".join(unknown)}', param_hint='--layers')
+    return layers
+
+
+def parse_ku(value: str) -> Optional[set]:
+    if not value:
+        return None
+    try:
+        return {int(k) for k in value.split(',') if k.strip()}
+    except ValueError:
+        raise click.BadParameter(f'Invalid cadastral unit in "{value}"', param_hint='--ku')
+
+
+def parse_bbox(value: str) -> Optional[tuple]:
+    if not value:
+        return None
+    try:
+        bbox = tuple(float(c) for c in value.split(','))
+    except ValueError:
+        bbox = ()
+    if len(bbox) != 4 or bbox[0] > bbox[2] or bbox[1] > bbox[3]:
+        raise click.BadParameter(f'Expected minx,miny,maxx,maxy, got "{value}"', param_hint='--bbox')
+    return bbox
+
+
+def parse_arc_step(value: str) -> Optional[str]:
+    if not value:
+        return None
+    try:
+        krok_obluku(value)
+    except ValueError:
+        raise click.BadParameter(f'Expected "compat", an angle in degrees (e.g. 5 or 5deg) or a maximum chord '
+                                 f'deviation in metres (e.g. 0.05m), got "{value}"', param_hint='--arc-step')
+    return value
 
 
 def join_sql_files(directory: Path, output_file_path: Path):
     print(f'  * Joining SQL files in directory: {str(directory)}..')
     with open(output_file_path, 'w') as output_f:
-        for file_path in directory.rglob('*.sql'):
+        # sorted, so that the result does not depend on the order in which the files were written
+        for file_path in sorted(directory.rglob('*.sql')):
             with open(file_path, 'r') as input_f:
                 output_f.writelines(input_f.readlines())
     print(f'  * File "{str(output_file_path)}" was generated.')
@@ -111,11 +471,43 @@ def join_sql_files(directory: Path, output_file_path: Path):
 @click.command()
 @click.option("--directory", help="Path to the directory with files", type=click.Path(exists=True, file_okay=False),
               required=True)
-@click.option("--export-format", help="Format for the exported files", type=str, default='sql', required=True)
+@click.option("--export-format", help="Comma separated formats for the exported files (sql, shp, dgn, parquet, gpkg, "
+                                     "fgb), sql, shp, dgn and parquet are written in a single pass over the VGI files",
+              type=str, default='sql', required=True)
+@click.option("--layers", help="Comma separated layers to convert (" +
+                               ", ".join(f"{k}={v[0]}" for k, v in KNOWN_LAYERS.items()) + "), default: " +
+                               ",".join(KN_LAYERS + UO_LAYERS), type=str, default='')
+@click.option("--ku", help="Comma separated cadastral units (KU) to convert, default: all", type=str, default='')
+@click.option("--bbox", help="Convert only objects intersecting minx,miny,maxx,maxy (EPSG:5514)", type=str,
+              default='')
+@click.option("--jobs", help="Number of processes parsing objects of a single VGI file", type=click.IntRange(min=1),
+              default=1)
+@click.option("--arc-step", help="Densify arcs (R records): 'compat' (5 degree steps), an angle in degrees or a maximum "
+                                 "chord deviation in metres (e.g. 0.05m), default: arc points are kept as line "
+                                 "vertices", type=str, default='')
+@click.option("--workers", help="Number of processes converting VGI files in parallel (sql, shp, dgn and parquet), "
+                               "largest files first", type=click.IntRange(min=1), default=1)
+@click.option("--worker-memory", help="Address space limit of one worker process in MB, 0 means no limit",
+              type=click.IntRange(min=0), default=0)
+@click.option("--batch-size", help="Number of features written in one layer transaction of OGR outputs (shp, dgn), "
+                                  "0 disables transactions", type=click.IntRange(min=0), default=10000)
+@click.option("--dsn", help="Load rows directly into PostGIS using this connection string instead of writing SQL files "
+                            "(e.g. postgresql://user@localhost/kataster)", type=str, default='')
+@click.option("--connections", help="Number of parallel COPY connections used with --dsn", type=click.IntRange(min=1),
+              default=4)
+@click.option("--rebuild", help="Ignore the manifest of the previous run and convert all files again", is_flag=True)
+@click.option("--profile", help="Profile the run with cProfile and write the result into log/profile.prof",
+              is_flag=True)
 @click.pass_context
-def main(ctx, directory: Path, export_format: str):
+def main(ctx, directory: Path, export_format: str, layers: str, ku: str, bbox: str, jobs: int, arc_step: str,
+         workers: int, worker_memory: int, batch_size: int, dsn: str, connections: int, rebuild: bool, profile: bool):
     f"""{__doc__}"""
     directory = Path(directory).resolve()
+    configure_logging()
+    export_formats = parse_export_format(export_format)
+    if not dsn:
+        check_export_requirements(export_formats)
+    layers = parse_layers(layers)
 
     if not (directory / 'vgi').exists():
         sys.stderr.write(f'Directory {str(directory / "vgi")} does not exist!\n')
@@ -123,14 +515,6 @@ def main(ctx, directory: Path, export_format: str):
     if not ((directory / 'fpu').exists() or (directory / 'dbf').exists()):
         sys.stderr.write(f'Non of directory {str(directory / "fpu")} {str(directory / "fpu")} does not exist!\n')
 
-    # clean directories
-    for d in ('sql', 'sql_p', 'sql_g', 'shp', 'dgn', 'log'):
-        delete_folder(directory / d)
-        (directory / d).mkdir(parents=True)
-
-    # Descriptive files
-    process_descriptive_files(directory)
-
     # Geometry files
     choices = {
         'file_path': None,
@@ -139,13 +523,87 @@ def main(ctx, directory: Path, export_format: str):
         'output_format': None,
         'layer_config': '',
         'process_unknown_layers': False,
-        'debug': False,
+        'ku': parse_ku(ku),
+        'bbox': parse_bbox(bbox),
+        'jobs': jobs,
+        'arc_step': parse_arc_step(arc_step),
+        'batch_size': batch_size,
     }
 
-    process_geometry_files(directory, choices, export_format)
+    # metrics of all converted VGI files, written into log/metrics.json
+    metrics = Metriky()
+    started = time.perf_counter()
+    profiler = cProfile.Profile() if profile else None
+    if profiler:
+        profiler.enable()
+    try:
+        if dsn:
+            succeeded = load_directory(directory, choices, layers, dsn, connections, metrics)
+        else:
+            succeeded = convert_directory(directory, choices, export_formats, layers, workers, worker_memory, rebuild,
+                                          metrics, profile)
+    finally:
+        if profiler:
+            profiler.disable()
+            write_profile(profiler, directory / 'log')
+        metrics.trvanie = time.perf_counter() - started
+        report = dict(metrics.sprava(), formaty=['postgis'] if dsn else list(export_formats), procesy=workers)
+        (directory / 'log' / 'metrics.json').write_text(json.dumps(report, indent=1))
 
     print(f'{"-" * 100}')
-    print('Conversion finished.')
+    if not succeeded:
+        sys.exit(1)
+    print('Loading finished.' if dsn else 'Conversion finished.')
+
+
+def load_directory(directory: Path, choices: dict, layers: tuple, dsn: str, connections: int,
+                   metrics: Metriky) -> bool:
+    # nothing but logs is written into the directory when loading directly into PostGIS
+    (directory / 'log').mkdir(exist_ok=True)
+    try:
+        loader = Nahravac(dsn, connections)
+    except ChybaNahravania as e:
+        raise click.UsageError(str(e))
+    try:
+        load_descriptive_files(directory, loader)
+        load_geometry_files(directory, choices, layers, loader, metrics)
+        print('* Waiting for COPY streams...')
+        return report_load(loader)
+    finally:
+        loader.zatvor()
+
+
+def convert_directory(directory: Path, choices: dict, export_formats: tuple, layers: tuple, workers: int,
+                      worker_memory: int, rebuild: bool, metrics: Metriky, profile: bool) -> bool:
+    # clean directories. Outputs of single files are kept when there is a manifest of the previous run, joined and
+    # shared outputs are always written again
+    manifest = Manifest(directory / 'manifest.json', directory)
+    if rebuild or not manifest.subory:
+        manifest.vymaz()
+        kept = ()
+    else:
+        kept = ('sql_p', 'sql_g', 'shp', 'dgn', 'parquet', 'log')
+    for d in ('sql', 'sql_p', 'sql_g', 'shp', 'dgn', 'parquet', 'fgb', 'log'):
+        if d not in kept:
+            delete_folder(directory / d)
+        (directory / d).mkdir(parents=True, exist_ok=True)
+
+    try:
+        # Descriptive files
+        process_descriptive_files(directory, manifest)
+
+        succeeded = process_geometry_files(directory, choices, export_formats, layers, workers, worker_memory, manifest,
+                                           metrics, profile)
+
+        # outputs of files which were removed from the directory or not converted in this run
+        delete_outputs(manifest.odstran_nepouzite())
+    finally:
+        manifest.uloz()
+
+    join_sql_files(directory / 'sql_p', directory / 'sql' / 'popisne_udaje.sql')
+    if 'sql' in export_formats:
+        join_sql_files(directory / 'sql_g', directory / 'sql' / 'graficke_udaje.sql')
+    return succeeded
 
 
 def start():
@@ -5,11 +5,17 @@ import sys
 import time
 import logging
 import datetime
+import threading
+import contextlib
+from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Optional, IO
+from typing import Optional, IO, Iterable, NamedTuple
 
 from katastertools.VgiShp import io
 from katastertools.VgiShp import data
+from katastertools.VgiShp.index import IndexObjektov
+from katastertools.VgiShp.metriky import Metriky
 
 KNOWN_LAYERS = {
     'b': ('BPEJ', u'hranice areálov bonitovaných pôdno-ekologických jednotiek'),
@@ -23,6 +29,40 @@ KNOWN_LAYERS = {
     'z': ('ZUOB', u'hranica zastavaného územia obce'),
 }
 
+# vrstvy, ktore sa predvolene konvertuju zo suborov KN a UO, a vrstva suborov BJ
+KN_LAYERS = ('t', 'k', 'l', 'p', 'r', 'n', 'z')
+UO_LAYERS = ('u',)
+BJ_LAYERS = ('b',)
+
+
+class OutputSink(NamedTuple):
+    """Jeden z vystupov spracovania VGI suboru. Vrstvy (nazvy vrstiev VGI, napr. KLADPAR) obmedzuju objekty zapisane
+    do tohto vystupu, None znamena vsetky spracovane vrstvy"""
+    output_format: str
+    output_directory: Path
+    layers: Optional[frozenset] = None
+
+
+class ConversionResult(NamedTuple):
+    """Vysledok konverzie VGI suboru: metriky spracovania a varovania a chyby, ktore konverziu neprerusili. Subor
+    vynechany filtrom KU nema ziadne objekty"""
+    file_path: Path
+    metrics: Metriky
+    warnings: tuple = ()
+    skipped: bool = False
+
+
+class ConversionError(Exception):
+    """VGI subor sa neda skonvertovat"""
+
+
+class InvalidInputError(ConversionError):
+    """Vstup nie je citatelny VGI subor podporovaneho typu"""
+
+
+class InvalidSettingsError(ConversionError):
+    """Neplatne nastavenia konverzie, napr. krok obluku alebo vystupny adresar"""
+
 
 class ConsoleHandler(logging.StreamHandler):
     """A handler that logs to sys.stdout by default with only error
@@ -50,60 +90,231 @@ class ConsoleHandler(logging.StreamHandler):
             logging.StreamHandler.flush(self)
 
 
-def objekt_vrstvy(meno_vrstvy, atributy):
+def configure_logging(debug: bool = False):
+    """Nastavi vypis logov konzolovych nastrojov, spravy do sys.stdout a chyby do sys.stderr. Kniznicne volania
+    process_files konfiguraciu logovania nemenia"""
+    logger = logging.getLogger()
+    logger.setLevel(logging.DEBUG if debug else logging.INFO)
+    handler = ConsoleHandler()
+    handler.setFormatter(logging.Formatter('%(levelname)s: %(message)s'))
+    logger.handlers = [h for h in logger.handlers if not isinstance(h, ConsoleHandler)]
+    logger.addHandler(handler)
+
+
+class ZachytavacVarovani(logging.Handler):
+    """Zbiera varovania a chyby zaznamenane vlaknom, ktore ho vytvorilo, takze subory konvertovane sucasne v inych
+    vlaknach sa nepomiesaju"""
+
+    def __init__(self):
+        logging.Handler.__init__(self, logging.WARNING)
+        self.vlakno = threading.get_ident()
+        self.spravy = []
+
+    def emit(self, record):
+        if record.thread == self.vlakno:
+            self.spravy.append(f'{record.levelname}: {record.getMessage()}')
+
+
+@contextlib.contextmanager
+def zachytavaj_varovania():
+    zachytavac = ZachytavacVarovani()
+    logger = logging.getLogger()
+    logger.addHandler(zachytavac)
+    try:
+        yield zachytavac.spravy
+    finally:
+        logger.removeHandler(zachytavac)
+
+
+def objekt_vrstvy(meno_vrstvy, atributy, krok_obluku=None):
     if meno_vrstvy == "KLADPAR":
-        return data.KLADPAR(atributy)
+        return data.KLADPAR(atributy, krok_obluku)
     elif meno_vrstvy == "ZAPPAR":
-        return data.ZAPPAR(atributy)
+        return data.ZAPPAR(atributy, krok_obluku)
     elif meno_vrstvy == "KATUZ":
-        return data.KATUZ(atributy)
+        return data.KATUZ(atributy, krok_obluku)
     elif meno_vrstvy == "LINIE":
-        return data.LINIE(atributy)
+        return data.LINIE(atributy, krok_obluku)
     elif meno_vrstvy == "POPIS":
-        return data.POPIS(atributy)
+        return data.POPIS(atributy, krok_obluku)
     elif meno_vrstvy == "ZNACKY":
-        return data.ZNACKY(atributy)
+        return data.ZNACKY(atributy, krok_obluku)
     elif meno_vrstvy == "ZUOB":
-        return data.ZUOB(atributy)
+        return data.ZUOB(atributy, krok_obluku)
     elif meno_vrstvy == "UOV":
-        return data.UOV(atributy)
+        return data.UOV(atributy, krok_obluku)
     elif meno_vrstvy == "BPEJ":
-        return data.BPEJ(atributy)
+        return data.BPEJ(atributy, krok_obluku)
     else:
         raise KeyError(meno_vrstvy)
 
 
-def process_files(file_path: Path, layers: dict, output_directory: Path, output_format: str = 'sql-copy',
-                  layer_config: str = '', process_unknown_layers: bool = False, debug: bool = False):
-    logger = logging.getLogger()
-    logger.setLevel(logging.DEBUG if debug else logging.INFO)
-    handler = ConsoleHandler()
-    handler.setFormatter(logging.Formatter('%(levelname)s: %(message)s'))
-    logger.handlers = []
-    logger.addHandler(handler)
+def spracuj_objekt(raw_objekt: dict, atributy: dict, metriky: Metriky, krok_obluku: Optional[tuple] = None) -> dict:
+    """Spracuje objekt znamej vrstvy a vrati jeho data"""
+    zaciatok = time.perf_counter()
+    nazov_vrstvy = raw_objekt["meno_vrstvy"]
+    objekt = objekt_vrstvy(nazov_vrstvy, atributy, krok_obluku)
+    for row in raw_objekt["riadky"]:
+        try:
+            objekt.pridaj_riadok(row)
+        except data.NepodporovanaVeta:
+            logging.warning(f"Nespracovany riadok: {row}")
+    parsovanie = time.perf_counter()
+    # polygony s nasilu uzatvorenymi kruhmi skusa s posunutymi skokmi uz samotny objekt
+    objekt_data = objekt.data()
+    metriky.pridaj_objekt(objekt, objekt_data, parsovanie - zaciatok, time.perf_counter() - parsovanie)
+    return objekt_data
+
+
+def id_objektu(raw_objekt: dict) -> str:
+    # rozhodnem sa ci objekt spracovavam alebo nie
+    while not raw_objekt['riadky'][0].startswith('&'):  # this was not here...
+        raw_objekt['riadky'].pop(0)
+    return raw_objekt['riadky'][0].split(' ')[2]
+
+
+def spracuj_serialne(raw_objekty, atributy: dict, layers: dict, vrstvy_typu: tuple, process_unknown_layers: bool,
+                     podporovane_objekty: list, bodove_objekty: set, liniove_objekty: set, metriky: Metriky,
+                     krok_obluku: Optional[tuple]):
+    """Postupne spracuje objekty suboru, vracia dvojice (ID objektu, data objektu)"""
+    for raw_objekt in metriky.citaj(raw_objekty):
+        objekt_id = id_objektu(raw_objekt)
+        nazov_vrstvy = raw_objekt["meno_vrstvy"]
+
+        if nazov_vrstvy in layers.values() and nazov_vrstvy in vrstvy_typu:
+            logging.debug(f"Spracuvavam objekt {nazov_vrstvy} {objekt_id}")
+            objekt_data = spracuj_objekt(raw_objekt, atributy, metriky, krok_obluku)
+
+        elif process_unknown_layers and nazov_vrstvy not in podporovane_objekty:
+            logging.debug(f"Spracuvavam objekt {nazov_vrstvy} {objekt_id}")
+            zaciatok = time.perf_counter()
+            if nazov_vrstvy in liniove_objekty:
+                objekt = data.INE_LINIE(atributy, nazov_vrstvy, krok_obluku)
+            else:
+                objekt = data.INE_BODY(atributy, nazov_vrstvy)
 
-    logging.info("**************** ZACIATOK KONVERZIE ***********************")
-    logging.info(f'CAS {time.strftime("%a, %d %b %Y %H:%M:%S")}')
+            for row in raw_objekt["riadky"]:
+                try:
+                    objekt.pridaj_riadok(row)
+                except data.NepodporovanaVeta:
+                    if isinstance(objekt, data.INE_LINIE):
+                        logging.warning(f"Nespracovany riadok: {row}")
+                    else:
+                        objekt = data.INE_LINIE(atributy, nazov_vrstvy, krok_obluku)
+                        for row in raw_objekt["riadky"]:
+                            try:
+                                objekt.pridaj_riadok(row)
+                            except data.NepodporovanaVeta:
+                                logging.warning(f"Nespracovany riadok: {row}")
+                        break
+            if isinstance(objekt, data.INE_LINIE):
+                liniove_objekty.add(nazov_vrstvy)
+            else:
+                bodove_objekty.add(nazov_vrstvy)
+            parsovanie = time.perf_counter()
+            objekt_data = objekt.data()
+            metriky.pridaj_objekt(objekt, objekt_data, parsovanie - zaciatok, time.perf_counter() - parsovanie)
+        else:
+            logging.debug(f"Vynechavam objekt {nazov_vrstvy} {objekt_id}\n")
+            continue
+
+        yield objekt_id, objekt_data
+
+
+def spracuj_cast_suboru(file_path: Path, index: IndexObjektov, atributy: dict, krok_obluku: Optional[tuple]) -> tuple:
+    """Spracuje cast objektov suboru danu indexom, vola sa v samostatnom procese. Vrati data objektov, metriky
+    a varovania"""
+    citac = io.Citac(file_path)
+    metriky = Metriky()
+    vysledky = []
+    with zachytavaj_varovania() as varovania:
+        for raw_objekt in metriky.citaj(io.CitacObjektov(citac, index=index)):
+            objekt_id = id_objektu(raw_objekt)
+            logging.debug(f"Spracuvavam objekt {raw_objekt['meno_vrstvy']} {objekt_id}")
+            vysledky.append((objekt_id, spracuj_objekt(raw_objekt, atributy, metriky, krok_obluku)))
+    metriky.precitane_bajty = citac.precitane_bajty()
+    citac.zavriet()
+    return vysledky, metriky, varovania
+
+
+def spracuj_paralelne(file_path: Path, index: IndexObjektov, filter_objektov: io.FilterObjektov, atributy: dict,
+                      krok_obluku: Optional[tuple], jobs: int, metriky: Metriky, varovania: list):
+    """Rozdeli objekty suboru na casti na hraniciach objektov a spracuje ich vo viacerych procesoch. Data objektov
+    vracia v povodnom poradi, takze vystup je rovnaky ako pri postupnom spracovani. Varovania procesov prida do
+    varovania"""
+    if not index.ukonceny:
+        logging.error("Chyba koncova veta")
+    casti = index.rozdel(index.objekty(filter_objektov), jobs * 4)
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        for vysledky, metriky_casti, varovania_casti in executor.map(spracuj_cast_suboru, repeat(file_path), casti,
+                                                                     repeat(atributy), repeat(krok_obluku)):
+            metriky.zluc(metriky_casti)
+            varovania.extend(varovania_casti)
+            yield from vysledky
+
+
+def process_files(file_path: Path, layers: dict, output_directory: Path, output_format: str = 'sql-copy',
+                  layer_config: str = '', process_unknown_layers: bool = False,
+                  ku: Optional[Iterable] = None, bbox: Optional[tuple] = None, jobs: int = 1,
+                  arc_step: Optional[str] = None, loader=None, batch_size: Optional[int] = None,
+                  shared_output=None, sinks: Optional[Iterable[OutputSink]] = None) -> ConversionResult:
+    """Skonvertuje VGI subor. Ak su zadane vystupy (sinks), subor sa precita raz a kazdy objekt sa zapise do vsetkych
+    vystupov, output_format a output_directory sa potom nepouziju. Vrati vysledok konverzie s metrikami a varovaniami,
+    ak sa subor neda skonvertovat, vyvola ConversionError. Konfiguraciu logovania ani prostredie procesu nemeni, takze
+    sa da volat opakovane aj z viacerych vlakien"""
+    metriky = Metriky()
+    zapisovace = []
+    with zachytavaj_varovania() as varovania:
+        logging.info("**************** ZACIATOK KONVERZIE ***********************")
+        logging.info(f'CAS {time.strftime("%a, %d %b %Y %H:%M:%S")}')
+
+        # otvor vstupny subor
+        logging.info(f'NAZOV SUBORU: {str(file_path)}')
+        try:
+            vstup = io.Citac(file_path)
+        except io.MedzeraVNazveSuboru as vstupny_subor:
+            raise InvalidInputError(f"Vstup {vstupny_subor} obsahuje medzeru v nazve suboru")
+        except io.NieJeSubor as vstupny_subor:
+            raise InvalidInputError(f"Vstup {vstupny_subor} nie je subor")
+        except io.ZlyTypSuboru as vstupny_subor:
+            raise InvalidInputError(f"Vstup {vstupny_subor} nie je vgi subor")
 
-    # otvor vstupny subor
-    logging.info(f'NAZOV SUBORU: {str(file_path)}')
+        try:
+            vynechany = konvertuj_subor(vstup, file_path, layers, output_directory, output_format, layer_config,
+                                        process_unknown_layers, ku, bbox, jobs, arc_step, loader, batch_size,
+                                        shared_output, sinks, metriky, zapisovace, varovania)
+        except BaseException:
+            # vystupy neuspesnej konverzie sa zahodia, ciastocne zapisane objekty sa nesmu dostat do vystupu
+            for zapisovac in zapisovace:
+                with contextlib.suppress(Exception):
+                    zapisovac.zahod()
+            raise
+        finally:
+            vstup.zavriet()
+    return ConversionResult(file_path, metriky, tuple(varovania), vynechany)
+
+
+def konvertuj_subor(vstup: io.Citac, file_path: Path, layers: dict, output_directory: Path, output_format: str,
+                    layer_config: str, process_unknown_layers: bool, ku: Optional[Iterable], bbox: Optional[tuple],
+                    jobs: int, arc_step: Optional[str], loader, batch_size: Optional[int],
+                    shared_output, sinks: Optional[Iterable[OutputSink]],
+                    metriky: Metriky, zapisovace: list, varovania: list) -> bool:
+    """Konverzia otvoreneho suboru pre process_files. Metriky zapisuje do metriky, vytvorene zapisovace pridava do
+    zapisovace. Vrati True, ak bol subor vynechany"""
+    metriky.subory = 1
+    zaciatok = time.perf_counter()
     try:
-        vstup = io.Citac(file_path)
-    except io.MedzeraVNazveSuboru as vstupny_subor:
-        logging.error(f"Vstup {vstupny_subor} obsahuje medzeru v nazve suboru")
-        sys.exit(2)
-    except io.NieJeSubor as vstupny_subor:
-        logging.error(f"Vstup {vstupny_subor} nie je subor")
-        sys.exit(2)
-    except io.ZlyTypSuboru as vstupny_subor:
-        logging.error(f"Vstup {vstupny_subor} nie je vgi subor")
-        sys.exit(2)
-
-    if output_directory.is_file():
-        logging.error(f"'{str(output_directory)}' nie je platnym adresarom")
-        sys.exit(2)
-    else:
-        output_directory.mkdir(parents=True, exist_ok=True)
+        krok_obluku = data.krok_obluku(arc_step)
+    except ValueError as chyba:
+        raise InvalidSettingsError(str(chyba))
+
+    if sinks is None:
+        sinks = [OutputSink(output_format, output_directory)]
+    for sink in sinks:
+        if sink.output_directory.is_file():
+            raise InvalidSettingsError(f"'{str(sink.output_directory)}' nie je platnym adresarom")
+        else:
+            sink.output_directory.mkdir(parents=True, exist_ok=True)
 
     # ktore vrstvy v ktorom type nas zaujimaju
     objects_selection = {'KN': ('KATUZ', 'KLADPAR', 'LINIE', 'POPIS', 'ZAPPAR', 'ZUOB', 'ZNACKY'),
@@ -137,8 +348,7 @@ def process_files(file_path: Path, layers: dict, output_directory: Path, output_
                         if process_unknown_layers:
                             logging.warning(f"Neznamy typ suboru {atributy.get('TYP')}")
                         else:
-                            logging.error(f"Neznamy typ suboru {atributy.get('TYP')}")
-                            sys.exit(2)
+                            raise InvalidInputError(f"Neznamy typ suboru {atributy.get('TYP')}")
 
                     try:
                         if int(atributy['KU']) < 800000 or int(atributy['KU']) > 999999:
@@ -149,6 +359,16 @@ def process_files(file_path: Path, layers: dict, output_directory: Path, output_
                 vstup.spat(1)
                 break
 
+        # vrstvy, KU a obdlznik, ktore nas zaujimaju, sa filtruju uz pri citani objektov
+        vybrane_vrstvy = None
+        if not process_unknown_layers:
+            vybrane_vrstvy = [v for v in layers.values() if v in objects_selection.get(atributy.get('TYP'), ())]
+        filter_objektov = io.FilterObjektov(vrstvy=vybrane_vrstvy, ku=ku, bbox=bbox)
+        if not filter_objektov.prijima_ku(atributy.get('KU', '')):
+            logging.info(f"Vynechavam subor, KU {atributy.get('KU')} nie je medzi vybranymi KU")
+            metriky.trvanie = time.perf_counter() - zaciatok
+            return True
+
         # konverzia datumu z textovej hodnoty atributu AKTUAL na hodnotu pouzitelnu pre datovy typ OFTDateTime
         try:
             aktual = datetime.datetime.strptime(atributy.get('AKTUAL'), "%d.%m.%Y %H:%M:%S")
@@ -159,113 +379,105 @@ def process_files(file_path: Path, layers: dict, output_directory: Path, output_
 
         # citaj subor
         nazov_suboru = file_path.stem
-        zapisovac = data.Zapisovac(nazov_suboru, str(output_directory), output_format, nazvy_vrstiev=layers,
-                                   nastavenia_vrstvy=layer_config)
+        for sink in sinks:
+            # vrstvy vystupu podla nazvov vrstiev v datach objektov (kn_kladpar, ...)
+            vrstvy_vystupu = None
+            if sink.layers is not None:
+                vrstvy_vystupu = {getattr(data, v).nazov_vrstvy for v in sink.layers}
+            # v GeoPackage sa objekty suboru nahradia iba vo vybranych vrstvach, pri neznamych vrstvach vo vsetkych
+            nahradzane_vrstvy = None
+            if vybrane_vrstvy is not None:
+                nahradzane_vrstvy = [getattr(data, v).nazov_vrstvy for v in vybrane_vrstvy
+                                     if sink.layers is None or v in sink.layers]
+            zapisovace.append(data.Zapisovac(nazov_suboru, str(sink.output_directory), sink.output_format,
+                                             nazvy_vrstiev=layers, nastavenia_vrstvy=layer_config, nahravac=loader,
+                                             subor=file_path.name, nahradzane_vrstvy=nahradzane_vrstvy,
+                                             velkost_davky=batch_size, spolocny_vystup=shared_output,
+                                             vrstvy=vrstvy_vystupu))
         poc_objektov = 0
+        poc_otoceni = {'skusane': 0, 'pouzite': 0}
 
         bodove_objekty = set()
         liniove_objekty = set()
-        raw_objekty = io.CitacObjektov(vstup)
-        for idx, raw_objekt in enumerate(raw_objekty):
-            # rozhodnem sa ci objekt spracovavam alebo nie
-            while not raw_objekt['riadky'][0].startswith('&'): # this was not here...
-                raw_objekt['riadky'].pop(0)
-            objekt_id = raw_objekt['riadky'][0].split(' ')[2]
-            nazov_vrstvy = raw_objekt["meno_vrstvy"]
-
-            if nazov_vrstvy in layers.values() and nazov_vrstvy in objects_selection.get(atributy.get('TYP'), ()):
-                logging.debug(f"Spracuvavam objekt {nazov_vrstvy} {objekt_id}")
-                objekt = objekt_vrstvy(nazov_vrstvy, atributy)
-                for row in raw_objekt["riadky"]:
-                    try:
-                        objekt.pridaj_riadok(row)
-                    except data.NepodporovanaVeta:
-                        logging.warning(f"Nespracovany riadok: {row}")
-                objekt_data = objekt.data()
-
-                if objekt_data.get("pocet_uzatvoreni", 0) > 0:
-                    logging.debug("Skusam otocit objekt")
-                    otoceny_objekt = objekt_vrstvy(nazov_vrstvy, atributy)
-                    for row in raw_objekty.posun_skoky():
-                        otoceny_objekt.pridaj_riadok(row)
-                    otoceny_objekt_data = otoceny_objekt.data()
-
-                    if otoceny_objekt_data["pocet_uzatvoreni"] < objekt_data["pocet_uzatvoreni"]:
-                        logging.debug("Vyberam otoceny objekt")
-                        objekt_data = otoceny_objekt_data
-
-            elif process_unknown_layers and nazov_vrstvy not in podporovane_objekty:
-                logging.debug(f"Spracuvavam objekt {nazov_vrstvy} {objekt_id}")
-                if nazov_vrstvy in liniove_objekty:
-                    objekt = data.INE_LINIE(atributy, nazov_vrstvy)
-                else:
-                    objekt = data.INE_BODY(atributy, nazov_vrstvy)
-
-                for row in raw_objekt["riadky"]:
-                    try:
-                        objekt.pridaj_riadok(row)
-                    except data.NepodporovanaVeta:
-                        if isinstance(objekt, data.INE_LINIE):
-                            logging.warning(f"Nespracovany riadok: {row}")
-                        else:
-                            objekt = data.INE_LINIE(atributy, nazov_vrstvy)
-                            for row in raw_objekt["riadky"]:
-                                try:
-                                    objekt.pridaj_riadok(row)
-                                except data.NepodporovanaVeta:
-                                    logging.warning(f"Nespracovany riadok: {row}")
-                            break
-                if isinstance(objekt, data.INE_LINIE):
-                    liniove_objekty.add(nazov_vrstvy)
-                else:
-                    bodove_objekty.add(nazov_vrstvy)
-                objekt_data = objekt.data()
-            else:
-                logging.debug(f"Vynechavam objekt {nazov_vrstvy} {objekt_id}\n")
-                continue
+        # objekty, ktore neprejdu filtrom, sa preskocia pomocou indexu suboru bez citania
+        index = IndexObjektov.pre_subor(file_path, vstup)
+        if jobs > 1 and not process_unknown_layers:
+            objekty = spracuj_paralelne(file_path, index, filter_objektov, atributy, krok_obluku, jobs, metriky,
+                                        varovania)
+        else:
+            raw_objekty = io.CitacObjektov(vstup, index=index, filter=filter_objektov)
+            objekty = spracuj_serialne(raw_objekty, atributy, layers, objects_selection.get(atributy.get('TYP'), ()),
+                                       process_unknown_layers, podporovane_objekty, bodove_objekty, liniove_objekty,
+                                       metriky, krok_obluku)
 
+        for objekt_id, objekt_data in objekty:
             for bodovy_objekt in bodove_objekty:
                 if bodovy_objekt in liniove_objekty:
-                    logging.error("Niektore bodove objekty boli ulozene ako liniove.\n")
-                    sys.exit(2)
+                    raise ConversionError("Niektore bodove objekty boli ulozene ako liniove")
 
             for sprava in objekt_data['spravy']:
                 logging.info(sprava)
 
+            if 'otocenie' in objekt_data:
+                poc_otoceni['skusane'] += 1
+                if objekt_data['otocenie'] == 'pouzite':
+                    poc_otoceni['pouzite'] += 1
+
             if objekt_data.get('geometricke_objekty'):
                 logging.debug("Ukladam objekt\n")
-                zapisovac.uloz(objekt_data)
+                for zapisovac, sink in zip(zapisovace, sinks):
+                    zaciatok_zapisu = time.perf_counter()
+                    zapisovac.uloz(objekt_data)
+                    metriky.pridaj_zapis(sink.output_format, objekt_data['meta']['nazov_vrstvy'],
+                                         time.perf_counter() - zaciatok_zapisu)
                 poc_objektov = poc_objektov + 1
             else:
                 logging.warning(f"Objekt {objekt_id} neobsahuje platnu geometriu, vynechavam jeho ulozenie")
 
+        for zapisovac, sink in zip(zapisovace, sinks):
+            zaciatok_zatvorenia = time.perf_counter()
+            zapisovac.zatvor()
+            metriky.pridaj_zatvorenie(sink.output_format, time.perf_counter() - zaciatok_zatvorenia)
+        metriky.objekty = poc_objektov
+        metriky.precitane_bajty += vstup.precitane_bajty()
+        metriky.trvanie = time.perf_counter() - zaciatok
+
         # vypis pocet objektov v spracovavanej vrstve VGI suboru
         if poc_objektov > 0:
             logging.info(f"POCET OBJEKTOV: {poc_objektov:d}")
         else:
             logging.error("POCET OBJEKTOV: 0")
+        if poc_otoceni['skusane']:
+            logging.info(f"POSUN SKOKOV: skusany pri {poc_otoceni['skusane']:d} objektoch, "
+                         f"pouzity pri {poc_otoceni['pouzite']:d}")
+        logging.info(f"PRECITANE: {vstup.precitane_bajty() / 1048576:.2f} MB, {vstup.rychlost():.2f} MB/s")
+        logging.info(f"ETAPY: {metriky.text()}")
 
     except io.ChybaKoncovaVeta:
-        logging.error("Chyba koncova veta")
-        sys.exit(2)
+        raise InvalidInputError("Chyba koncova veta")
     logging.info("***************** KONIEC KONVERZIE ************************")
+    return False
 
 
 def main():
     # spracuj prepinace
     volby = {
         'file_path': None,
-        'layers': {k: v[0] for k, v in KNOWN_LAYERS.items() if k in ('t', 'k', 'l', 'p', 'r', 'n', 'z',)},
+        'layers': {k: v[0] for k, v in KNOWN_LAYERS.items() if k in KN_LAYERS},
         'output_directory': Path(__file__).parents[1] / 'data' / 'sql_g',
         'output_format': 'sql-copy',
         'layer_config': '',
         'process_unknown_layers': False,
-        'debug': False,
     }
+    configure_logging(debug=False)
 
     for f in (Path(__file__).parents[1] / 'data' / 'vgi').rglob('KN*.vgi'):
         volby['file_path'] = f
-        process_files(**volby)
+        try:
+            process_files(**volby)
+        except ConversionError as chyba:
+            logging.error(chyba)
+            sys.exit(2)
 
 
 if __name__ == "__main__":
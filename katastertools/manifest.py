@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Manifest vstupnych suborov pre opakovanu konverziu. Pre kazdy vstupny subor uchovava hash obsahu, verziu nastroja,
+nastavenia konverzie a zoznam vystupov. Subor sa konvertuje znova iba vtedy, ak sa niektora z tychto hodnot zmenila
+alebo ak niektory z jeho vystupov chyba.
+"""
+import os
+import json
+import hashlib
+from pathlib import Path
+
+from katastertools import __VERSION__
+
+
+def hash_suboru(subor: Path, velkost_bloku: int = 1 << 20) -> str:
+    h = hashlib.sha256()
+    with open(subor, 'rb') as f:
+        for blok in iter(lambda: f.read(velkost_bloku), b''):
+            h.update(blok)
+    return h.hexdigest()
+
+
+class Manifest:
+    """Zaznamy vstupnych suborov ulozene v JSON subore. Cesty su relativne k hlavnemu adresaru"""
+    verzia_formatu = 1
+
+    def __init__(self, nazov_suboru: Path, adresar: Path):
+        self.nazov_suboru = nazov_suboru
+        self.adresar = adresar
+        self.subory = {}
+        # vstupne subory, ktorych vystupy patria k aktualnej konverzii
+        self.pouzite = set()
+        try:
+            with open(nazov_suboru, 'r') as f:
+                obsah = json.load(f)
+            if obsah.get('verzia_formatu') == self.verzia_formatu:
+                self.subory = obsah['subory']
+        except (OSError, ValueError, KeyError):
+            self.subory = {}
+
+    def __kluc(self, subor: Path) -> str:
+        return os.path.relpath(subor, self.adresar)
+
+    def zaznam(self, subor: Path, nastavenia: dict) -> dict:
+        """Vytvori zaznam suboru s aktualnym hashom, verziou a nastaveniami"""
+        return {
+            'hash': hash_suboru(subor),
+            'verzia': __VERSION__,
+            # cez JSON, aby sa dal porovnat so zaznamom nacitanym zo suboru
+            'nastavenia': json.loads(json.dumps(nastavenia, sort_keys=True, default=str)),
+        }
+
+    def aktualny(self, subor: Path, zaznam: dict) -> bool:
+        """Vrati True, ak subor netreba konvertovat, lebo jeho vystupy z predchadzajucej konverzie su platne"""
+        predchadzajuci = self.subory.get(self.__kluc(subor))
+        if predchadzajuci is None:
+            return False
+        if any(predchadzajuci.get(k) != v for k, v in zaznam.items()):
+            return False
+        if not all((self.adresar / vystup).exists() for vystup in predchadzajuci['vystupy']):
+            return False
+        self.pouzite.add(self.__kluc(subor))
+        return True
+
+    def zabudni(self, subor: Path) -> list:
+        """Odstrani zaznam suboru a vrati jeho povodne vystupy"""
+        predchadzajuci = self.subory.pop(self.__kluc(subor), None)
+        return [self.adresar / vystup for vystup in predchadzajuci['vystupy']] if predchadzajuci else []
+
+    def zaznamenaj(self, subor: Path, zaznam: dict, vystupy: list):
+        kluc = self.__kluc(subor)
+        self.subory[kluc] = dict(zaznam, vystupy=[self.__kluc(vystup) for vystup in vystupy])
+        self.pouzite.add(kluc)
+
+    def odstran_nepouzite(self) -> list:
+        """Odstrani zaznamy suborov, ktore sa v aktualnej konverzii nepouzili (napr. uz nie su vo vstupnom adresari
+        alebo patria k inym vrstvam), a vrati ich vystupy"""
+        vystupy = []
+        for kluc in [k for k in self.subory if k not in self.pouzite]:
+            vystupy.extend(self.adresar / vystup for vystup in self.subory.pop(kluc)['vystupy'])
+        return vystupy
+
+    def vymaz(self):
+        self.subory = {}
+        self.pouzite = set()
+
+    def uloz(self):
+        docasny = self.nazov_suboru.with_name(self.nazov_suboru.name + '.tmp')
+        with open(docasny, 'w') as f:
+            json.dump({'verzia_formatu': self.verzia_formatu, 'subory': self.subory}, f, indent=1, sort_keys=True)
+        os.replace(docasny, self.nazov_suboru)
+
+# vim: set ts=4 sts=4 sw=4 noet:
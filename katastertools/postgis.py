@@ -0,0 +1,173 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Priame nahravanie dat Katastra do PostgreSQL/PostGIS pomocou COPY FROM STDIN. Davky (jedna tabulka jedneho KU,
+resp. VGI suboru) sa nahravaju paralelne cez maly pool spojeni, kazda davka v samostatnej transakcii.
+
+Vyzaduje balik psycopg (verzia 3) s pool-om: pip install "psycopg[binary,pool]"
+"""
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+
+class ChybaNahravania(Exception):
+    pass
+
+
+def _psycopg():
+    try:
+        import psycopg
+        from psycopg import sql
+        from psycopg_pool import ConnectionPool, PoolTimeout
+    except ImportError:
+        raise ChybaNahravania('Priame nahravanie do PostgreSQL vyzaduje balik psycopg[pool] (verzia 3)')
+    return psycopg, sql, ConnectionPool, PoolTimeout
+
+
+class Nahravac:
+    """Nahrava davky riadkov do tabuliek cez COPY FROM STDIN. Graficke udaje sa posielaju v binarnom formate
+    (geometria ako EWKB), popisne ako text, ktory server prevedie rovnako ako hodnoty v prikazoch INSERT.
+    Kazda davka je samostatna transakcia, chyba jednej davky vrati spat iba tuto davku"""
+    cakanie_na_spojenie = 30
+    # pocet davok na spojenie, ktore mozu cakat v pamati, dalsia davka caka, kym sa niektora nenahra
+    davok_na_spojenie = 2
+
+    def __init__(self, dsn: str, pocet_spojeni: int = 4):
+        self.psycopg, self.sql, ConnectionPool, PoolTimeout = _psycopg()
+        self.pool = ConnectionPool(dsn, min_size=1, max_size=pocet_spojeni, open=True)
+        try:
+            self.pool.wait(timeout=self.cakanie_na_spojenie)
+        except PoolTimeout:
+            self.pool.close()
+            raise ChybaNahravania(f'Nepodarilo sa pripojit k databaze do {self.cakanie_na_spojenie} s')
+        self.executor = ThreadPoolExecutor(max_workers=pocet_spojeni)
+        self.volne_davky = threading.BoundedSemaphore(self.davok_na_spojenie * pocet_spojeni)
+        self.davky = []
+        self.chyby = []
+        # tabulka -> [pocet riadkov, cas nahravania v sekundach]
+        self.statistika = {}
+        self.typy_stlpcov = {}
+        self.zamok = threading.Lock()
+        self.zaciatok = time.perf_counter()
+
+    def nahraj(self, schema: str, tabulka: str, stlpce: list, riadky: list, binarne: bool = False):
+        """Zaradi davku riadkov na nahratie a vrati jej future. V binarnom rezime su hodnoty riadkov Python objekty
+        (int, float, str, datetime, bytes pre geometriu), v textovom rezime retazce v tvare pre PostgreSQL. Ak uz
+        caka vela davok, pocka, kym sa niektora nenahra, takze v pamati nie su riadky vsetkych suborov naraz"""
+        self.volne_davky.acquire()
+        try:
+            davka = self.executor.submit(self._nahraj_davku, schema, tabulka, list(stlpce), riadky, binarne)
+        except BaseException:
+            self.volne_davky.release()
+            raise
+        davka.add_done_callback(lambda _: self.volne_davky.release())
+        self.davky.append((f'{schema}.{tabulka}', davka))
+        return davka
+
+    def vykonaj(self, prikazy: list, po: list = (), search_path: str = None):
+        """Vykona SQL prikazy v jednej transakcii az po uspesnom nahrati zadanych davok"""
+        davka = self.executor.submit(self._vykonaj, prikazy, list(po), search_path)
+        self.davky.append(('SQL', davka))
+        return davka
+
+    def cakaj(self) -> list:
+        """Pocka na dokoncenie vsetkych davok a vrati zoznam chyb v tvare (popis davky, vynimka)"""
+        for popis, davka in self.davky:
+            chyba = davka.exception()
+            if chyba is not None:
+                self.chyby.append((popis, chyba))
+        self.davky = []
+        return self.chyby
+
+    def zatvor(self):
+        self.executor.shutdown(wait=True)
+        self.pool.close()
+
+    def trvanie(self) -> float:
+        return time.perf_counter() - self.zaciatok
+
+    def _typy(self, spojenie, schema: str, tabulka: str, stlpce: list) -> tuple:
+        """Vrati OID typov pre binarny COPY a prevodniky hodnot pre dane stlpce tabulky. Geometria sa posiela ako
+        bytea, binarny vstup typu geometry je EWKB"""
+        kluc = (schema, tabulka)
+        with self.zamok:
+            typy = self.typy_stlpcov.get(kluc)
+        if typy is None:
+            regclass = self.sql.Identifier(schema, tabulka).as_string(spojenie)
+            riadky = spojenie.execute("SELECT attname, atttypid, atttypid::regtype::text FROM pg_attribute "
+                                      "WHERE attrelid = %s::regclass AND attnum > 0 AND NOT attisdropped",
+                                      (regclass,)).fetchall()
+            typy = {nazov: (oid, nazov_typu) for nazov, oid, nazov_typu in riadky}
+            with self.zamok:
+                self.typy_stlpcov[kluc] = typy
+
+        bytea = self.psycopg.adapters.types['bytea'].oid
+        oidy = []
+        prevodniky = []
+        for stlpec in stlpce:
+            if stlpec not in typy:
+                raise ChybaNahravania(f'Tabulka {schema}.{tabulka} nema stlpec {stlpec}')
+            oid, nazov_typu = typy[stlpec]
+            if nazov_typu == 'geometry':
+                oid = bytea
+            oidy.append(oid)
+            prevodniky.append(_prevodnik_typu(nazov_typu, spojenie.info.timezone))
+        return oidy, prevodniky
+
+    def _nahraj_davku(self, schema: str, tabulka: str, stlpce: list, riadky: list, binarne: bool):
+        zaciatok = time.perf_counter()
+        sql = self.sql
+        prikaz = sql.SQL('COPY {} ({}) FROM STDIN').format(sql.Identifier(schema, tabulka),
+                                                           sql.SQL(', ').join(map(sql.Identifier, stlpce)))
+        with self.pool.connection() as spojenie:
+            if binarne:
+                oidy, prevodniky = self._typy(spojenie, schema, tabulka, stlpce)
+                prikaz += sql.SQL(' (FORMAT BINARY)')
+            with spojenie.transaction():
+                with spojenie.cursor() as kurzor:
+                    with kurzor.copy(prikaz) as copy:
+                        if binarne:
+                            copy.set_types(oidy)
+                            for riadok in riadky:
+                                copy.write_row([None if hodnota is None else prevod(hodnota)
+                                                for prevod, hodnota in zip(prevodniky, riadok)])
+                        else:
+                            for riadok in riadky:
+                                copy.write_row(riadok)
+
+        trvanie = time.perf_counter() - zaciatok
+        with self.zamok:
+            statistika = self.statistika.setdefault(f'{schema}.{tabulka}', [0, 0.0])
+            statistika[0] += len(riadky)
+            statistika[1] += trvanie
+
+    def _vykonaj(self, prikazy: list, po: list, search_path: str):
+        # davky, na ktore sa caka, boli zaradene skor, takze cakanie nemoze zablokovat vsetky vlakna
+        for davka in po:
+            if davka.exception() is not None:
+                raise ChybaNahravania('Preskocene, davka, od ktorej prikazy zavisia, sa nenahrala')
+        with self.pool.connection() as spojenie:
+            with spojenie.transaction():
+                if search_path:
+                    spojenie.execute(f'SET LOCAL search_path TO {search_path}')
+                for prikaz in prikazy:
+                    spojenie.execute(prikaz)
+
+
+def _prevodnik_typu(nazov_typu: str, casove_pasmo):
+    """Funkcia, ktora prevedie hodnotu na Python typ zodpovedajuci binarnemu formatu stlpca"""
+    if nazov_typu in ('integer', 'smallint', 'bigint'):
+        return int
+    if nazov_typu in ('real', 'double precision'):
+        return float
+    if nazov_typu == 'numeric':
+        return lambda hodnota: Decimal(str(hodnota))
+    if nazov_typu == 'timestamp with time zone':
+        # cas bez pasma server interpretuje v pasme spojenia, rovnako ako text v COPY
+        return lambda hodnota: hodnota if hodnota.tzinfo else hodnota.replace(tzinfo=casove_pasmo)
+    if nazov_typu == 'geometry':
+        return bytes
+    return str
+
+# vim: set ts=4 sts=4 sw=4 noet:
@@ -0,0 +1,417 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Generate a synthetic corpus of cadastral exchange files for load testing. For every cadastral unit (KU) a KN, UO and
+BJ VGI file and an FPU file with matching parcels, ownership sheets and owners are written into <directory>/vgi and
+<directory>/fpu, the layout expected by kt_sql. The corpus is deterministic for the given options.
+
+The VGI files contain objects of all known layers (KATUZ, KLADPAR, LINIE, POPIS, ZAPPAR, ZNACKY, ZUOB in KN, KATUZ,
+ZAPPAR, UOV, ZUOB in UO and KATUZ, BPEJ in BJ) with jumps (NL, NC, NR), arcs (R), texts (&T), symbols, records
+continued on tab-indented lines and optionally malformed records. Malformed records in objects of point layers (POPIS,
+ZNACKY) are lines, which the converter rejects with a warning, in other objects they are records the parser does not
+recognise and skips without a warning. FPU records may be split over several lines and malformed records contain
+control characters, both are handled by kt_vycisti_fuvi.
+
+USAGE: python -m katastertools.utils.corpus --directory <directory> [--ku-count N] [--parcels N] ...
+"""
+import math
+import random
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
+
+import click
+
+FIRST_KU = 800001
+# cadastral units are laid out in a grid of this many columns
+KU_COLUMNS = 60
+CELL = 30
+Y0, X0 = 260000, 1150000
+AKTUAL = '01.02.2020 10:11:12'
+
+LOCAL_NAMES = ('Pod hájom', 'Za humnami', 'Dolné lúky', 'Stredné pole', 'Kopanice', 'Šibeničný vrch', 'Žabí potok')
+FIRST_NAMES = ('Ján', 'Mária', 'Peter', 'Katarína', 'Jozef', 'Zuzana', 'Štefan', 'Anna')
+SURNAMES = ('Novák', 'Kováčová', 'Horváth', 'Vargová', 'Tóth', 'Nagyová', 'Baláž', 'Šimková')
+TOWNS = ('Bratislava', 'Košice', 'Žilina', 'Nitra', 'Banská Bystrica', 'Prešov', 'Trnava', 'Trenčín')
+LAND_TYPES = (2, 3, 4, 5, 6, 7, 10, 11, 13, 14)
+# layers of point objects, the converter rejects line records in their objects
+POINT_LAYERS = ('POPIS', 'ZNACKY')
+
+
+class CorpusSettings(NamedTuple):
+    parcels: int = 2000
+    vertices: int = 12
+    arc_ratio: float = 0.1
+    hole_ratio: float = 0.05
+    malformed_rate: float = 0.0
+    continuation_rate: float = 0.02
+    # parcel counts of cadastral units vary randomly by this fraction of parcels
+    size_variation: float = 0.0
+    seed: int = 1
+
+
+DEFAULTS = CorpusSettings()
+
+
+class KuLayout(NamedTuple):
+    ku: int
+    parcels: int
+    columns: int
+    y: float
+    x: float
+
+    @property
+    def side(self) -> float:
+        return self.columns * CELL
+
+    def cell(self, i: int) -> tuple:
+        return self.y + (i % self.columns) * CELL, self.x + (i // self.columns) * CELL
+
+
+def point(y: float, x: float) -> str:
+    return f'{y:.2f} {x:.2f}'
+
+
+def rectangle(y: float, x: float, a: float, b: float, vertices: int) -> list:
+    """Points of a rectangle starting in y, x with the given number of vertices, the last point closes the ring"""
+    vertices = max(vertices, 4)
+    points = []
+    for side, (y1, x1, y2, x2) in enumerate(((y, x, y + a, x), (y + a, x, y + a, x + b), (y + a, x + b, y, x + b),
+                                              (y, x + b, y, x))):
+        count = vertices // 4 + (1 if side < vertices % 4 else 0)
+        points.extend((y1 + (y2 - y1) * i / count, x1 + (x2 - x1) * i / count) for i in range(count))
+    points.append(points[0])
+    return points
+
+
+def ring_records(points: list, first: str, arc: bool = False, k: str = '') -> list:
+    """Records of a ring. With arc the last segment is drawn as an arc, its middle point bulges out of the ring"""
+    records = [f'{first} {point(*points[0])}']
+    if arc:
+        (y1, x1), (y2, x2) = points[-2], points[-1]
+        middle = ((y1 + y2) / 2 - abs(x2 - x1) / 4, (x1 + x2) / 2 - abs(y2 - y1) / 4)
+        records += [f'L {point(*p)}' for p in points[1:-1]] + [f'R {point(*middle)}', f'R {point(*points[-1])}']
+    else:
+        records += [f'L {point(*p)}' for p in points[1:]]
+    if k:
+        records[len(records) // 2] += f' K={k}'
+    return records
+
+
+class VgiWriter:
+    """Writes records of one VGI file in cp1250 with CRLF line ends. Records are randomly continued on a tab-indented
+    line and followed by malformed records, see malformed"""
+
+    def __init__(self, path: Path, settings: CorpusSettings, rng: random.Random):
+        self.file = open(path, 'w', encoding='cp1250', newline='')
+        self.settings = settings
+        self.rng = rng
+        self.in_objects = False
+        self.layer = None
+        self.records = 0
+
+    def write(self, records):
+        rng = self.rng
+        for record in records:
+            if record.startswith('&O'):
+                self.in_objects = True
+                self.layer = record.split(' ', 2)[1]
+            if self.in_objects and record.count(' ') > 1 and rng.random() < self.settings.continuation_rate:
+                head, tail = record.rsplit(' ', 1)
+                record = f'{head}\r\n\t{tail}'
+            self.file.write(record + '\r\n')
+            self.records += 1
+            if self.in_objects and rng.random() < self.settings.malformed_rate:
+                self.file.write(self.malformed() + '\r\n')
+                self.records += 1
+
+    def malformed(self) -> str:
+        """A line record in objects of point layers, the converter rejects it with a warning (Nespracovany riadok).
+        Elsewhere a record the parser does not recognise, it is skipped without a warning"""
+        rng = self.rng
+        y, x = Y0 + rng.random() * 1000, X0 + rng.random() * 1000
+        if self.layer in POINT_LAYERS:
+            return f'L {point(y, x)}'
+        return rng.choice((
+            f'L {y:.2f}',
+            f'L {y:.2f}x {x:.2f}',
+            f'Q {point(y, x)}',
+            '&A PARCIS',
+            f'&T {point(y, x)} text without quotes',
+        ))
+
+    def end(self):
+        self.file.write('&K\r\n')
+        self.records += 1
+
+    def close(self):
+        self.file.close()
+
+
+def header(file_type: str, layout: KuLayout) -> list:
+    return [f'&V {file_type}{layout.ku} 2 1 {layout.y:.0f} {layout.x:.0f} synthetic',
+            f'&R {point(layout.y - CELL, layout.x - CELL)} {point(layout.y + layout.side, layout.x + layout.side)}',
+            f'&B AKTUAL={AKTUAL}',
+            f'&B NAZOV=KU {layout.ku}']
+
+
+def boundary(layout: KuLayout, rng: random.Random) -> list:
+    """KATUZ drawn in segments, every segment starts with a jump to the end of the previous one and the sides have
+    different K"""
+    side = layout.side + 2 * 10
+    points = rectangle(layout.y - 10, layout.x - 10, side, side, max(int(side / 10), 4))
+    records = ['&O KATUZ 1', f'&A KU={layout.ku}', f'&A HKU=KU {layout.ku}']
+    segment = 25
+    for start in range(0, len(points) - 1, segment):
+        k = 1 + 4 * start // len(points)
+        lines = [f'L {point(*p)}' for p in points[start + 1:start + segment + 1]]
+        if start:
+            # K changes on the first line of the segment, the jump stays in the line of the previous one
+            lines[0] += f' K={k}'
+            records.append(f'{rng.choice(("NL", "NL", "NC", "NR"))} {point(*points[start])}')
+        else:
+            records.append(f'&L P {point(*points[0])} K={k}')
+        records += lines
+    return records
+
+
+def parcel_number(i: int) -> tuple:
+    return i + 1, i % 4
+
+
+def parcels(layout: KuLayout, layer: str, count: int, settings: CorpusSettings, rng: random.Random):
+    """Objects of parcels (KLADPAR or UOV) in the cells of the grid with numbers (&T) and land use symbols"""
+    step = max(layout.parcels // count, 1)
+    for n in range(count):
+        y, x = layout.cell(n * step)
+        stem, suffix = parcel_number(n)
+        if layer == 'UOV':
+            number = f'{1 + n % 3}-{stem}.{suffix}'
+            attribute = 'UO'
+        else:
+            number = f'{stem}.{suffix}'
+            attribute = 'PARCIS'
+        records = [f'&O {layer} {n + 1}', f'&A {attribute}={number}']
+        records += ring_records(rectangle(y, x, 20, 24, settings.vertices), '&L P', rng.random() < settings.arc_ratio,
+                                str(rng.randint(1, 3)))
+        if rng.random() < settings.hole_ratio:
+            records += ring_records(rectangle(y + 5, x + 5, 6, 6, 8), rng.choice(('NL', 'NC')))
+        text = f'{stem}/{suffix}' if suffix else f'{stem}'
+        records.append(f"&T {point(y + 10, x + 12)} '{text}' H=2 U=0.00")
+        if layer == 'KLADPAR' and n % 3 == 0:
+            records.append(f'&L P {point(y + 4, x + 4)} S={rng.randint(1, 30)} U=0.00 M=1')
+        yield records
+
+
+def lines(layout: KuLayout, layer: str, every: int, rng: random.Random):
+    """Lines along the cells, in the middle the line jumps to a parallel part with a different K"""
+    for n, i in enumerate(range(0, layout.parcels, every)):
+        y, x = layout.cell(i)
+        y, x = y - 3, x - 3
+        records = [f'&O {layer} {n + 1}', f'&L P {point(y, x)} K=1']
+        records += [f'L {point(y + j * 3, x + rng.random())}' for j in range(1, 6)]
+        records += [f'C {point(y + 18, x)}', f'NL {point(y, x + 10)}']
+        records += [f'L {point(y + j * 3, x + 10 + rng.random())}' for j in range(1, 6)]
+        records[-5] += ' K=2'
+        yield records
+
+
+def kn_objects(layout: KuLayout, settings: CorpusSettings, rng: random.Random):
+    yield boundary(layout, rng)
+    yield from parcels(layout, 'KLADPAR', layout.parcels, settings, rng)
+    yield from lines(layout, 'LINIE', 20, rng)
+    yield from lines(layout, 'ZAPPAR', 30, rng)
+    for n, i in enumerate(range(0, layout.parcels, 50)):
+        y, x = layout.cell(i)
+        yield [f'&O POPIS {n + 1}', f"&T {point(y + 15, x + 2)} '{rng.choice(LOCAL_NAMES)}' H=3 U=12.50 K=2 F=2"]
+    for n, i in enumerate(range(0, layout.parcels, 7)):
+        y, x = layout.cell(i)
+        yield [f'&O ZNACKY {n + 1}', f'P {point(y + 25, x + 27)} S={rng.randint(1, 60)} U=0.00 M=1']
+    yield ['&O ZUOB 1'] + ring_records(rectangle(layout.y, layout.x, layout.side / 2, layout.side / 2, 40), '&L P')
+
+
+def uo_objects(layout: KuLayout, settings: CorpusSettings, rng: random.Random):
+    yield boundary(layout, rng)
+    yield from parcels(layout, 'UOV', uo_parcels(layout), settings, rng)
+    yield from lines(layout, 'ZAPPAR', 60, rng)
+    yield ['&O ZUOB 1'] + ring_records(rectangle(layout.y, layout.x, layout.side / 2, layout.side / 2, 40), '&L P')
+
+
+def bj_objects(layout: KuLayout, settings: CorpusSettings, rng: random.Random):
+    """BPEJ areas of 4 x 4 cells, every one with a hole"""
+    yield boundary(layout, rng)
+    blocks = math.ceil(layout.columns / 4)
+    side = 4 * CELL
+    for n in range(blocks * blocks):
+        y, x = layout.y + (n % blocks) * side, layout.x + (n // blocks) * side
+        records = [f'&O BPEJ {n + 1}', f'&A BJ={rng.randint(0, 9999999):07d}']
+        records += ring_records(rectangle(y, x, side - 10, side - 10, settings.vertices * 4), '&L P',
+                                rng.random() < settings.arc_ratio)
+        records += ring_records(rectangle(y + 50, x + 50, 40, 40, 8), 'NL')
+        yield records
+
+
+def uo_parcels(layout: KuLayout) -> int:
+    return max(layout.parcels // 2, 1)
+
+
+def write_vgi(path: Path, file_type: str, objects, layout: KuLayout, settings: CorpusSettings,
+              rng: random.Random) -> int:
+    writer = VgiWriter(path, settings, rng)
+    try:
+        writer.write(header(file_type, layout))
+        for records in objects(layout, settings, rng):
+            writer.write(records)
+        writer.end()
+    finally:
+        writer.close()
+    return writer.records
+
+
+class FpuWriter:
+    """Writes an FPU file in IBM852. Records are randomly split over two lines and malformed records contain control
+    characters"""
+
+    def __init__(self, path: Path, settings: CorpusSettings, rng: random.Random):
+        self.file = open(path, 'w', encoding='IBM852', newline='')
+        self.settings = settings
+        self.rng = rng
+        self.records = 0
+
+    def key(self, name: str, value: str):
+        self.file.write(f'.{name} {value}\r\n')
+
+    def group(self, name: str, columns: tuple, rows):
+        self.key('SKUPINA', f'KN-{name}')
+        self.key('POLOZKY', ''.join(f'{column};' for column in columns))
+        rng = self.rng
+        for row in rows:
+            record = ''.join(f'{value};' for value in row)
+            if rng.random() < self.settings.malformed_rate:
+                position = rng.randrange(len(record))
+                record = record[:position] + '\x07' + record[position:]
+            if rng.random() < self.settings.continuation_rate:
+                # a record continues on the next line until a line ends with a semicolon
+                position = record.index(';')
+                record = record[:position] + '\r\n' + record[position:]
+            self.file.write(record + '\r\n')
+            self.records += 1
+        self.file.write('\r\n')
+
+    def close(self):
+        self.file.close()
+
+
+def write_fpu(path: Path, layout: KuLayout, settings: CorpusSettings, rng: random.Random) -> int:
+    """Ownership sheets (LV), owners (VL) and parcels of registers C (PA) and E (EP) matching the VGI parcels"""
+    sheets = max(layout.parcels // 5, 1)
+    writer = FpuWriter(path, settings, rng)
+    try:
+        writer.key('KATASTRALNE_UZEMIE', str(layout.ku))
+        writer.key('DATUM', AKTUAL.split()[0])
+        writer.group('LV', ('CLV', 'PSV', 'KPV', 'PVZ', 'CRC'),
+                     ((clv, 1 + clv % 3, 1, 1, rng.randint(0, 99999)) for clv in range(1, sheets + 1)))
+        writer.group('VL', ('CLV', 'PCS', 'CIT', 'MEN', 'PVZ', 'KPV', 'VLA', 'TVL', 'PRI', 'MNO', 'ULC', 'CPO', 'MST',
+                            'PSC', 'CRC'), owners(sheets, rng))
+        writer.group('PA', ('CPA', 'VYM', 'KVV', 'DRP', 'DON', 'PKK', 'MSS', 'CLV', 'KPV', 'UMP', 'PVZ', 'CAS', 'CRC'),
+                     ((cpa(n), 480, 1, rng.choice(LAND_TYPES), 0, 0, 0, 1 + n % sheets, 1, 1 + n % 2, 1,
+                       AKTUAL.split()[0], rng.randint(0, 99999)) for n in range(layout.parcels)))
+        writer.group('EP', ('CPA', 'CPU', 'VYM', 'KVV', 'DRP', 'DON', 'PKK', 'MSS', 'CLV', 'KPV', 'UMP', 'PVZ', 'CAS',
+                            'CRC'),
+                     ((cpa(n), 1 + n % 3, 480, 1, rng.choice(LAND_TYPES), 0, 0, 0, 1 + n % sheets, 1, 1 + n % 2, 1,
+                       AKTUAL.split()[0], rng.randint(0, 99999)) for n in range(uo_parcels(layout))))
+    finally:
+        writer.close()
+    return writer.records
+
+
+def owners(sheets: int, rng: random.Random):
+    for clv in range(1, sheets + 1):
+        for pcs in range(1, 1 + clv % 3 + 1):
+            first, surname = rng.choice(FIRST_NAMES), rng.choice(SURNAMES)
+            yield (clv, pcs, 1, pcs + 1, 1, 1, f'{surname} {first}', 1, surname, first,
+                   f'Hlavná {rng.randint(1, 200)}', str(rng.randint(1, 2000)), rng.choice(TOWNS),
+                   f'{rng.randint(80000, 99999):05d}', rng.randint(0, 99999))
+
+
+def cpa(n: int) -> int:
+    """Number of the parcel in FPU, its parckey matches the parckey of the VGI parcel"""
+    stem, suffix = parcel_number(n)
+    return stem * 10000 + suffix * 10
+
+
+def ku_layout(index: int, settings: CorpusSettings) -> KuLayout:
+    ku = FIRST_KU + index
+    count = settings.parcels
+    if settings.size_variation:
+        rng = random.Random(f'{settings.seed}-{ku}-size')
+        count = max(int(count * (1 + rng.uniform(-settings.size_variation, settings.size_variation))), 1)
+    columns = int(count ** 0.5) + 1
+    # the cells of the largest cadastral unit
+    spacing = (int((settings.parcels * (1 + settings.size_variation)) ** 0.5) + 2) * CELL + 100
+    return KuLayout(ku, count, columns, Y0 + (index % KU_COLUMNS) * spacing, X0 + (index // KU_COLUMNS) * spacing)
+
+
+def generate_ku(directory: Path, index: int, settings: CorpusSettings) -> dict:
+    """Writes the files of one cadastral unit and returns the number of written records by file"""
+    layout = ku_layout(index, settings)
+    records = {}
+    for file_type, objects in (('KN', kn_objects), ('UO', uo_objects), ('BJ', bj_objects)):
+        path = directory / 'vgi' / f'{file_type}{layout.ku}.vgi'
+        records[path] = write_vgi(path, file_type, objects, layout, settings,
+                                  random.Random(f'{settings.seed}-{layout.ku}-{file_type}'))
+    path = directory / 'fpu' / f'{layout.ku}.FPU'
+    records[path] = write_fpu(path, layout, settings, random.Random(f'{settings.seed}-{layout.ku}-FPU'))
+    return records
+
+
+def generate(directory: Path, ku_count: int = 1, settings: CorpusSettings = DEFAULTS, workers: int = 1) -> dict:
+    """Writes the corpus and returns the number of written records by file"""
+    (directory / 'vgi').mkdir(parents=True, exist_ok=True)
+    (directory / 'fpu').mkdir(parents=True, exist_ok=True)
+    records = {}
+    if workers <= 1:
+        for index in range(ku_count):
+            records.update(generate_ku(directory, index, settings))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(generate_ku, directory, index, settings) for index in range(ku_count)]
+            for future in futures:
+                records.update(future.result())
+    return records
+
+
+@click.command()
+@click.option('--directory', help='Output directory, files are written into its vgi and fpu subdirectories',
+              type=click.Path(file_okay=False), required=True)
+@click.option('--ku-count', help='Number of cadastral units, about 3600 for the whole country',
+              type=click.IntRange(min=1), default=1, show_default=True)
+@click.option('--parcels', help='Parcels of register C in one cadastral unit, register E has half of them',
+              type=click.IntRange(min=1), default=DEFAULTS.parcels, show_default=True)
+@click.option('--vertices', help='Vertices of a parcel', type=click.IntRange(min=4),
+              default=DEFAULTS.vertices, show_default=True)
+@click.option('--arc-ratio', help='Fraction of parcels and BPEJ areas with an arc (R records)',
+              type=click.FloatRange(0, 1), default=DEFAULTS.arc_ratio, show_default=True)
+@click.option('--hole-ratio', help='Fraction of parcels with a hole', type=click.FloatRange(0, 1),
+              default=DEFAULTS.hole_ratio, show_default=True)
+@click.option('--malformed-rate', help='Probability of a malformed record after every record',
+              type=click.FloatRange(0, 1), default=DEFAULTS.malformed_rate, show_default=True)
+@click.option('--continuation-rate', help='Probability of a record continued on the next line',
+              type=click.FloatRange(0, 1), default=DEFAULTS.continuation_rate, show_default=True)
+@click.option('--size-variation', help='Parcel counts of cadastral units vary randomly by this fraction',
+              type=click.FloatRange(0, 0.99), default=DEFAULTS.size_variation, show_default=True)
+@click.option('--seed', help='Seed of the random generator', type=int, default=DEFAULTS.seed,
+              show_default=True)
+@click.option('--workers', help='Number of processes writing cadastral units in parallel',
+              type=click.IntRange(min=1), default=1, show_default=True)
+def main(directory: str, ku_count: int, parcels: int, vertices: int, arc_ratio: float, hole_ratio: float,
+         malformed_rate: float, continuation_rate: float, size_variation: float, seed: int, workers: int):
+    settings = CorpusSettings(parcels, vertices, arc_ratio, hole_ratio, malformed_rate, continuation_rate,
+                              size_variation, seed)
+    records = generate(Path(directory), ku_count, settings, workers)
+    size = sum(path.stat().st_size for path in records)
+    print(f'{len(records)} files, {sum(records.values())} records, {size / 1048576:.1f} MB written into {directory}')
+
+
+if __name__ == '__main__':
+    main()
@@ -30,14 +30,19 @@ setup(
     url='https://github.com/imincik/kataster-import',
 
     package_dir={'katastertools': 'katastertools'},
-    packages=find_packages(),
+    packages=find_packages(exclude=['benchmarks']),
     package_data={'katastertools': ['sql/*.sql']},
-    setup_requires=['GDAL', 'dbf', 'click'],
+    install_requires=['dbf', 'click'],
+    # GDAL is needed only for the shp, dgn, gpkg and fgb outputs
+    extras_require={'ogr': ['GDAL'],
+                    'postgis': ['psycopg[binary,pool]>=3.1'],
+                    'parquet': ['pyarrow>=13', 'pyproj']},
     entry_points={'console_scripts': ['kt_vgi2shp=katastertools.kt_vgi2shp:main',
                                       'kt_import_dbf2=katastertools.kt_import_dbf2:main',
                                       'kt_import_fuvi=katastertools.kt_import_fuvi:main',
                                       'kt_vycisti_fuvi=katastertools.kt_vycisti_fuvi:main',
                                       'kt_vytvor_db=katastertools.kt_vytvor_db:main',
+                                      'kt_daemon=katastertools.kt_daemon:start',
                                       'kt_sql=katastertools.kt_sql']},
 
     classifiers=classifiers
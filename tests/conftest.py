@@ -0,0 +1,26 @@
+"""
+Shared fixtures of the regression tests. The tests run on a small synthetic corpus written by
+katastertools.utils.corpus with a fixed seed, so every run sees exactly the same VGI and FPU files.
+"""
+from pathlib import Path
+
+import pytest
+
+# the golden outputs in tests/data were produced from the corpus of these settings, a change of the settings or of the
+# generator needs new golden outputs (KATASTER_UPDATE_GOLDEN=1 python -m pytest tests)
+CORPUS_KU_COUNT = 1
+CORPUS_SETTINGS = dict(parcels=24, arc_ratio=0.3, hole_ratio=0.25, malformed_rate=0.05, continuation_rate=0.05,
+                       seed=5)
+
+
+@pytest.fixture(scope='session')
+def corpus(tmp_path_factory) -> Path:
+    """Directory with the vgi and fpu subdirectories of the regression corpus. Tests which write into the directory
+    have to work on a copy"""
+    # the generator is a click command, without click it cannot be imported
+    pytest.importorskip('click')
+    from katastertools.utils import corpus as generator
+
+    directory = tmp_path_factory.mktemp('corpus')
+    generator.generate(directory, CORPUS_KU_COUNT, generator.CorpusSettings(**CORPUS_SETTINGS))
+    return directory
@@ -0,0 +1,9 @@
+SET client_encoding = 'UTF8';
+BEGIN;
+COPY "kataster"."kn_bpej" ("geom", "o_id", "ku", "bj", "stav_k", "subor") FROM STDIN;
+01060000208A15000001000000010300000002000000310000000000000000BD0FC100000000308C31C1C3F5285C49BD0FC100000000308C31C13D0AD7A392BD0FC100000000308C31C100000000DCBD0FC100000000308C31C1C3F5285C25BE0FC100000000308C31C13D0AD7A36EBE0FC100000000308C31C100000000B8BE0FC100000000308C31C1C3F5285C01BF0FC100000000308C31C13D0AD7A34ABF0FC100000000308C31C10000000094BF0FC100000000308C31C1C3F5285CDDBF0FC100000000308C31C13D0AD7A326C00FC100000000308C31C10000000070C00FC100000000308C31C10000000070C00FC1B81E852B398C31C10000000070C00FC148E17A54428C31C10000000070C00FC1000000804B8C31C10000000070C00FC1B81E85AB548C31C10000000070C00FC148E17AD45D8C31C10000000070C00FC100000000678C31C10000000070C00FC1B81E852B708C31C10000000070C00FC148E17A54798C31C10000000070C00FC100000080828C31C10000000070C00FC1B81E85AB8B8C31C10000000070C00FC148E17AD4948C31C10000000070C00FC1000000009E8C31C13D0AD7A326C00FC1000000009E8C31C1C3F5285CDDBF0FC1000000009E8C31C10000000094BF0FC1000000009E8C31C13D0AD7A34ABF0FC1000000009E8C31C1C3F5285C01BF0FC1000000009E8C31C100000000B8BE0FC1000000009E8C31C13D0AD7A36EBE0FC1000000009E8C31C1C3F5285C25BE0FC1000000009E8C31C100000000DCBD0FC1000000009E8C31C13D0AD7A392BD0FC1000000009E8C31C1C3F5285C49BD0FC1000000009E8C31C10000000000BD0FC1000000009E8C31C10000000000BD0FC148E17AD4948C31C10000000000BD0FC1B81E85AB8B8C31C10000000000BD0FC100000080828C31C10000000000BD0FC148E17A54798C31C10000000000BD0FC1B81E852B708C31C10000000000BD0FC100000000678C31C10000000000BD0FC148E17AD45D8C31C10000000000BD0FC1B81E85AB548C31C10000000000BD0FC1000000804B8C31C10000000000BD0FC148E17A54428C31C10000000000BD0FC1B81E852B398C31C10000000000BD0FC100000000308C31C1090000000000000090BE0FC100000000628C31C10000000090BE0FC100000000768C31C10000000090BE0FC1000000008A8C31C10000000030BF0FC1000000008A8C31C100000000D0BF0FC1000000008A8C31C100000000D0BF0FC100000000768C31C100000000D0BF0FC100000000628C31C10000000030BF0FC100000000628C31C10000000090BE0FC100000000628C31C1	1	800001	6143925	2020-02-01 10:11:12+01	BJ800001.vgi
+01060000208A150000010000000103000000020000003100000000000000C0C00FC100000000308C31C1C3F5285C09C10FC100000000308C31C13D0AD7A352C10FC100000000308C31C1000000009CC10FC100000000308C31C1C3F5285CE5C10FC100000000308C31C13D0AD7A32EC20FC100000000308C31C10000000078C20FC100000000308C31C1C3F5285CC1C20FC100000000308C31C13D0AD7A30AC30FC100000000308C31C10000000054C30FC100000000308C31C1C3F5285C9DC30FC100000000308C31C13D0AD7A3E6C30FC100000000308C31C10000000030C40FC100000000308C31C10000000030C40FC1B81E852B398C31C10000000030C40FC148E17A54428C31C10000000030C40FC1000000804B8C31C10000000030C40FC1B81E85AB548C31C10000000030C40FC148E17AD45D8C31C10000000030C40FC100000000678C31C10000000030C40FC1B81E852B708C31C10000000030C40FC148E17A54798C31C10000000030C40FC100000080828C31C10000000030C40FC1B81E85AB8B8C31C10000000030C40FC148E17AD4948C31C10000000030C40FC1000000009E8C31C13D0AD7A3E6C30FC1000000009E8C31C1C3F5285C9DC30FC1000000009E8C31C10000000054C30FC1000000009E8C31C13D0AD7A30AC30FC1000000009E8C31C1C3F5285CC1C20FC1000000009E8C31C10000000078C20FC1000000009E8C31C13D0AD7A32EC20FC1000000009E8C31C1C3F5285CE5C10FC1000000009E8C31C1000000009CC10FC1000000009E8C31C13D0AD7A352C10FC1000000009E8C31C1C3F5285C09C10FC1000000009E8C31C100000000C0C00FC1000000009E8C31C100000000C0C00FC148E17AD4948C31C100000000C0C00FC1B81E85AB8B8C31C100000000C0C00FC100000080828C31C100000000C0C00FC148E17A54798C31C100000000C0C00FC1B81E852B708C31C100000000C0C00FC100000000678C31C100000000C0C00FC148E17AD45D8C31C100000000C0C00FC1B81E85AB548C31C100000000C0C00FC1000000804B8C31C100000000C0C00FC148E17A54428C31C100000000C0C00FC1B81E852B398C31C100000000C0C00FC100000000308C31C1090000000000000050C20FC100000000628C31C10000000050C20FC100000000768C31C10000000050C20FC1000000008A8C31C100000000F0C20FC1000000008A8C31C10000000090C30FC1000000008A8C31C10000000090C30FC100000000768C31C10000000090C30FC100000000628C31C100000000F0C20FC100000000628C31C10000000050C20FC100000000628C31C1	2	800001	5178694	2020-02-01 10:11:12+01	BJ800001.vgi
+01060000208A15000001000000010300000002000000310000000000000000BD0FC100000000A88C31C1C3F5285C49BD0FC100000000A88C31C13D0AD7A392BD0FC100000000A88C31C100000000DCBD0FC100000000A88C31C1C3F5285C25BE0FC100000000A88C31C13D0AD7A36EBE0FC100000000A88C31C100000000B8BE0FC100000000A88C31C1C3F5285C01BF0FC100000000A88C31C13D0AD7A34ABF0FC100000000A88C31C10000000094BF0FC100000000A88C31C1C3F5285CDDBF0FC100000000A88C31C13D0AD7A326C00FC100000000A88C31C10000000070C00FC100000000A88C31C10000000070C00FC1B81E852BB18C31C10000000070C00FC148E17A54BA8C31C10000000070C00FC100000080C38C31C10000000070C00FC1B81E85ABCC8C31C10000000070C00FC148E17AD4D58C31C10000000070C00FC100000000DF8C31C10000000070C00FC1B81E852BE88C31C10000000070C00FC148E17A54F18C31C10000000070C00FC100000080FA8C31C10000000070C00FC1B81E85AB038D31C10000000070C00FC148E17AD40C8D31C10000000070C00FC100000000168D31C13D0AD7A326C00FC100000000168D31C1C3F5285CDDBF0FC100000000168D31C10000000094BF0FC100000000168D31C13D0AD7A34ABF0FC100000000168D31C1C3F5285C01BF0FC100000000168D31C100000000B8BE0FC100000000168D31C13D0AD7A36EBE0FC100000000168D31C1C3F5285C25BE0FC100000000168D31C100000000DCBD0FC100000000168D31C13D0AD7A392BD0FC100000000168D31C1C3F5285C49BD0FC100000000168D31C10000000000BD0FC100000000168D31C10000000000BD0FC148E17AD40C8D31C10000000000BD0FC1B81E85AB038D31C10000000000BD0FC100000080FA8C31C10000000000BD0FC148E17A54F18C31C10000000000BD0FC1B81E852BE88C31C10000000000BD0FC100000000DF8C31C10000000000BD0FC148E17AD4D58C31C10000000000BD0FC1B81E85ABCC8C31C10000000000BD0FC100000080C38C31C10000000000BD0FC148E17A54BA8C31C10000000000BD0FC1B81E852BB18C31C10000000000BD0FC100000000A88C31C1090000000000000090BE0FC100000000DA8C31C10000000090BE0FC100000000EE8C31C10000000090BE0FC100000000028D31C10000000030BF0FC100000000028D31C100000000D0BF0FC100000000028D31C100000000D0BF0FC100000000EE8C31C100000000D0BF0FC100000000DA8C31C10000000030BF0FC100000000DA8C31C10000000090BE0FC100000000DA8C31C1	3	800001	1186192	2020-02-01 10:11:12+01	BJ800001.vgi
+01060000208A150000010000000103000000020000003100000000000000C0C00FC100000000A88C31C1C3F5285C09C10FC100000000A88C31C13D0AD7A352C10FC100000000A88C31C1000000009CC10FC100000000A88C31C1C3F5285CE5C10FC100000000A88C31C13D0AD7A32EC20FC100000000A88C31C10000000078C20FC100000000A88C31C1C3F5285CC1C20FC100000000A88C31C13D0AD7A30AC30FC100000000A88C31C10000000054C30FC100000000A88C31C1C3F5285C9DC30FC100000000A88C31C13D0AD7A3E6C30FC100000000A88C31C10000000030C40FC100000000A88C31C10000000030C40FC1B81E852BB18C31C10000000030C40FC148E17A54BA8C31C10000000030C40FC100000080C38C31C10000000030C40FC1B81E85ABCC8C31C10000000030C40FC148E17AD4D58C31C10000000030C40FC100000000DF8C31C10000000030C40FC1B81E852BE88C31C10000000030C40FC148E17A54F18C31C10000000030C40FC100000080FA8C31C10000000030C40FC1B81E85AB038D31C10000000030C40FC148E17AD40C8D31C10000000030C40FC100000000168D31C13D0AD7A3E6C30FC100000000168D31C1C3F5285C9DC30FC100000000168D31C10000000054C30FC100000000168D31C13D0AD7A30AC30FC100000000168D31C1C3F5285CC1C20FC100000000168D31C10000000078C20FC100000000168D31C13D0AD7A32EC20FC100000000168D31C1C3F5285CE5C10FC100000000168D31C1000000009CC10FC100000000168D31C13D0AD7A352C10FC100000000168D31C1C3F5285C09C10FC100000000168D31C100000000C0C00FC100000000168D31C100000000C0C00FC148E17AD40C8D31C100000000C0C00FC1B81E85AB038D31C100000000C0C00FC100000080FA8C31C100000000C0C00FC148E17A54F18C31C100000000C0C00FC1B81E852BE88C31C100000000C0C00FC100000000DF8C31C100000000C0C00FC148E17AD4D58C31C100000000C0C00FC1B81E85ABCC8C31C100000000C0C00FC100000080C38C31C100000000C0C00FC148E17A54BA8C31C100000000C0C00FC1B81E852BB18C31C100000000C0C00FC100000000A88C31C1090000000000000050C20FC100000000DA8C31C10000000050C20FC100000000EE8C31C10000000050C20FC100000000028D31C100000000F0C20FC100000000028D31C10000000090C30FC100000000028D31C10000000090C30FC100000000EE8C31C10000000090C30FC100000000DA8C31C100000000F0C20FC100000000DA8C31C10000000050C20FC100000000DA8C31C1	4	800001	7346334	2020-02-01 10:11:12+01	BJ800001.vgi
+\.
+COMMIT;
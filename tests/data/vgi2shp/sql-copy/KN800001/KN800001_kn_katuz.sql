@@ -0,0 +1,6 @@
+SET client_encoding = 'UTF8';
+BEGIN;
+COPY "kataster"."kn_katuz" ("geom", "o_id", "ku", "ku_cislo", "ku_nazov", "g_k", "stav_k", "subor") FROM STDIN;
+01050000208A1500000100000001020000001200000000000000B0BC0FC100000000268C31C100000000C0BD0FC100000000268C31C100000000D0BE0FC100000000268C31C100000000E0BF0FC100000000268C31C100000000F0C00FC100000000268C31C10000000000C20FC100000000268C31C10000000000C20FC100000080508C31C10000000000C20FC1000000007B8C31C10000000000C20FC100000080A58C31C10000000000C20FC100000000D08C31C100000000ACC00FC100000000D08C31C10000000058BF0FC100000000D08C31C10000000004BE0FC100000000D08C31C100000000B0BC0FC100000000D08C31C100000000B0BC0FC100000080A58C31C100000000B0BC0FC1000000007B8C31C100000000B0BC0FC100000080508C31C100000000B0BC0FC100000000268C31C1	1	800001	800001	KU 800001	1	2020-02-01 10:11:12+01	KN800001.vgi
+\.
+COMMIT;
@@ -0,0 +1,9 @@
+SET client_encoding = 'UTF8';
+BEGIN;
+COPY "kataster"."kn_linie" ("geom", "o_id", "ku", "g_k", "stav_k", "subor") FROM STDIN;
+01050000208A1500000200000001020000000700000000000000E8BC0FC1000000002D8C31C10000000000BD0FC1C3F5281C2D8C31C10000000018BD0FC1666666A62D8C31C10000000030BD0FC19A9999192D8C31C10000000048BD0FC1D7A370FD2D8C31C10000000060BD0FC152B81E452D8C31C10000000078BD0FC1000000002D8C31C101020000000200000000000000E8BC0FC100000000378C31C10000000000BD0FC1CDCCCC0C378C31C1	1	800001	1	2020-02-01 10:11:12+01	KN800001.vgi
+01050000208A150000010000000102000000050000000000000000BD0FC1CDCCCC0C378C31C10000000018BD0FC114AE4721378C31C10000000030BD0FC1A4703D0A378C31C10000000048BD0FC11F85EB51378C31C10000000060BD0FC1CDCCCC4C378C31C1	1	800001	2	2020-02-01 10:11:12+01	KN800001.vgi
+01050000208A1500000200000001020000000700000000000000E8BC0FC100000000A58C31C10000000000BD0FC15C8FC2B5A58C31C10000000018BD0FC114AE4761A58C31C10000000030BD0FC11F85EB51A58C31C10000000048BD0FC1295C8F02A58C31C10000000060BD0FC1CDCCCCCCA58C31C10000000078BD0FC100000000A58C31C101020000000200000000000000E8BC0FC100000000AF8C31C10000000000BD0FC1D7A3707DAF8C31C1	2	800001	1	2020-02-01 10:11:12+01	KN800001.vgi
+01050000208A150000010000000102000000050000000000000000BD0FC1D7A3707DAF8C31C10000000018BD0FC19A999999AF8C31C10000000030BD0FC133333333AF8C31C10000000048BD0FC1C3F5289CAF8C31C10000000060BD0FC17B14AE07AF8C31C1	2	800001	2	2020-02-01 10:11:12+01	KN800001.vgi
+\.
+COMMIT;
@@ -0,0 +1,6 @@
+SET client_encoding = 'UTF8';
+BEGIN;
+COPY "kataster"."kn_popis" ("geom", "o_id", "ku", "text", "g_k", "g_u", "g_h", "g_f", "g_d", "stav_k", "subor") FROM STDIN;
+01010000208A1500000000000078BD0FC100000000328C31C1	1	800001	Pod hájom	2	12.5	3.0	2	1	2020-02-01 10:11:12+01	KN800001.vgi
+\.
+COMMIT;
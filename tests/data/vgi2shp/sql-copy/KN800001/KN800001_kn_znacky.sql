@@ -0,0 +1,9 @@
+SET client_encoding = 'UTF8';
+BEGIN;
+COPY "kataster"."kn_znacky" ("geom", "o_id", "ku", "g_s", "g_u", "g_m", "stav_k", "subor") FROM STDIN;
+01010000208A15000000000000C8BD0FC1000000004B8C31C1	1	800001	1	0.0	1.0	2020-02-01 10:11:12+01	KN800001.vgi
+01010000208A15000000000000A8BF0FC100000000698C31C1	2	800001	6	0.0	1.0	2020-02-01 10:11:12+01	KN800001.vgi
+01010000208A1500000000000088C10FC100000000878C31C1	3	800001	49	0.0	1.0	2020-02-01 10:11:12+01	KN800001.vgi
+01010000208A15000000000000B8BE0FC100000000C38C31C1	4	800001	22	0.0	1.0	2020-02-01 10:11:12+01	KN800001.vgi
+\.
+COMMIT;
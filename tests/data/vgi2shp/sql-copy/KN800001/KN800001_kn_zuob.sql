@@ -0,0 +1,6 @@
+SET client_encoding = 'UTF8';
+BEGIN;
+COPY "kataster"."kn_zuob" ("geom", "o_id", "ku", "stav_k", "subor") FROM STDIN;
+01060000208A15000001000000010300000001000000290000000000000000BD0FC100000000308C31C1000000003CBD0FC100000000308C31C10000000078BD0FC100000000308C31C100000000B4BD0FC100000000308C31C100000000F0BD0FC100000000308C31C1000000002CBE0FC100000000308C31C10000000068BE0FC100000000308C31C100000000A4BE0FC100000000308C31C100000000E0BE0FC100000000308C31C1000000001CBF0FC100000000308C31C10000000058BF0FC100000000308C31C10000000058BF0FC100000080378C31C10000000058BF0FC1000000003F8C31C10000000058BF0FC100000080468C31C10000000058BF0FC1000000004E8C31C10000000058BF0FC100000080558C31C10000000058BF0FC1000000005D8C31C10000000058BF0FC100000080648C31C10000000058BF0FC1000000006C8C31C10000000058BF0FC100000080738C31C10000000058BF0FC1000000007B8C31C1000000001CBF0FC1000000007B8C31C100000000E0BE0FC1000000007B8C31C100000000A4BE0FC1000000007B8C31C10000000068BE0FC1000000007B8C31C1000000002CBE0FC1000000007B8C31C100000000F0BD0FC1000000007B8C31C100000000B4BD0FC1000000007B8C31C10000000078BD0FC1000000007B8C31C1000000003CBD0FC1000000007B8C31C10000000000BD0FC1000000007B8C31C10000000000BD0FC100000080738C31C10000000000BD0FC1000000006C8C31C10000000000BD0FC100000080648C31C10000000000BD0FC1000000005D8C31C10000000000BD0FC100000080558C31C10000000000BD0FC1000000004E8C31C10000000000BD0FC100000080468C31C10000000000BD0FC1000000003F8C31C10000000000BD0FC100000080378C31C10000000000BD0FC100000000308C31C1	1	800001	2020-02-01 10:11:12+01	KN800001.vgi
+\.
+COMMIT;
@@ -0,0 +1,17 @@
+SET client_encoding = 'UTF8';
+BEGIN;
+COPY "kataster"."kn_uov" ("geom", "o_id", "ku", "parckey", "parcela", "kmen", "podlomenie", "t", "stav_k", "subor") FROM STDIN;
+01060000208A150000010000000103000000020000000D0000000000000000BD0FC100000000308C31C1C3F5285C35BD0FC100000000308C31C13D0AD7A36ABD0FC100000000308C31C100000000A0BD0FC100000000308C31C100000000A0BD0FC100000000388C31C100000000A0BD0FC100000000408C31C100000000A0BD0FC100000000488C31C13D0AD7A36ABD0FC100000000488C31C1C3F5285C35BD0FC100000000488C31C10000000000BD0FC100000000488C31C10000000000BD0FC100000000408C31C10000000000BD0FC100000000388C31C10000000000BD0FC100000000308C31C1090000000000000028BD0FC100000000358C31C10000000028BD0FC100000000388C31C10000000028BD0FC1000000003B8C31C10000000040BD0FC1000000003B8C31C10000000058BD0FC1000000003B8C31C10000000058BD0FC100000000388C31C10000000058BD0FC100000000358C31C10000000040BD0FC100000000358C31C10000000028BD0FC100000000358C31C1	1	800001	80000101000010000	1-1	1	0	-260010.00;-1150012.00;2.0;0.00	2020-02-01 10:11:12+01	UO800001.vgi
+01060000208A150000010000000103000000010000000E00000000000000E0BE0FC100000000308C31C1C3F5285C15BF0FC100000000308C31C13D0AD7A34ABF0FC100000000308C31C10000000080BF0FC100000000308C31C10000000080BF0FC100000000388C31C10000000080BF0FC100000000408C31C10000000080BF0FC100000000488C31C13D0AD7A34ABF0FC100000000488C31C1C3F5285C15BF0FC100000000488C31C100000000E0BE0FC100000000488C31C100000000E0BE0FC100000000408C31C100000000E0BE0FC100000000388C31C100000000D0BE0FC100000000348C31C100000000E0BE0FC100000000308C31C1	2	800001	80000102000020010	2-2/1	2	1	-260070.00;-1150012.00;2.0;0.00	2020-02-01 10:11:12+01	UO800001.vgi
+01060000208A150000010000000103000000010000000E00000000000000C0C00FC100000000308C31C1C3F5285CF5C00FC100000000308C31C13D0AD7A32AC10FC100000000308C31C10000000060C10FC100000000308C31C10000000060C10FC100000000388C31C10000000060C10FC100000000408C31C10000000060C10FC100000000488C31C13D0AD7A32AC10FC100000000488C31C1C3F5285CF5C00FC100000000488C31C100000000C0C00FC100000000488C31C100000000C0C00FC100000000408C31C100000000C0C00FC100000000388C31C100000000B0C00FC100000000348C31C100000000C0C00FC100000000308C31C1	3	800001	80000103000030020	3-3/2	3	2	-260130.00;-1150012.00;2.0;0.00	2020-02-01 10:11:12+01	UO800001.vgi
+01060000208A150000010000000103000000010000000E00000000000000F0BD0FC1000000004E8C31C1C3F5285C25BE0FC1000000004E8C31C13D0AD7A35ABE0FC1000000004E8C31C10000000090BE0FC1000000004E8C31C10000000090BE0FC100000000568C31C10000000090BE0FC1000000005E8C31C10000000090BE0FC100000000668C31C13D0AD7A35ABE0FC100000000668C31C1C3F5285C25BE0FC100000000668C31C100000000F0BD0FC100000000668C31C100000000F0BD0FC1000000005E8C31C100000000F0BD0FC100000000568C31C100000000E0BD0FC100000000528C31C100000000F0BD0FC1000000004E8C31C1	4	800001	80000101000040030	1-4/3	4	3	-260040.00;-1150042.00;2.0;0.00	2020-02-01 10:11:12+01	UO800001.vgi
+01060000208A150000010000000103000000010000000D00000000000000D0BF0FC1000000004E8C31C1C3F5285C05C00FC1000000004E8C31C13D0AD7A33AC00FC1000000004E8C31C10000000070C00FC1000000004E8C31C10000000070C00FC100000000568C31C10000000070C00FC1000000005E8C31C10000000070C00FC100000000668C31C13D0AD7A33AC00FC100000000668C31C1C3F5285C05C00FC100000000668C31C100000000D0BF0FC100000000668C31C100000000D0BF0FC1000000005E8C31C100000000D0BF0FC100000000568C31C100000000D0BF0FC1000000004E8C31C1	5	800001	80000102000050000	2-5	5	0	-260100.00;-1150042.00;2.0;0.00	2020-02-01 10:11:12+01	UO800001.vgi
+01060000208A150000010000000103000000010000000E0000000000000000BD0FC1000000006C8C31C1C3F5285C35BD0FC1000000006C8C31C13D0AD7A36ABD0FC1000000006C8C31C100000000A0BD0FC1000000006C8C31C100000000A0BD0FC100000000748C31C100000000A0BD0FC1000000007C8C31C100000000A0BD0FC100000000848C31C13D0AD7A36ABD0FC100000000848C31C1C3F5285C35BD0FC100000000848C31C10000000000BD0FC100000000848C31C10000000000BD0FC1000000007C8C31C10000000000BD0FC100000000748C31C100000000F0BC0FC100000000708C31C10000000000BD0FC1000000006C8C31C1	6	800001	80000103000060010	3-6/1	6	1	-260010.00;-1150072.00;2.0;0.00	2020-02-01 10:11:12+01	UO800001.vgi
+01060000208A150000010000000103000000020000000E00000000000000E0BE0FC1000000006C8C31C1C3F5285C15BF0FC1000000006C8C31C13D0AD7A34ABF0FC1000000006C8C31C10000000080BF0FC1000000006C8C31C10000000080BF0FC100000000748C31C10000000080BF0FC1000000007C8C31C10000000080BF0FC100000000848C31C13D0AD7A34ABF0FC100000000848C31C1C3F5285C15BF0FC100000000848C31C100000000E0BE0FC100000000848C31C100000000E0BE0FC1000000007C8C31C100000000E0BE0FC100000000748C31C100000000D0BE0FC100000000708C31C100000000E0BE0FC1000000006C8C31C1090000000000000008BF0FC100000000718C31C10000000008BF0FC100000000748C31C10000000008BF0FC100000000778C31C10000000020BF0FC100000000778C31C10000000038BF0FC100000000778C31C10000000038BF0FC100000000748C31C10000000038BF0FC100000000718C31C10000000020BF0FC100000000718C31C10000000008BF0FC100000000718C31C1	7	800001	80000101000070020	1-7/2	7	2	-260070.00;-1150072.00;2.0;0.00	2020-02-01 10:11:12+01	UO800001.vgi
+01060000208A150000010000000103000000010000000D00000000000000C0C00FC1000000006C8C31C1C3F5285CF5C00FC1000000006C8C31C13D0AD7A32AC10FC1000000006C8C31C10000000060C10FC1000000006C8C31C10000000060C10FC100000000748C31C10000000060C10FC1000000007C8C31C10000000060C10FC100000000848C31C13D0AD7A32AC10FC100000000848C31C1C3F5285CF5C00FC100000000848C31C100000000C0C00FC100000000848C31C100000000C0C00FC1000000007C8C31C100000000C0C00FC100000000748C31C100000000C0C00FC1000000006C8C31C1	8	800001	80000102000080030	2-8/3	8	3	-260130.00;-1150072.00;2.0;0.00	2020-02-01 10:11:12+01	UO800001.vgi
+01060000208A150000010000000103000000020000000D00000000000000F0BD0FC1000000008A8C31C1C3F5285C25BE0FC1000000008A8C31C13D0AD7A35ABE0FC1000000008A8C31C10000000090BE0FC1000000008A8C31C10000000090BE0FC100000000928C31C10000000090BE0FC1000000009A8C31C10000000090BE0FC100000000A28C31C13D0AD7A35ABE0FC100000000A28C31C1C3F5285C25BE0FC100000000A28C31C100000000F0BD0FC100000000A28C31C100000000F0BD0FC1000000009A8C31C100000000F0BD0FC100000000928C31C100000000F0BD0FC1000000008A8C31C1090000000000000018BE0FC1000000008F8C31C10000000018BE0FC100000000928C31C10000000018BE0FC100000000958C31C10000000030BE0FC100000000958C31C10000000048BE0FC100000000958C31C10000000048BE0FC100000000928C31C10000000048BE0FC1000000008F8C31C10000000030BE0FC1000000008F8C31C10000000018BE0FC1000000008F8C31C1	9	800001	80000103000090000	3-9	9	0	-260040.00;-1150102.00;2.0;0.00	2020-02-01 10:11:12+01	UO800001.vgi
+01060000208A150000010000000103000000020000000D00000000000000D0BF0FC1000000008A8C31C1C3F5285C05C00FC1000000008A8C31C13D0AD7A33AC00FC1000000008A8C31C10000000070C00FC1000000008A8C31C10000000070C00FC100000000928C31C10000000070C00FC1000000009A8C31C10000000070C00FC100000000A28C31C13D0AD7A33AC00FC100000000A28C31C1C3F5285C05C00FC100000000A28C31C100000000D0BF0FC100000000A28C31C100000000D0BF0FC1000000009A8C31C100000000D0BF0FC100000000928C31C100000000D0BF0FC1000000008A8C31C10900000000000000F8BF0FC1000000008F8C31C100000000F8BF0FC100000000928C31C100000000F8BF0FC100000000958C31C10000000010C00FC100000000958C31C10000000028C00FC100000000958C31C10000000028C00FC100000000928C31C10000000028C00FC1000000008F8C31C10000000010C00FC1000000008F8C31C100000000F8BF0FC1000000008F8C31C1	10	800001	80000101000100010	1-10/1	10	1	-260100.00;-1150102.00;2.0;0.00	2020-02-01 10:11:12+01	UO800001.vgi
+01060000208A150000010000000103000000010000000D0000000000000000BD0FC100000000A88C31C1C3F5285C35BD0FC100000000A88C31C13D0AD7A36ABD0FC100000000A88C31C100000000A0BD0FC100000000A88C31C100000000A0BD0FC100000000B08C31C100000000A0BD0FC100000000B88C31C100000000A0BD0FC100000000C08C31C13D0AD7A36ABD0FC100000000C08C31C1C3F5285C35BD0FC100000000C08C31C10000000000BD0FC100000000C08C31C10000000000BD0FC100000000B88C31C10000000000BD0FC100000000B08C31C10000000000BD0FC100000000A88C31C1	11	800001	80000102000110020	2-11/2	11	2	-260010.00;-1150132.00;2.0;0.00	2020-02-01 10:11:12+01	UO800001.vgi
+01060000208A150000010000000103000000010000000D00000000000000E0BE0FC100000000A88C31C1C3F5285C15BF0FC100000000A88C31C13D0AD7A34ABF0FC100000000A88C31C10000000080BF0FC100000000A88C31C10000000080BF0FC100000000B08C31C10000000080BF0FC100000000B88C31C10000000080BF0FC100000000C08C31C13D0AD7A34ABF0FC100000000C08C31C1C3F5285C15BF0FC100000000C08C31C100000000E0BE0FC100000000C08C31C100000000E0BE0FC100000000B88C31C100000000E0BE0FC100000000B08C31C100000000E0BE0FC100000000A88C31C1	12	800001	80000103000120030	3-12/3	12	3	-260070.00;-1150132.00;2.0;0.00	2020-02-01 10:11:12+01	UO800001.vgi
+\.
+COMMIT;
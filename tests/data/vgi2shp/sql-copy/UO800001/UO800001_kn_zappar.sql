@@ -0,0 +1,7 @@
+SET client_encoding = 'UTF8';
+BEGIN;
+COPY "kataster"."kn_zappar" ("geom", "o_id", "ku", "g_k", "stav_k", "subor") FROM STDIN;
+01050000208A1500000200000001020000000700000000000000E8BC0FC1000000002D8C31C10000000000BD0FC1EC51B81E2D8C31C10000000018BD0FC15C8FC2B52D8C31C10000000030BD0FC1AE47E1BA2D8C31C10000000048BD0FC1666666662D8C31C10000000060BD0FC15C8FC2F52D8C31C10000000078BD0FC1000000002D8C31C101020000000200000000000000E8BC0FC100000000378C31C10000000000BD0FC1AE47E13A378C31C1	1	800001	1	2020-02-01 10:11:12+01	UO800001.vgi
+01050000208A150000010000000102000000050000000000000000BD0FC1AE47E13A378C31C10000000018BD0FC1295C8F82378C31C10000000030BD0FC1CDCCCC0C378C31C10000000048BD0FC1000000C0378C31C10000000060BD0FC1EC51B89E378C31C1	1	800001	2	2020-02-01 10:11:12+01	UO800001.vgi
+\.
+COMMIT;
@@ -0,0 +1,37 @@
+"""
+Parallel conversion in kt_sql: objects of one file parsed by several processes (--jobs) and files converted by several
+processes (--workers) have to give the same sql-copy output as the serial conversion.
+"""
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+click_testing = pytest.importorskip('click.testing')
+
+from katastertools import kt_sql  # noqa: E402
+
+
+def convert(corpus: Path, directory: Path, *options) -> dict:
+    """Converts a copy of the corpus into SQL and returns the SQL files of the graphic data by relative path"""
+    shutil.copytree(corpus, directory)
+    # the header of the FPU SQL names the user who converted it
+    runner = click_testing.CliRunner(env={'USER': os.environ.get('USER', 'kataster')})
+    result = runner.invoke(kt_sql.main, ['--directory', str(directory), '--export-format', 'sql', *options])
+    assert result.exit_code == 0, result.output
+    files = sorted((directory / 'sql_g').rglob('*.sql')) + [directory / 'sql' / 'graficke_udaje.sql']
+    return {path.relative_to(directory).as_posix(): path.read_bytes() for path in files}
+
+
+@pytest.fixture(scope='module')
+def serial(corpus, tmp_path_factory) -> dict:
+    return convert(corpus, tmp_path_factory.mktemp('kt_sql') / 'serial')
+
+
+@pytest.mark.parametrize('options', (('--jobs', '2'), ('--workers', '2')), ids=('jobs', 'workers'))
+def test_parallel_output_equals_serial(corpus, serial, tmp_path, options):
+    parallel = convert(corpus, tmp_path / 'parallel', *options)
+    assert list(parallel) == list(serial)
+    for name, content in serial.items():
+        assert parallel[name] == content, f'{name} differs from the serial conversion'
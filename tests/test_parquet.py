@@ -0,0 +1,46 @@
+"""
+GeoParquet output of process_files: every layer is a hive partitioned dataset (<layer>/ku=<KU>/<file>.parquet),
+which pyarrow (and so pandas.read_parquet) reads back as one table with the ku column from the directory names.
+"""
+import importlib.util
+import json
+
+import pytest
+
+pq = pytest.importorskip('pyarrow.parquet')
+if importlib.util.find_spec('osgeo') is None and importlib.util.find_spec('pyproj') is None:
+    pytest.skip('the coordinate system of GeoParquet needs GDAL or pyproj', allow_module_level=True)
+
+from katastertools.kt_vgi2shp import KNOWN_LAYERS, process_files  # noqa: E402
+
+
+@pytest.fixture(scope='module')
+def parquet(corpus, tmp_path_factory):
+    directory = tmp_path_factory.mktemp('parquet')
+    layers = {k: v[0] for k, v in KNOWN_LAYERS.items()}
+    for path in sorted((corpus / 'vgi').glob('*.vgi')):
+        process_files(path, layers, directory, 'parquet')
+    return directory
+
+
+@pytest.mark.parametrize('layer', ('kn_kladpar', 'kn_katuz', 'kn_zappar'))
+def test_layer_directory_round_trips(parquet, layer):
+    """kn_katuz and kn_zappar hold objects of several VGI files of the KU"""
+    files = sorted((parquet / layer).glob('ku=*/*.parquet'))
+    assert files
+    table = pq.read_table(parquet / layer)
+    assert table.num_rows == sum(pq.ParquetFile(f).metadata.num_rows for f in files)
+    assert set(table.column('ku').to_pylist()) == {800001}
+    assert sorted(set(table.column('subor').to_pylist())) == sorted(f.stem + '.vgi' for f in files)
+    assert pq.ParquetDataset(parquet / layer).read().num_rows == table.num_rows
+
+
+def test_geoparquet_metadata(parquet):
+    path, = (parquet / 'kn_kladpar').glob('ku=*/*.parquet')
+    schema = pq.read_schema(path)
+    geo = json.loads(schema.metadata[b'geo'])
+    assert geo['primary_column'] == 'geom'
+    assert geo['columns']['geom']['encoding'] == 'WKB'
+    assert geo['columns']['geom']['geometry_types'] == ['MultiPolygon']
+    # the KU is given by the partition directory, the file does not repeat it
+    assert 'ku' not in schema.names
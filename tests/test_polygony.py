@@ -0,0 +1,137 @@
+"""
+Assembly of polygons from the lines of an object (WktPolygon): rings are nested into shells and holes and written as
+a valid MULTIPOLYGON with counterclockwise shells and clockwise holes, whichever direction the rings were drawn in.
+"""
+import logging
+import struct
+
+import pytest
+
+from katastertools.VgiShp import data
+
+ATRIBUTY = {'KU': '800001', 'SUBOR': 'KN800001.vgi', 'AKTUAL': (2020, 2, 1, 10, 11, 12, 104)}
+Y0, X0 = 300000, 1200000
+
+
+def square(y: float, x: float, side: float, clockwise: bool = False) -> list:
+    """Closed ring of a square, (y, x) in VGI coordinates"""
+    points = [(y, x), (y + side, x), (y + side, x + side), (y, x + side), (y, x)]
+    return points[::-1] if clockwise else points
+
+
+def records(*rings, closed: bool = True, skok: str = 'NL') -> list:
+    """Records of a KLADPAR object, the first ring starts with &L P, every other one with the jump record skok"""
+    vety = ['&O KLADPAR 1', '&A PARCIS=1']
+    for n, ring in enumerate(rings):
+        if not closed:
+            ring = ring[:-1]
+        vety.append(f'{"&L P" if n == 0 else skok} {Y0 + ring[0][0]:.2f} {X0 + ring[0][1]:.2f}')
+        vety += [f'L {Y0 + y:.2f} {X0 + x:.2f}' for y, x in ring[1:]]
+    return vety
+
+
+def wkb_polygonu(vety: list) -> bytes:
+    objekt = data.KLADPAR(ATRIBUTY)
+    for veta in vety:
+        objekt.pridaj_riadok(veta)
+    geometria, = objekt.data()['geometricke_objekty']
+    return geometria['wkb']
+
+
+def parse_multipolygon(wkb: bytes) -> list:
+    """Polygons of a little endian WKB MULTIPOLYGON as lists of rings of (x, y) points"""
+    byte_order, typ, count = struct.unpack_from('<BII', wkb)
+    assert (byte_order, typ) == (1, data.WKB_MULTIPOLYGON)
+    offset = 9
+    polygons = []
+    for _ in range(count):
+        byte_order, typ, ring_count = struct.unpack_from('<BII', wkb, offset)
+        assert (byte_order, typ) == (1, data.WKB_POLYGON)
+        offset += 9
+        rings = []
+        for _ in range(ring_count):
+            points, = struct.unpack_from('<I', wkb, offset)
+            offset += 4
+            coordinates = struct.unpack_from(f'<{2 * points}d', wkb, offset)
+            offset += 16 * points
+            rings.append(list(zip(coordinates[::2], coordinates[1::2])))
+        polygons.append(rings)
+    assert offset == len(wkb)
+    return polygons
+
+
+def signed_area(ring: list) -> float:
+    return sum(x1 * y2 - x2 * y1 for (x1, y1), (x2, y2) in zip(ring, ring[1:])) / 2
+
+
+def inside(point: tuple, ring: list) -> bool:
+    x, y = point
+    result = False
+    for (x1, y1), (x2, y2) in zip(ring, ring[1:]):
+        if (y1 > y) != (y2 > y) and x < x1 + (y - y1) * (x2 - x1) / (y2 - y1):
+            result = not result
+    return result
+
+
+def assert_valid(polygons: list):
+    """Closed rings, counterclockwise shells, clockwise holes lying inside their shell and not in each other"""
+    for shell, *holes in polygons:
+        for ring in (shell, *holes):
+            assert len(ring) >= 4
+            assert ring[0] == ring[-1]
+        assert signed_area(shell) > 0
+        for hole in holes:
+            assert signed_area(hole) < 0
+            assert all(inside(point, shell) for point in hole[:-1])
+            assert not any(inside(point, other) for other in holes if other is not hole for point in hole[:-1])
+
+
+def bounds(ring: list) -> tuple:
+    """Bounds of the ring in VGI coordinates relative to Y0, X0 (the output has POINT(-y -x))"""
+    ys = [-x - Y0 for x, _ in ring]
+    xs = [-y - X0 for _, y in ring]
+    return round(min(ys), 2), round(min(xs), 2), round(max(ys), 2), round(max(xs), 2)
+
+
+@pytest.mark.parametrize('clockwise', (False, True))
+def test_hole(clockwise):
+    polygons = parse_multipolygon(wkb_polygonu(records(square(0, 0, 100, clockwise), square(20, 20, 30, clockwise))))
+    assert_valid(polygons)
+    assert [[bounds(ring) for ring in polygon] for polygon in polygons] == [[(0, 0, 100, 100), (20, 20, 50, 50)]]
+
+
+def test_two_disjoint_shells():
+    polygons = parse_multipolygon(wkb_polygonu(records(square(0, 0, 50), square(100, 0, 50, clockwise=True))))
+    assert_valid(polygons)
+    assert sorted(bounds(shell) for shell, *holes in polygons) == [(0, 0, 50, 50), (100, 0, 150, 50)]
+    assert all(len(polygon) == 1 for polygon in polygons)
+
+
+def test_island_inside_hole():
+    vety = records(square(0, 0, 100), square(10, 10, 80, clockwise=True), square(30, 30, 40))
+    polygons = parse_multipolygon(wkb_polygonu(vety))
+    assert_valid(polygons)
+    assert sorted([bounds(ring) for ring in polygon] for polygon in polygons) == [
+        [(0, 0, 100, 100), (10, 10, 90, 90)],
+        [(30, 30, 70, 70)],
+    ]
+
+
+def test_hole_drawn_before_shell():
+    polygons = parse_multipolygon(wkb_polygonu(records(square(20, 20, 30), square(0, 0, 100))))
+    assert_valid(polygons)
+    assert [[bounds(ring) for ring in polygon] for polygon in polygons] == [[(0, 0, 100, 100), (20, 20, 50, 50)]]
+
+
+def test_forced_closure(caplog):
+    # every ring in its own &L P section, a jump would be tried as a line joining the open rings
+    objekt = data.KLADPAR(ATRIBUTY)
+    with caplog.at_level(logging.WARNING):
+        for veta in records(square(0, 0, 100, clockwise=True), square(20, 20, 30), closed=False, skok='&L P'):
+            objekt.pridaj_riadok(veta)
+        objekt_data = objekt.data()
+    polygons = parse_multipolygon(objekt_data['geometricke_objekty'][0]['wkb'])
+    assert_valid(polygons)
+    assert [[bounds(ring) for ring in polygon] for polygon in polygons] == [[(0, 0, 100, 100), (20, 20, 50, 50)]]
+    assert objekt_data['pocet_uzatvoreni'] == 2
+    assert caplog.messages.count('Zatvaram polygon v objekte 1') == 2
@@ -0,0 +1,83 @@
+"""
+Regression tests of the conversion of VGI files on the corpus of conftest: dispatch of records to the handlers of
+objects and the geometry and attributes written by process_files are compared with the golden outputs in
+tests/data/vgi2shp. With KATASTER_UPDATE_GOLDEN=1 the golden outputs are written again instead of compared.
+"""
+import hashlib
+import json
+import os
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+from katastertools.VgiShp import data, io
+from katastertools.kt_vgi2shp import KNOWN_LAYERS, process_files
+
+GOLDEN = Path(__file__).parent / 'data' / 'vgi2shp'
+UPDATE = bool(os.environ.get('KATASTER_UPDATE_GOLDEN'))
+
+
+def vgi_files(corpus: Path) -> list:
+    return sorted((corpus / 'vgi').glob('*.vgi'))
+
+
+def compare_golden(name: str, actual: str):
+    path = GOLDEN / name
+    if UPDATE:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(actual, encoding='utf-8')
+    assert path.is_file(), f'Missing golden output {path}, create it with KATASTER_UPDATE_GOLDEN=1'
+    assert actual == path.read_text(encoding='utf-8'), f'Output differs from {path}'
+
+
+def records(path: Path):
+    """Records of the objects of the file, as Objekt.pridaj_riadok gets them"""
+    citac = io.Citac(path)
+    try:
+        for veta in citac:
+            if veta[:2] not in ('&V', '&R', '&B'):
+                citac.spat(1)
+                break
+        for objekt in io.CitacObjektov(citac):
+            yield from objekt['riadky']
+    finally:
+        citac.zavriet()
+
+
+def dispatch_summary(path: Path) -> dict:
+    """Number of records by handler and a digest of the handler and the parsed values of every record"""
+    handlers = Counter()
+    digest = hashlib.sha256()
+    for riadok in records(path):
+        parser = data.PARSERY_VIET.get(riadok[:1])
+        veta = parser(riadok) if parser is not None else None
+        if veta is None:
+            handlers['-'] += 1
+            digest.update(b'-\n')
+        else:
+            handlers[veta[0]] += 1
+            digest.update(f'{veta[0]} {json.dumps(veta[1].groupdict(), sort_keys=True)}\n'.encode())
+    return {'handlers': dict(sorted(handlers.items())), 'sha256': digest.hexdigest()}
+
+
+def test_record_dispatch(corpus):
+    summary = {path.name: dispatch_summary(path) for path in vgi_files(corpus)}
+    compare_golden('dispatch.json', json.dumps(summary, indent=1, sort_keys=True) + '\n')
+
+
+@pytest.mark.parametrize('file_type', ('KN', 'UO', 'BJ'))
+def test_process_files(corpus, tmp_path, file_type):
+    """Geometry (EWKB) and attributes of every object of every layer, as written into the sql-copy output"""
+    path, = (corpus / 'vgi').glob(f'{file_type}*.vgi')
+    layers = {k: v[0] for k, v in KNOWN_LAYERS.items()}
+    result = process_files(path, layers, tmp_path, 'sql-copy')
+
+    outputs = sorted(tmp_path.rglob('*.sql'))
+    assert outputs
+    for output in outputs:
+        compare_golden(f'sql-copy/{output.relative_to(tmp_path).as_posix()}', output.read_text(encoding='utf-8'))
+    compare_golden(f'warnings/{path.stem}.txt', ''.join(f'{varovanie}\n' for varovanie in result.warnings))
+    golden_outputs = sorted(p.relative_to(GOLDEN / 'sql-copy').as_posix()
+                            for p in (GOLDEN / 'sql-copy' / path.stem).rglob('*.sql'))
+    assert golden_outputs == [output.relative_to(tmp_path).as_posix() for output in outputs]